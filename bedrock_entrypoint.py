@@ -15,15 +15,22 @@ from bedrock_agentcore.runtime import BedrockAgentCoreApp, PingStatus
 import asyncio
 import boto3
 import hashlib
+import io
 import json
 import os
+import random
 import shutil
 import subprocess
 import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, List
+
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config as BotoConfig
 
 # OpenTelemetry imports for session ID propagation
 try:
@@ -49,6 +56,10 @@ except ImportError:
 # Track uploaded screenshots by content hash (for deduplication)
 uploaded_screenshots: set[str] = set()
 
+# Perceptual hashes of posted screenshots per issue: (width, height, dhash)
+# Used to skip near-duplicates (same page re-shot with tiny pixel differences)
+screenshot_perceptual_index: Dict[int, List[tuple]] = {}
+
 # Track announced commits (for deduplication)
 announced_commits: set[str] = set()
 
@@ -79,6 +90,48 @@ except ImportError:
     MetricsPublisher = None
     print("⚠️ CloudWatch metrics not available (running locally?)")
 
+# Import agent event channel (optional)
+try:
+    from src.control_channel import CONTROL_SOCKET_ENV, ControlChannelServer
+    CONTROL_CHANNEL_AVAILABLE = True
+except ImportError:
+    CONTROL_CHANNEL_AVAILABLE = False
+    ControlChannelServer = None
+    print("⚠️ Agent control channel not available (running locally?)")
+
+# Import GitHub webhook receiver (optional)
+try:
+    from src.webhook_receiver import (
+        DEFAULT_WEBHOOK_HOST,
+        WEBHOOK_HOST_ENV,
+        WEBHOOK_PATH,
+        WEBHOOK_PORT_ENV,
+        WEBHOOK_SECRET_ENV,
+        WebhookReceiver,
+    )
+    WEBHOOK_RECEIVER_AVAILABLE = True
+except ImportError:
+    WEBHOOK_RECEIVER_AVAILABLE = False
+    WebhookReceiver = None
+
+# Import filesystem watcher for screenshot discovery (optional)
+try:
+    from src.file_watcher import DirectoryWatcher
+    FILE_WATCHER_AVAILABLE = True
+except ImportError:
+    FILE_WATCHER_AVAILABLE = False
+    DirectoryWatcher = None
+    print("⚠️ File watcher not available (running locally?)")
+
+# Import Pillow for screenshot recompression and thumbnails (optional)
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    Image = None
+    print("⚠️ Pillow not available - screenshots uploaded without optimization or thumbnails")
+
 # Fetch secrets from AWS Secrets Manager
 def get_secret(secret_name: str) -> Optional[str]:
     """
@@ -532,21 +585,16 @@ def claim_github_issue(
     Claim an issue by adding the 'agent-building' label.
     Returns True if successful.
     """
-    import requests
-
     try:
-        headers = {
-            "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        from src.github_client import get_github_client
+
+        client = get_github_client(github_token)
 
         # Add agent-building label
-        url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/labels"
-        response = requests.post(
-            url,
-            headers=headers,
-            json={"labels": ["agent-building"]},
-            timeout=30
+        response = client.request(
+            "POST",
+            f"/repos/{github_repo}/issues/{issue_number}/labels",
+            json={"labels": ["agent-building"]}
         )
         response.raise_for_status()
         print(f"✅ Claimed issue #{issue_number} (added agent-building label)")
@@ -569,29 +617,23 @@ def release_github_issue(
     Called when agent finishes working on an issue.
     Returns True if successful.
     """
-    import requests
-
     try:
-        headers = {
-            "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        from src.github_client import get_github_client
+
+        client = get_github_client(github_token)
 
         # Remove agent-building label
-        url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/labels/agent-building"
-        response = requests.delete(url, headers=headers, timeout=30)
+        response = client.request("DELETE", f"/repos/{github_repo}/issues/{issue_number}/labels/agent-building")
 
         if response.status_code not in [200, 204, 404]:  # 404 = label already removed
             print(f"⚠️ Failed to remove agent-building label: {response.status_code}")
 
         # Add agent-complete label if requested
         if mark_complete:
-            add_url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/labels"
-            add_response = requests.post(
-                add_url,
-                headers=headers,
-                json={"labels": ["agent-complete"]},
-                timeout=30
+            add_response = client.request(
+                "POST",
+                f"/repos/{github_repo}/issues/{issue_number}/labels",
+                json={"labels": ["agent-complete"]}
             )
             if add_response.status_code in [200, 201]:
                 print(f"✅ Marked issue #{issue_number} as complete (added agent-complete label)")
@@ -609,85 +651,209 @@ def release_github_issue(
         return False
 
 
+# Incremental backlog sync: each cycle only fetches issues updated since the
+# newest updated_at seen so far. Adding a reaction doesn't bump an issue's
+# updated_at, so every BACKLOG_FULL_SYNC_INTERVAL_SECONDS a full walk of the
+# open issues picks up approvals and votes that arrived on their own.
+BACKLOG_FULL_SYNC_INTERVAL_SECONDS = int(os.environ.get("BACKLOG_FULL_SYNC_INTERVAL_SECONDS", "3600"))
+
+# Indexed SQLite copies of backlog JSON files, by path (see get_backlog_store)
+backlog_stores: Dict[Path, Any] = {}
+_backlog_stores_lock = threading.Lock()
+
+# How long to gather webhook deliveries into one sync (an edit often arrives
+# together with label and comment events)
+WEBHOOK_BATCH_WINDOW_SECONDS = 2.0
+backlog_sync_cursor: Dict[str, Any] = {"repo": None, "since": None, "full_sync_at": 0.0}
+
+
+def get_backlog_store(backlog_path: Path):
+    """Return the shared BacklogStore behind a backlog JSON file.
+
+    The store keeps an indexed SQLite copy of the backlog and re-exports the
+    JSON file (atomically) after every change, so the agent still reads and
+    edits human_backlog.json as before.
+    """
+    from src.backlog_store import BacklogStore
+
+    with _backlog_stores_lock:
+        store = backlog_stores.get(backlog_path)
+        if store is None:
+            store = backlog_stores[backlog_path] = BacklogStore(backlog_path)
+        return store
+
+
+def _list_issue_reactions(client: Any, github_repo: str, issue_number: int) -> List[Dict]:
+    """List every reaction on an issue (low priority, conditional requests)."""
+    from src.github_client import PRIORITY_LOW
+
+    return [
+        reaction
+        for page in client.iter_pages(f"/repos/{github_repo}/issues/{issue_number}/reactions", priority=PRIORITY_LOW)
+        for reaction in page
+    ]
+
+
 def sync_github_issues_to_backlog(
     github_repo: str,
     github_token: str,
-    backlog_path: Path
+    backlog_path: Path,
+    full: bool = False
 ) -> List[Dict]:
     """
-    Pull approved (🚀) GitHub issues and add to human_backlog.json.
-    Returns list of new issues added.
+    Pull approved (🚀) GitHub issues and apply changes to human_backlog.json.
+
+    Adds newly approved issues, refreshes titles, bodies and vote counts of
+    queued items, and drops queued items whose issue was closed, completed,
+    or lost its 🚀. Items already in progress or done are left alone.
+
+    Args:
+        github_repo: Repository in 'owner/repo' format
+        github_token: GitHub API token
+        backlog_path: Path to human_backlog.json
+        full: Walk all open issues even if an incremental sync would do
+
+    Returns:
+        List of new backlog items added
     """
     try:
-        from github import Github
+        from src.github_client import PRIORITY_LOW, get_github_client
+        client = get_github_client(github_token)
     except ImportError:
-        print("⚠️ PyGithub not available, skipping issue sync")
+        print("⚠️ GitHub client not available, skipping issue sync")
         return []
 
-    print(f"🔄 Syncing GitHub issues to backlog...")
+    # Load existing backlog
+    store = get_backlog_store(backlog_path)
+    backlog = store.items()
+    if not backlog_path.exists():
+        full = True
 
-    gh = Github(github_token)
-    repo = gh.get_repo(github_repo)
+    since = backlog_sync_cursor["since"] if backlog_sync_cursor["repo"] == github_repo else None
+    sync_started = time.time()
+    if since is None or sync_started - backlog_sync_cursor["full_sync_at"] >= BACKLOG_FULL_SYNC_INTERVAL_SECONDS:
+        full = True
 
-    # Load existing backlog
-    if backlog_path.exists():
-        backlog = json.loads(backlog_path.read_text())
+    if full:
+        print(f"🔄 Syncing GitHub issues to backlog...")
+        params = {"state": "open"}
     else:
-        backlog = []
+        print(f"🔄 Syncing GitHub issues updated since {since.isoformat()} to backlog...")
+        params = {"state": "all", "since": since.strftime("%Y-%m-%dT%H:%M:%SZ")}
+
+    # Every page and reaction list is a conditional request on the shared
+    # client: unchanged ones come back 304, and each request is charged to
+    # the rate-limit budget
+    issues = (
+        issue
+        for page in client.iter_pages(f"/repos/{github_repo}/issues", params=params, priority=PRIORITY_LOW)
+        for issue in page
+    )
 
-    existing_issue_ids = {item.get('github_issue') for item in backlog}
+    items_by_issue = {item.get('github_issue'): item for item in backlog}
     new_issues = []
+    updated = {}  # Changed fields by issue number
+    removed = set()
+    high_water = since
 
-    # Query open issues
-    for issue in repo.get_issues(state='open'):
-        if issue.number in existing_issue_ids:
-            continue
+    for issue in issues:
+        number, title = issue['number'], issue['title']
+        updated_at = datetime.fromisoformat(issue['updated_at'].replace('Z', '+00:00'))
+        if high_water is None or updated_at > high_water:
+            high_water = updated_at
+
+        item = items_by_issue.get(number)
+        if item is not None and (item.get('status') != 'backlog' or item.get('completed')):
+            continue  # Already picked up by the agent
 
         # Skip MVP issues - they are the main build trigger, not backlog items
-        issue_labels = [label.name.lower() for label in issue.labels]
-        if 'mvp' in issue_labels or issue.title.startswith('[MVP]'):
+        issue_labels = [label['name'].lower() for label in issue.get('labels', [])]
+        if 'mvp' in issue_labels or title.startswith('[MVP]'):
             continue
 
-        # Skip issues that are already completed or currently being built
-        if 'agent-complete' in issue_labels or 'agent-building' in issue_labels:
+        # Drop issues that were closed, completed or claimed since they were queued
+        if (issue['state'] == 'closed' or
+                'agent-complete' in issue_labels or 'agent-building' in issue_labels):
+            if item is not None:
+                removed.add(number)
+                print(f"  ➖ Removed issue #{number}: {title} ({issue['state']})")
             continue
 
-        # Check for 🚀 from authorized approvers
+        # Check for 🚀 from authorized approvers. The issue list normally
+        # carries reaction counts, so only list who reacted when there is a 🚀.
+        # Without a summary the counts come from the full reaction list, so a
+        # missing summary never reads as "no votes".
         try:
-            for reaction in issue.get_reactions():
-                if (reaction.content == 'rocket' and
-                    reaction.user.login in AUTHORIZED_APPROVERS):
-
-                    # Calculate priority by vote count
-                    vote_count = sum(1 for r in issue.get_reactions()
-                                    if r.content in ['+1', 'rocket'])
-
-                    backlog_item = {
-                        "id": str(int(time.time() * 1000)),
-                        "github_issue": issue.number,
-                        "type": "feature",
-                        "priority": "high" if vote_count > 3 else "medium",
-                        "status": "backlog",
-                        "description": issue.title,
-                        "details": issue.body or "",
-                        "vote_count": vote_count,
-                        "added": datetime.now(timezone.utc).isoformat(),
-                        "completed": False
-                    }
-                    backlog.append(backlog_item)
-                    new_issues.append(backlog_item)
-                    print(f"  ✅ Added issue #{issue.number}: {issue.title}")
-                    break
+            reactions = None
+            reaction_counts = issue.get('reactions')
+            if not isinstance(reaction_counts, dict):
+                reactions = _list_issue_reactions(client, github_repo, number)
+                reaction_counts = Counter(reaction['content'] for reaction in reactions)
+            approved = False
+            if reaction_counts.get('rocket'):
+                if reactions is None:
+                    reactions = _list_issue_reactions(client, github_repo, number)
+                approved = any(
+                    reaction['content'] == 'rocket'
+                    and (reaction.get('user') or {}).get('login') in AUTHORIZED_APPROVERS
+                    for reaction in reactions
+                )
         except Exception as e:
-            print(f"  ⚠️ Error checking reactions for #{issue.number}: {e}")
+            print(f"  ⚠️ Error checking reactions for #{number}: {e}")
+            continue
 
-    # Sort by vote count (highest first)
-    backlog.sort(key=lambda x: x.get('vote_count', 0), reverse=True)
+        if not approved:
+            if item is not None:
+                removed.add(number)
+                print(f"  ➖ Removed issue #{number}: {title} (approval withdrawn)")
+            continue
 
-    # Save updated backlog
-    backlog_path.write_text(json.dumps(backlog, indent=2))
+        # Calculate priority by vote count
+        vote_count = reaction_counts.get('+1', 0) + reaction_counts.get('rocket', 0)
+        priority = "high" if vote_count > 3 else "medium"
+
+        if item is None:
+            backlog_item = {
+                "id": str(int(time.time() * 1000)),
+                "github_issue": number,
+                "type": "feature",
+                "priority": priority,
+                "status": "backlog",
+                "description": title,
+                "details": issue.get('body') or "",
+                "vote_count": vote_count,
+                "added": datetime.now(timezone.utc).isoformat(),
+                "completed": False
+            }
+            items_by_issue[number] = backlog_item
+            new_issues.append(backlog_item)
+            print(f"  ✅ Added issue #{number}: {title}")
+            continue
 
-    print(f"📋 Backlog has {len(backlog)} items ({len(new_issues)} new)")
+        changes = {
+            "description": title,
+            "details": issue.get('body') or "",
+            "vote_count": vote_count,
+        }
+        if item.get('priority') in ('high', 'medium'):  # Leave manually set priorities alone
+            changes["priority"] = priority
+        changes = {key: value for key, value in changes.items() if item.get(key) != value}
+        if changes:
+            updated[number] = changes
+            print(f"  🔁 Updated issue #{number}: {title} ({vote_count} votes)")
+
+    backlog_sync_cursor.update(repo=github_repo, since=high_water)
+    if full:
+        backlog_sync_cursor["full_sync_at"] = sync_started
+
+    # Save changes in one transaction; the JSON view is re-exported sorted by vote count
+    if new_issues or updated or removed:
+        store.apply_changes(added=new_issues, updated=updated, removed=removed)
+    elif not backlog_path.exists():
+        store.export()
+
+    total = len(backlog) + len(new_issues) - len(removed)
+    print(f"📋 Backlog has {total} items ({len(new_issues)} new, {len(updated)} updated, {len(removed)} removed)")
     return new_issues
 
 
@@ -704,25 +870,15 @@ def get_next_backlog_item(backlog_path: Path) -> Optional[Dict]:
     if not backlog_path.exists():
         return None
 
-    backlog = json.loads(backlog_path.read_text())
-
-    # First: find any in-progress items (resume interrupted work)
-    for item in backlog:
-        if item.get('status') == 'in progress' and not item.get('completed'):
-            print(f"📌 Resuming in-progress: #{item.get('github_issue')} - {item.get('description')}")
-            return item
-
-    # Then: by priority order
-    priority_order = ['critical', 'high', 'medium', 'low']
-    for priority in priority_order:
-        for item in backlog:
-            if (item.get('priority') == priority and
-                item.get('status') == 'backlog' and
-                not item.get('completed')):
-                print(f"📋 Next from backlog: #{item.get('github_issue')} - {item.get('description')} ({priority})")
-                return item
+    item = get_backlog_store(backlog_path).get_next_item()
+    if item is None:
+        return None
 
-    return None
+    if item.get('status') == 'in progress':
+        print(f"📌 Resuming in-progress: #{item.get('github_issue')} - {item.get('description')}")
+    else:
+        print(f"📋 Next from backlog: #{item.get('github_issue')} - {item.get('description')} ({item.get('priority')})")
+    return item
 
 
 def update_backlog_item_status(
@@ -735,18 +891,8 @@ def update_backlog_item_status(
     if not backlog_path.exists():
         return
 
-    backlog = json.loads(backlog_path.read_text())
-
-    for item in backlog:
-        if item.get('github_issue') == github_issue:
-            item['status'] = status
-            item['completed'] = completed
-            if completed:
-                item['completedDate'] = datetime.now(timezone.utc).isoformat()
-            break
-
-    backlog_path.write_text(json.dumps(backlog, indent=2))
-    print(f"📝 Updated issue #{github_issue} status to '{status}'")
+    if get_backlog_store(backlog_path).update_status(github_issue, status, completed):
+        print(f"📝 Updated issue #{github_issue} status to '{status}'")
 
 
 def trigger_session_restart(
@@ -769,10 +915,9 @@ def trigger_session_restart(
         True if workflow was triggered successfully, False otherwise
     """
     try:
-        from github import Github
+        from src.github_client import get_github_client
 
-        gh = Github(github_token)
-        repo = gh.get_repo(github_repo)
+        repo = get_github_client(github_token).get_repo(github_repo)
 
         # Trigger agent-builder workflow with resume flag
         workflow = repo.get_workflow("agent-builder.yml")
@@ -943,31 +1088,15 @@ def get_announced_commits_from_github(
         Set of commit SHAs (full 40-char) that were previously posted
     """
     import re
-    import requests
 
     announced = set()
     try:
-        headers = {
-            "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-
-        # Get all comments on the issue (paginated)
-        page = 1
-        while True:
-            url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/comments"
-            response = requests.get(
-                url,
-                headers=headers,
-                params={"page": page, "per_page": 100},
-                timeout=30
-            )
-            response.raise_for_status()
-            comments = response.json()
+        from src.github_client import get_github_client
 
-            if not comments:
-                break
+        client = get_github_client(github_token)
 
+        # Get all comments on the issue (paginated; unchanged pages come back 304 from the ETag cache)
+        for comments in client.iter_pages(f"/repos/{github_repo}/issues/{issue_number}/comments"):
             # Parse commit SHAs from "Commits Pushed" comments
             # Format: [`abc1234`](https://github.com/.../commit/abc1234567890...)
             sha_pattern = r'\[`([a-f0-9]{7})`\]\(https://github\.com/[^/]+/[^/]+/commit/([a-f0-9]{40})\)'
@@ -980,8 +1109,6 @@ def get_announced_commits_from_github(
                     for short_sha, full_sha in matches:
                         announced.add(full_sha)
 
-            page += 1
-
         print(f"📋 Found {len(announced)} previously announced commits on issue #{issue_number}")
 
     except Exception as e:
@@ -1010,35 +1137,19 @@ def get_uploaded_screenshots_from_github(
         Set of screenshot content hashes that were previously uploaded
     """
     import re
-    import requests
 
     uploaded = set()
     try:
-        headers = {
-            "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-
-        # Get all comments on the issue (paginated)
-        page = 1
-        while True:
-            url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/comments"
-            response = requests.get(
-                url,
-                headers=headers,
-                params={"page": page, "per_page": 100},
-                timeout=30
-            )
-            response.raise_for_status()
-            comments = response.json()
+        from src.github_client import get_github_client
 
-            if not comments:
-                break
+        client = get_github_client(github_token)
 
+        # Get all comments on the issue (paginated; unchanged pages come back 304 from the ETag cache)
+        for comments in client.iter_pages(f"/repos/{github_repo}/issues/{issue_number}/comments"):
             # Parse screenshot URLs from Agent Screenshots comments
-            # URL format: /screenshots/{timestamp}_{hash}_{name}.png
-            # Extract the hash portion (8 chars after timestamp)
-            screenshot_pattern = r'/screenshots/\d+_([a-f0-9]{8})_[^"]+\.png'
+            # URL format: /screenshots/[thumbnails/]{timestamp}_{hash}_{name}.{png,webp,avif}
+            # Extract the hash portion (16 chars after timestamp, 8 for older screenshots)
+            screenshot_pattern = r'/screenshots/(?:thumbnails/)?\d+_([a-f0-9]{16}|[a-f0-9]{8})_[^\s")]+\.(?:png|webp|avif)'
 
             for comment in comments:
                 body = comment.get('body', '')
@@ -1047,8 +1158,6 @@ def get_uploaded_screenshots_from_github(
                     for content_hash in matches:
                         uploaded.add(content_hash)
 
-            page += 1
-
         print(f"📷 Found {len(uploaded)} previously uploaded screenshot hashes on issue #{issue_number}")
 
     except Exception as e:
@@ -1368,13 +1477,181 @@ def push_pending_commits(
         return False, 0, []
 
 
+# Length of the content hash used in screenshot keys. Screenshots posted
+# before it was widened carry 8-char hashes, which still match as a prefix.
+SCREENSHOT_HASH_LENGTH = 16
+LEGACY_SCREENSHOT_HASH_LENGTH = 8
+
+# Maximum Hamming distance between the dHashes of two same-sized screenshots
+# for the newer one to be skipped as a near-duplicate (0 disables, requires Pillow)
+SCREENSHOT_NEAR_DUPLICATE_DISTANCE = int(os.environ.get("SCREENSHOT_NEAR_DUPLICATE_DISTANCE", "4"))
+
+
 def get_file_hash(file_path: Path) -> str:
     """Get SHA256 hash of file contents for deduplication."""
     hasher = hashlib.sha256()
     with open(file_path, 'rb') as f:
         for chunk in iter(lambda: f.read(8192), b''):
             hasher.update(chunk)
-    return hasher.hexdigest()[:8]  # 8-char hash for filename
+    return hasher.hexdigest()[:SCREENSHOT_HASH_LENGTH]  # 16-char hash for filename
+
+
+def get_perceptual_hash(file_path: Path) -> Optional[tuple]:
+    """Get a 64-bit difference hash (dHash) of an image.
+
+    Returns:
+        Tuple of (width, height, dhash), or None if Pillow is unavailable or the
+        image can't be read
+    """
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        with Image.open(file_path) as image:
+            width, height = image.size
+            pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception:
+        return None
+
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            dhash = (dhash << 1) | (left > right)
+    return width, height, dhash
+
+
+def is_near_duplicate(perceptual_hash: tuple, index: List[tuple]) -> bool:
+    """Check a perceptual hash against an index of already posted screenshots."""
+    width, height, dhash = perceptual_hash
+    return any(
+        (width, height) == (other_width, other_height)
+        and bin(dhash ^ other_dhash).count("1") <= SCREENSHOT_NEAR_DUPLICATE_DISTANCE
+        for other_width, other_height, other_dhash in index
+    )
+
+
+def is_screenshot_uploaded(content_hash: str) -> bool:
+    """Check a content hash against uploaded_screenshots, including legacy 8-char hashes."""
+    return (
+        content_hash in uploaded_screenshots
+        or content_hash[:LEGACY_SCREENSHOT_HASH_LENGTH] in uploaded_screenshots
+    )
+
+
+# Screenshot upload settings
+SCREENSHOT_UPLOAD_CONCURRENCY = int(os.environ.get("SCREENSHOT_UPLOAD_CONCURRENCY", "8"))
+# Format of the uploaded copy when Pillow is available: png (lossless re-optimization),
+# webp, avif, or original (upload the file as-is)
+SCREENSHOT_IMAGE_FORMAT = os.environ.get("SCREENSHOT_IMAGE_FORMAT", "png").lower()
+SCREENSHOT_IMAGE_QUALITY = int(os.environ.get("SCREENSHOT_IMAGE_QUALITY", "85"))  # webp/avif only
+# Width of the thumbnails embedded in issue comments (0 embeds full-size images)
+SCREENSHOT_THUMBNAIL_WIDTH = int(os.environ.get("SCREENSHOT_THUMBNAIL_WIDTH", "480"))
+_IMAGE_CONTENT_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "avif": "image/avif",
+}
+SCREENSHOT_DEBOUNCE_SECONDS = 2.0  # A watched PNG must be quiet this long before upload
+# After the first new screenshot, wait this long to batch the rest of the burst
+SCREENSHOT_BATCH_WINDOW_SECONDS = float(os.environ.get("SCREENSHOT_BATCH_WINDOW_SECONDS", "10"))
+# Content hashes keyed by path, mtime and size so unchanged files are never reread
+SCREENSHOT_HASH_CACHE_FILE = Path("/tmp/screenshot_hashes.json")
+
+# Long-lived S3 client shared by all upload cycles (boto3 clients are thread-safe)
+_s3_client = None
+
+
+def _get_s3_client():
+    """Return the shared S3 client, creating it on first use."""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            's3',
+            config=BotoConfig(max_pool_connections=max(10, SCREENSHOT_UPLOAD_CONCURRENCY)),
+        )
+    return _s3_client
+
+
+def _load_screenshot_hash_cache() -> Dict[str, list]:
+    """Load the path -> [mtime_ns, size, hash] cache (empty if missing or corrupt)."""
+    try:
+        cache = json.loads(SCREENSHOT_HASH_CACHE_FILE.read_text())
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_screenshot_hash_cache(cache: Dict[str, list]) -> None:
+    """Atomically write the screenshot hash cache."""
+    tmp_path = SCREENSHOT_HASH_CACHE_FILE.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(cache))
+        tmp_path.replace(SCREENSHOT_HASH_CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️ Failed to save screenshot hash cache: {e}")
+
+
+def get_screenshot_dirs(build_dir: Path) -> List[Path]:
+    """Directories where actual screenshots are saved.
+
+    This excludes documentation PNGs and other assets in the repo.
+    """
+    return [
+        build_dir / "generated-app" / "screenshots",
+        build_dir / "generated-app" / "test-results",
+        build_dir / "generated-app" / "playwright-report",
+        build_dir / "screenshots",
+        build_dir / "test-results",
+    ]
+
+
+def _encode_image(image: Any, image_format: str) -> bytes:
+    """Encode a Pillow image as png (lossless, optimized), webp or avif."""
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.save(buffer, image_format.upper(), quality=SCREENSHOT_IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def process_screenshot(png_file: Path) -> tuple:
+    """Recompress a screenshot and render its thumbnail (requires Pillow).
+
+    Only the uploaded copy changes; the file on disk (and therefore its content
+    hash used for deduplication) is left untouched.
+
+    Returns:
+        Tuple of (image bytes, or None to upload the original file; format of
+        the uploaded image; thumbnail bytes or None; thumbnail format)
+    """
+    if not PIL_AVAILABLE or (SCREENSHOT_IMAGE_FORMAT == "original" and not SCREENSHOT_THUMBNAIL_WIDTH):
+        return None, "png", None, None
+
+    try:
+        with Image.open(png_file) as image:
+            image.load()
+
+            data, image_format = None, "png"
+            if SCREENSHOT_IMAGE_FORMAT in _IMAGE_CONTENT_TYPES:
+                encoded = _encode_image(image, SCREENSHOT_IMAGE_FORMAT)
+                # A re-optimized PNG is only worth uploading if it is smaller
+                if SCREENSHOT_IMAGE_FORMAT != "png" or len(encoded) < png_file.stat().st_size:
+                    data, image_format = encoded, SCREENSHOT_IMAGE_FORMAT
+
+            thumbnail, thumbnail_format = None, None
+            if SCREENSHOT_THUMBNAIL_WIDTH and image.width > SCREENSHOT_THUMBNAIL_WIDTH:
+                # Full-page screenshots can be very tall; preview the top of the page
+                preview = image.crop((0, 0, image.width, min(image.height, image.width)))
+                preview.thumbnail((SCREENSHOT_THUMBNAIL_WIDTH, SCREENSHOT_THUMBNAIL_WIDTH))
+                thumbnail_format = image_format
+                thumbnail = _encode_image(preview, thumbnail_format)
+
+            return data, image_format, thumbnail, thumbnail_format
+    except Exception as e:
+        print(f"⚠️ Screenshot processing failed for {png_file.name}, uploading original: {e}")
+        return None, "png", None, None
 
 
 def upload_screenshots_to_s3(
@@ -1382,77 +1659,167 @@ def upload_screenshots_to_s3(
     issue_number: int,
     session_id: str,
     bucket_name: str,
-    cloudfront_domain: str
+    cloudfront_domain: str,
+    png_files: Optional[List[Path]] = None
 ) -> List[dict]:
     """
     Find and upload new screenshots to S3.
     Only uploads actual screenshots (from test directories), not documentation images.
+    New files are uploaded concurrently; files whose path, mtime and size are
+    unchanged since the last cycle are not rehashed.
+    Pass png_files (e.g. from a DirectoryWatcher) to upload just those files
+    instead of scanning the screenshot directories.
     Returns list of uploaded screenshot metadata with CloudFront URLs.
     """
     global uploaded_screenshots
-    s3 = boto3.client('s3')
     uploaded = []
 
-    # Only scan specific directories where actual screenshots are saved
-    # This excludes documentation PNGs and other assets in the repo
-    screenshot_dirs = [
-        build_dir / "generated-app" / "screenshots",
-        build_dir / "generated-app" / "test-results",
-        build_dir / "generated-app" / "playwright-report",
-        build_dir / "screenshots",
-        build_dir / "test-results",
-    ]
-
-    # Collect PNG files from screenshot directories only
-    png_files = []
-    for screenshot_dir in screenshot_dirs:
-        if screenshot_dir.exists():
-            png_files.extend(screenshot_dir.glob("**/*.png"))
-
+    full_scan = png_files is None
+    if full_scan:
+        # Collect PNG files from screenshot directories only
+        png_files = []
+        for screenshot_dir in get_screenshot_dirs(build_dir):
+            if screenshot_dir.exists():
+                png_files.extend(screenshot_dir.glob("**/*.png"))
+
+    # Hash new or changed files only. A full scan also drops entries for
+    # deleted files; a partial batch only adds to the cache.
+    hash_cache = _load_screenshot_hash_cache()
+    fresh_cache: Dict[str, list] = {} if full_scan else dict(hash_cache)
+    # (png_file, content_hash, perceptual_hash, near_duplicates) not uploaded yet.
+    # near_duplicates are (png_file, content_hash) of later files in the batch
+    # that look the same; they are only treated as posted once this one is.
+    pending = []
+    pending_hashes = set()
+    perceptual_index = screenshot_perceptual_index.setdefault(issue_number, [])
     for png_file in png_files:
-        content_hash = get_file_hash(png_file)
+        try:
+            st = png_file.stat()
+            entry = hash_cache.get(str(png_file))
+            if (
+                entry
+                and entry[0] == st.st_mtime_ns
+                and entry[1] == st.st_size
+                and len(entry[2]) == SCREENSHOT_HASH_LENGTH
+            ):
+                content_hash = entry[2]
+            else:
+                content_hash = get_file_hash(png_file)
+        except OSError:
+            continue  # Removed while scanning
+        fresh_cache[str(png_file)] = [st.st_mtime_ns, st.st_size, content_hash]
 
         # Skip if already uploaded (deduplication)
-        if content_hash in uploaded_screenshots:
+        if is_screenshot_uploaded(content_hash) or content_hash in pending_hashes:
             continue
 
-        timestamp = int(time.time())
-        s3_key = f"issue-{issue_number}/{session_id}/screenshots/{timestamp}_{content_hash}_{png_file.name}"
+        # Skip visually identical re-shots of a page already posted for this issue
+        perceptual_hash = None
+        if SCREENSHOT_NEAR_DUPLICATE_DISTANCE > 0:
+            perceptual_hash = get_perceptual_hash(png_file)
+            if perceptual_hash and is_near_duplicate(perceptual_hash, perceptual_index):
+                uploaded_screenshots.add(content_hash)  # Treat as posted so it isn't re-checked
+                print(f"⏭️  Skipping near-duplicate screenshot: {png_file.name}")
+                continue
+            original = perceptual_hash and next(
+                (entry for entry in pending if entry[2] and is_near_duplicate(perceptual_hash, [entry[2]])),
+                None,
+            )
+            if original:
+                original[3].append((png_file, content_hash))
+                continue
 
-        try:
-            # Upload to S3
-            s3.upload_file(
-                str(png_file),
+        pending_hashes.add(content_hash)
+        pending.append((png_file, content_hash, perceptual_hash, []))
+
+    if fresh_cache != hash_cache:
+        _save_screenshot_hash_cache(fresh_cache)
+
+    if not pending:
+        return uploaded
+
+    # Upload concurrently through a transfer manager on the shared client
+    transfer_config = TransferConfig(max_concurrency=SCREENSHOT_UPLOAD_CONCURRENCY)
+    with create_transfer_manager(_get_s3_client(), transfer_config) as transfer_manager:
+        transfers = []
+        for png_file, content_hash, perceptual_hash, near_duplicates in pending:
+            timestamp = int(time.time())
+            key_prefix = f"issue-{issue_number}/{session_id}/screenshots"
+            metadata = {
+                'issue_number': str(issue_number),
+                'session_id': session_id,
+                'original_name': png_file.name,
+                'content_hash': content_hash,
+            }
+
+            # Optionally recompress and render a thumbnail while earlier files upload
+            data, image_format, thumbnail, thumbnail_format = process_screenshot(png_file)
+            object_name = f"{timestamp}_{content_hash}_{png_file.stem}.{image_format}"
+            s3_key = f"{key_prefix}/{object_name}"
+            future = transfer_manager.upload(
+                io.BytesIO(data) if data is not None else str(png_file),
                 bucket_name,
                 s3_key,
-                ExtraArgs={
-                    'ContentType': 'image/png',
-                    'Metadata': {
-                        'issue_number': str(issue_number),
-                        'session_id': session_id,
-                        'original_name': png_file.name,
-                        'content_hash': content_hash,
-                    }
+                extra_args={
+                    'ContentType': _IMAGE_CONTENT_TYPES[image_format],
+                    'Metadata': metadata,
                 }
             )
 
+            thumbnail_key, thumbnail_future = None, None
+            if thumbnail is not None:
+                thumbnail_key = f"{key_prefix}/thumbnails/{timestamp}_{content_hash}_{png_file.stem}.{thumbnail_format}"
+                thumbnail_future = transfer_manager.upload(
+                    io.BytesIO(thumbnail),
+                    bucket_name,
+                    thumbnail_key,
+                    extra_args={
+                        'ContentType': _IMAGE_CONTENT_TYPES[thumbnail_format],
+                        'Metadata': metadata,
+                    }
+                )
+            transfers.append(
+                (future, thumbnail_future, png_file, content_hash, perceptual_hash, near_duplicates,
+                 timestamp, s3_key, thumbnail_key)
+            )
+
+        for (
+            future, thumbnail_future, png_file, content_hash, perceptual_hash, near_duplicates,
+            timestamp, s3_key, thumbnail_key
+        ) in transfers:
+            try:
+                future.result()
+            except Exception as e:
+                # Near-duplicates stay unposted too, so a later pass retries them
+                print(f"⚠️ Failed to upload {png_file.name}: {e}")
+                continue
+
             # Use CloudFront URL for serving
             cdn_url = f"https://{cloudfront_domain}/{s3_key}"
             uploaded_screenshots.add(content_hash)
+            if perceptual_hash:
+                perceptual_index.append(perceptual_hash)
+            for duplicate_file, duplicate_hash in near_duplicates:
+                uploaded_screenshots.add(duplicate_hash)  # Treat as posted so it isn't re-checked
+                print(f"⏭️  Skipping near-duplicate screenshot: {duplicate_file.name}")
 
-            uploaded.append({
+            screenshot = {
                 'filename': png_file.name,
                 'timestamp': timestamp,
                 'content_hash': content_hash,
                 'url': cdn_url,
                 's3_key': s3_key,
-            })
+            }
+            if thumbnail_future is not None:
+                try:
+                    thumbnail_future.result()
+                    screenshot['thumbnail_url'] = f"https://{cloudfront_domain}/{thumbnail_key}"
+                except Exception as e:
+                    print(f"⚠️ Failed to upload thumbnail for {png_file.name}: {e}")
+            uploaded.append(screenshot)
 
             print(f"📸 Uploaded screenshot: {png_file.name}")
 
-        except Exception as e:
-            print(f"⚠️ Failed to upload {png_file.name}: {e}")
-
     return uploaded
 
 
@@ -1466,10 +1833,9 @@ def post_session_info_to_issue(
 ) -> bool:
     """Post session ID to GitHub issue for tracking and manual termination."""
     try:
-        from github import Github
+        from src.github_client import get_github_client
 
-        gh = Github(github_token)
-        repo = gh.get_repo(github_repo)
+        repo = get_github_client(github_token).get_repo(github_repo)
         issue = repo.get_issue(issue_number)
 
         timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -1516,10 +1882,9 @@ def post_screenshots_to_issue(
         return True
 
     try:
-        from github import Github
+        from src.github_client import get_github_client
 
-        gh = Github(github_token)
-        repo = gh.get_repo(github_repo)
+        repo = get_github_client(github_token).get_repo(github_repo)
         issue = repo.get_issue(issue_number)
 
         # Build comment with embedded images
@@ -1528,7 +1893,11 @@ def post_screenshots_to_issue(
 
         for ss in screenshots:
             comment += f"**{ss['filename']}**\n"
-            comment += f"![{ss['filename']}]({ss['url']})\n\n"
+            if ss.get('thumbnail_url'):
+                # Small preview linking to the full image
+                comment += f"[![{ss['filename']}]({ss['thumbnail_url']})]({ss['url']})\n\n"
+            else:
+                comment += f"![{ss['filename']}]({ss['url']})\n\n"
 
         issue.create_comment(comment)
         print(f"📝 Posted {len(screenshots)} screenshot(s) to issue #{issue_number}")
@@ -1539,6 +1908,34 @@ def post_screenshots_to_issue(
         return False
 
 
+async def send_legacy_commit_notification(post: Callable[[List[str]], Awaitable[bool]]) -> List[str]:
+    """Post the commits queued in legacy_pending_notification as one batch.
+
+    The batch is taken off the queue before the post is awaited, so commits
+    queued while it is in flight wait for the next batch instead of being
+    dropped with it. If the post fails or raises, the batch goes back to the
+    front of the queue.
+
+    Args:
+        post: Coroutine function posting a list of SHAs, returning True on success
+
+    Returns:
+        The SHAs posted, or an empty list if nothing was posted
+    """
+    pending_shas = legacy_pending_notification[:]
+    del legacy_pending_notification[:len(pending_shas)]
+    if not pending_shas:
+        return []
+
+    success = False
+    try:
+        success = await post(pending_shas)
+    finally:
+        if not success:
+            legacy_pending_notification[:0] = pending_shas
+    return pending_shas if success else []
+
+
 def post_commits_to_issue(
     shas: list[str],
     branch_name: str,
@@ -1578,10 +1975,9 @@ def post_commits_to_issue(
             print(f"ℹ️ Filtering {len(shas) - len(new_shas)} already-announced commit(s)")
 
     try:
-        from github import Github
+        from src.github_client import get_github_client
 
-        gh = Github(github_token)
-        repo = gh.get_repo(github_repo)
+        repo = get_github_client(github_token).get_repo(github_repo)
         issue = repo.get_issue(issue_number)
 
         timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S UTC")
@@ -1639,6 +2035,271 @@ Branch: [`{branch_name}`]({branch_url})
         return False
 
 
+# Periodic background jobs for the handler loop
+SCHEDULER_JITTER_FRACTION = 0.1  # Randomize each delay by ±10% so jobs don't fire in lockstep
+SCHEDULER_MAX_BACKOFF_SECONDS = 1800  # Cap on the retry delay after consecutive failures
+
+
+class PeriodicJob:
+    """A coroutine function run repeatedly by TaskScheduler on its own cadence."""
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]],
+        jitter: float = SCHEDULER_JITTER_FRACTION,
+        max_backoff: float = SCHEDULER_MAX_BACKOFF_SECONDS,
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.jitter = jitter
+        self.max_backoff = max(max_backoff, interval)
+        self.failures = 0  # Consecutive failed runs
+
+    def next_delay(self) -> float:
+        """Seconds until the next run.
+
+        The interval doubles with every consecutive failure (up to max_backoff)
+        and is then randomized by the jitter fraction.
+        """
+        delay = self.interval
+        if self.failures:
+            delay = min(self.interval * 2 ** min(self.failures, 16), self.max_backoff)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class TaskScheduler:
+    """Runs periodic jobs as independent asyncio tasks.
+
+    Each job sleeps on its own cadence, so a slow run (e.g. a GitHub API call)
+    only delays that job. Jobs can't yield from the handler's generator, so
+    they return events instead; the scheduler queues them and the handler
+    yields them while it waits. A job that raises is retried with
+    exponential backoff instead of crashing the handler.
+    """
+
+    def __init__(self):
+        self._jobs: List[PeriodicJob] = []
+        self._tasks: List[asyncio.Task] = []
+        self._events: deque = deque()
+        self._signal: Optional[asyncio.Event] = None
+        self._wake_requested = False
+
+    def add(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[Optional[List[Dict[str, Any]]]]],
+        **options: Any,
+    ) -> bool:
+        """Register a periodic job. Must be called before start().
+
+        Args:
+            name: Job name used in log messages
+            interval: Seconds between runs (0 or less disables the job)
+            func: Coroutine function returning events to yield, or None
+            **options: PeriodicJob options (jitter, max_backoff)
+
+        Returns:
+            True if the job was registered
+        """
+        if interval <= 0:
+            return False
+        self._jobs.append(PeriodicJob(name, interval, func, **options))
+        return True
+
+    def start(self) -> None:
+        """Start every registered job on the running event loop."""
+        self._signal = asyncio.Event()
+        for job in self._jobs:
+            self._tasks.append(asyncio.create_task(self._run(job), name=f"periodic:{job.name}"))
+            print(f"⏱️  Scheduled {job.name} every {job.interval}s")
+
+    def spawn(self, name: str, func: Callable[[], Awaitable[None]]) -> None:
+        """Run a long-lived coroutine alongside the jobs, cancelled by stop()."""
+        self._tasks.append(asyncio.create_task(func(), name=name))
+
+    def stop(self) -> None:
+        """Cancel all running jobs."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Queue an event for the handler to yield."""
+        self._events.append(event)
+        if self._signal:
+            self._signal.set()
+
+    def wake(self) -> None:
+        """Ask the handler to run its next loop iteration immediately."""
+        self._wake_requested = True
+        if self._signal:
+            self._signal.set()
+
+    def drain_events(self) -> List[Dict[str, Any]]:
+        """Return all queued events (oldest first)."""
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until an event is queued, a wake is requested, or the timeout elapses.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a wake was requested
+        """
+        if self._signal is None:
+            await asyncio.sleep(timeout)
+            return False
+
+        if not self._events and not self._wake_requested:
+            try:
+                await asyncio.wait_for(self._signal.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._signal.clear()
+
+        woken, self._wake_requested = self._wake_requested, False
+        return woken
+
+    async def _run(self, job: PeriodicJob) -> None:
+        delay = job.next_delay()
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                events = await job.func()
+            except Exception as e:
+                job.failures += 1
+                delay = job.next_delay()
+                print(f"⚠️ {job.name} failed ({job.failures} in a row), retrying in {delay:.0f}s: {e}")
+                continue
+
+            job.failures = 0
+            for event in events or ():
+                self.emit(event)
+            delay = job.next_delay()
+
+
+# Blocking calls made from the handler (git, GitHub API, S3, other AWS APIs)
+# run on a bounded thread pool so they never stall the event loop
+BLOCKING_POOL_MAX_WORKERS = int(os.environ.get("BLOCKING_POOL_MAX_WORKERS", "6"))
+# Concurrency limit and timeout in seconds for each kind of blocking call
+BLOCKING_CALL_LIMITS = {
+    "git": (1, 600),  # Serialized: pushes and hook installs share the working tree
+    "github": (2, 120),
+    "s3": (2, 600),  # Whole screenshot batches
+    "aws": (2, 60),  # CloudWatch metrics, SSM, Secrets Manager
+    "backlog": (1, 60),  # SQLite store and JSON export; serialized like the store itself
+    "process": (1, 30),  # Waiting on the agent subprocess to exit
+}
+
+
+class BlockingCallPool:
+    """Bounded thread pool for the handler's blocking calls.
+
+    Each kind of call has its own concurrency limit and timeout. A call that
+    times out raises asyncio.TimeoutError in the caller right away, but its
+    concurrency slot is only released once the call actually returns, so a
+    hung call can't let more of the same kind pile up behind it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = BLOCKING_POOL_MAX_WORKERS,
+        limits: Optional[Dict[str, tuple]] = None,
+    ):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="handler-io")
+        self._limits = dict(limits or BLOCKING_CALL_LIMITS)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._waiting = 0  # Callers blocked on a concurrency limit
+        self._submitted = 0  # Handed to the executor and not yet finished
+        self._running = 0  # Executing on a worker thread
+        self._lock = threading.Lock()
+
+    async def run(self, kind: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) on the pool.
+
+        Args:
+            kind: Call kind from BLOCKING_CALL_LIMITS (e.g. "git", "github")
+            func: Blocking callable
+            *args, **kwargs: Arguments for func
+
+        Returns:
+            func's return value
+
+        Raises:
+            asyncio.TimeoutError: If the call exceeds the timeout for its kind
+        """
+        limit, timeout = self._limits[kind]
+        semaphore = self._semaphores.get(kind)
+        if semaphore is None:
+            semaphore = self._semaphores[kind] = asyncio.Semaphore(limit)
+
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, self._call, func, args, kwargs
+            )
+        except BaseException:
+            semaphore.release()
+            raise
+        self._submitted += 1
+
+        def _release(_):
+            self._submitted -= 1
+            semaphore.release()
+
+        future.add_done_callback(_release)
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    async def run_or(self, default: Any, kind: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Like run(), but log a timeout and return default instead of raising."""
+        try:
+            return await self.run(kind, func, *args, **kwargs)
+        except asyncio.TimeoutError:
+            print(f"⚠️ {getattr(func, '__name__', func)} timed out after {self._limits[kind][1]}s (continuing)")
+            return default
+
+    def stats(self) -> Dict[str, int]:
+        """Current queue depth.
+
+        Returns:
+            Dict with waiting (blocked on a concurrency limit), queued (waiting
+            for a worker thread) and running call counts
+        """
+        with self._lock:
+            running = self._running
+        return {
+            "waiting": self._waiting,
+            "queued": max(self._submitted - running, 0),
+            "running": running,
+        }
+
+    def shutdown(self) -> None:
+        """Stop accepting calls; calls already running are left to finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> Any:
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+
 # Initialize AgentCore app
 app = BedrockAgentCoreApp()
 
@@ -1807,6 +2468,9 @@ async def handler(payload: Dict[str, Any], context: Any) -> Iterator[Dict[str, A
     target_branch = None  # Branch to push to (set based on mode)
     restart_count = 0  # Track restart count for resumed sessions
 
+    # Blocking calls (git, GitHub, S3, AWS, backlog) go through a bounded thread pool
+    io_pool = BlockingCallPool()
+
     # Handle resume mode - read state from previous session
     if resume_session:
         print(f"\n{'='*80}")
@@ -1947,7 +2611,7 @@ Commits should reference this issue: `Ref: #{issue_number}`
             )
 
             # Update backlog status to "in progress"
-            update_backlog_item_status(BACKLOG_FILE_PATH, issue_number, "in progress")
+            await io_pool.run_or(None, "backlog", update_backlog_item_status, BACKLOG_FILE_PATH, issue_number, "in progress")
 
             yield {
                 "event": "setup_complete",
@@ -1966,9 +2630,8 @@ Commits should reference this issue: `Ref: #{issue_number}`
             # If resuming, post a resume notification instead of new session info
             if resume_session and restart_count > 0:
                 try:
-                    from github import Github
-                    gh = Github(github_token)
-                    repo = gh.get_repo(github_repo)
+                    from src.github_client import get_github_client
+                    repo = get_github_client(github_token).get_repo(github_repo)
                     issue = repo.get_issue(issue_number)
                     issue.create_comment(f"""🔄 **Session Resumed** (Restart #{restart_count})
 
@@ -2035,6 +2698,21 @@ Progress will continue from where the previous session left off.""")
     task_id = app.add_async_task(f"building_{project}")
     print(f"📋 Registered async task: {task_id}")
 
+    # Open the agent event channel before the agent starts so it inherits the socket path
+    # The channel is bound to this invocation's event loop, so each invocation
+    # opens its own; an agent still running from an earlier one keeps sending
+    # to the same socket path
+    control_channel = None
+    if CONTROL_CHANNEL_AVAILABLE:
+        channel = ControlChannelServer()
+        if channel.start():
+            control_channel = channel
+            os.environ[CONTROL_SOCKET_ENV] = channel.path
+            print(f"📡 Listening for agent events on {channel.path}")
+
+    # Latest telemetry pushed by the agent over the control channel
+    agent_telemetry: Dict[str, Any] = {}
+
     # Start agent in background thread
     if agent_process is None or agent_process.poll() is not None:
         thread = threading.Thread(
@@ -2049,7 +2727,9 @@ Progress will continue from where the previous session left off.""")
         await asyncio.sleep(5)
 
     # Stream status updates to keep session alive
-    # Yield every 30 seconds with progress updates
+    # Yield every 30 seconds with progress updates. The periodic jobs below run
+    # on their own schedules (see TaskScheduler), so their intervals can be
+    # shorter or longer than this.
     check_interval = 30
     max_duration = session_duration  # 7 hours in seconds
 
@@ -2058,16 +2738,13 @@ Progress will continue from where the previous session left off.""")
     # Set to 0 to disable periodic pushing entirely (only push at end)
     # This serves as a fallback in case the post-commit hook fails
     push_interval = int(os.environ.get("PUSH_INTERVAL_SECONDS", "1800"))
-    last_push_time = time.time()
 
     # Token refresh interval (10 minutes) to keep the post-commit hook working
     token_refresh_interval = 600  # 10 minutes
-    last_token_refresh_time = time.time()
 
     # Commit queue check interval - how often to check for commits pushed by the hook
     # and announce them to the GitHub issue
-    commit_queue_check_interval = 30  # Check every 30 seconds
-    last_commit_queue_check_time = time.time()
+    commit_queue_check_interval = int(os.environ.get("COMMIT_QUEUE_CHECK_INTERVAL_SECONDS", "30"))
 
     # Batched notification interval - how often to post commit summaries to GitHub issue
     # Default is 5 minutes (300s). Set to 0 to disable batched notifications.
@@ -2079,24 +2756,20 @@ Progress will continue from where the previous session left off.""")
     screenshot_interval = int(os.environ.get("SCREENSHOT_INTERVAL_SECONDS", "300"))
     screenshot_bucket = os.environ.get("SCREENSHOT_BUCKET", "claude-code-reinvent-screenshots")
     cloudfront_domain = os.environ.get("SCREENSHOT_CDN_DOMAIN", "")
-    last_screenshot_time = time.time()
 
     # Backlog sync configuration
     # Set BACKLOG_SYNC_INTERVAL_SECONDS to 0 to disable periodic syncing
     # Default is 5 minutes (300s) - syncs GitHub issues to human_backlog.json
     backlog_sync_interval = int(os.environ.get("BACKLOG_SYNC_INTERVAL_SECONDS", "300"))
-    last_backlog_sync_time = time.time()
 
     # Health check logging - periodic status report
     health_check_interval = 3600  # Log health status every hour
-    last_health_check_time = time.time()
     total_commits_notified = 0
     total_screenshots_uploaded = 0
 
     # CloudWatch heartbeat interval - publish SessionHeartbeat metric for GHA health monitor
     # GHA checks this metric to detect dead sessions and trigger restarts
     heartbeat_interval = int(os.environ.get("HEARTBEAT_INTERVAL_SECONDS", "60"))  # Every 60 seconds
-    last_heartbeat_time = time.time()
 
     # Log push configuration at startup for debugging
     print(f"\n{'='*80}")
@@ -2148,15 +2821,412 @@ Progress will continue from where the previous session left off.""")
         # Publish session start metric
         mode = "enhancement" if is_enhancement else "full_build"
         metrics_publisher.publish_session_started(mode=mode)
-        print(f"📊 CloudWatch metrics enabled (namespace: ClaudeCodeAgent)")
+        print(f"📊 CloudWatch metrics enabled (namespace: ClaudeCodeAgent, mode: {metrics_publisher.mode})")
 
     # Track cumulative commits for metrics
     total_commits_pushed = 0
 
+    # Periodic jobs. Each runs as its own asyncio task (see TaskScheduler) and
+    # returns the events to yield; exceptions are retried with backoff.
+    async def refresh_token_job():
+        """Refresh GitHub token file for post-commit hook."""
+        nonlocal github_token
+        fresh_token = await io_pool.run("aws", get_github_token, github_repo)
+        if fresh_token:
+            if git_manager:
+                # Update GitManager's config with fresh token
+                git_manager.github_config.token = fresh_token
+                git_manager.refresh_token_file()
+            else:
+                write_github_token_to_file(fresh_token)
+            github_token = fresh_token  # Update local reference
+            print(f"🔄 Refreshed GitHub token for post-commit hook")
+
+    async def commit_queue_job():
+        """Install hooks in new repos and track commits pushed by the hook."""
+        nonlocal total_commits_pushed
+
+        # Scan for new git repositories and install hooks
+        # The agent may create nested git repos (e.g., `git init` in subdirectory)
+        # We need to install our post-commit hook in any new repos we find
+        try:
+            if git_manager:
+                new_hooks = await io_pool.run("git", git_manager.scan_and_install_hooks)
+            else:
+                new_hooks = await io_pool.run(
+                    "git", scan_and_install_hooks, build_dir, github_repo, target_branch
+                )
+            if new_hooks > 0:
+                print(f"🔧 Installed post-commit hooks in {new_hooks} new git repo(s)")
+        except Exception as e:
+            print(f"⚠️ scan_and_install_hooks error: {e}")
+
+        # Process commit queue from post-commit hook
+        # The hook writes SHAs to a file after successful pushes
+        # Use GitManager if available, otherwise fall back to legacy
+        if git_manager:
+            queued_shas = git_manager.read_commit_queue()
+        else:
+            queued_shas = read_and_clear_commit_queue()
+
+        if not queued_shas:
+            return None
+
+        # Track commits using GitManager or legacy globals
+        if git_manager:
+            new_shas = git_manager.track_commits(queued_shas)
+            # Queue for batched notification
+            if new_shas:
+                git_manager.queue_for_notification(new_shas)
+        else:
+            # Legacy: filter out duplicates using globals
+            new_shas = [sha for sha in queued_shas if sha not in announced_commits]
+            if new_shas:
+                announced_commits.update(new_shas)
+                session_pushed_commits.extend(new_shas)
+                legacy_pending_notification.extend(new_shas)  # Queue for notification
+
+        if not new_shas:
+            return None
+
+        # Track total commits for metrics
+        total_commits_pushed += len(new_shas)
+
+        # Publish CloudWatch metrics for commits
+        if metrics_publisher:
+            await io_pool.run("aws", metrics_publisher.publish_commits_pushed, len(new_shas))
+
+        print(f"📤 Tracked {len(new_shas)} commit(s) via post-commit hook")
+
+        return [{
+            "event": "commits_pushed",
+            "count": len(new_shas),
+            "shas": new_shas,
+            "branch": target_branch,
+            "source": "post-commit-hook"
+        }]
+
+    async def commit_notification_job():
+        """Send batched notification to GitHub issue (every N minutes)."""
+        nonlocal total_commits_notified, last_notification_time
+        current_time = time.time()
+
+        async def post_pending(shas: List[str]) -> bool:
+            return await io_pool.run(
+                "github",
+                post_commits_to_issue,
+                shas=shas,
+                branch_name=target_branch,
+                github_repo=github_repo,
+                issue_number=issue_number,
+                github_token=github_token,
+                build_dir=build_dir,
+                is_final_summary=False
+            )
+
+        if git_manager:
+            if not git_manager.should_send_notification(notification_interval):
+                return
+            pending_shas = git_manager.get_pending_notifications()
+            if not pending_shas or not await post_pending(pending_shas):
+                return
+            git_manager.mark_notification_sent()
+        else:
+            # Legacy: check time since last notification and use legacy_pending_notification
+            if (current_time - last_notification_time) < notification_interval:
+                return
+            pending_shas = await send_legacy_commit_notification(post_pending)
+            if not pending_shas:
+                return
+
+        total_commits_notified += len(pending_shas)
+        last_notification_time = current_time
+        print(f"📝 Posted {len(pending_shas)} commit(s) to GitHub issue #{issue_number}")
+
+    async def fallback_push_job():
+        """Push any unpushed commits the post-commit hook might have missed."""
+        nonlocal total_commits_pushed
+
+        # Use GitManager if available, otherwise fall back to legacy
+        if git_manager:
+            success, count, shas = await io_pool.run("git", git_manager.push_pending_commits)
+        else:
+            success, count, shas = await io_pool.run(
+                "git",
+                push_pending_commits,
+                build_dir=build_dir,
+                github_repo=github_repo,
+                github_token=github_token,
+                branch_name=target_branch
+            )
+
+        if not success:
+            # Publish push failure metric
+            if metrics_publisher:
+                await io_pool.run("aws", metrics_publisher.publish_push_failed)
+            return [{
+                "event": "push_failed",
+                "branch": target_branch,
+                "message": "Periodic push failed - see logs for details"
+            }]
+        if count == 0:
+            return None
+
+        # Track commits using GitManager or legacy globals
+        if git_manager:
+            new_shas = git_manager.track_commits(shas)
+            if new_shas:
+                git_manager.queue_for_notification(new_shas)
+        else:
+            # Legacy: filter out duplicates
+            new_shas = [sha for sha in shas if sha not in announced_commits]
+            if new_shas:
+                announced_commits.update(new_shas)
+                session_pushed_commits.extend(new_shas)
+                legacy_pending_notification.extend(new_shas)  # Queue for notification
+
+        if not new_shas:
+            return None
+
+        # Track total commits for metrics
+        total_commits_pushed += len(new_shas)
+
+        # Publish CloudWatch metrics for commits
+        if metrics_publisher:
+            await io_pool.run("aws", metrics_publisher.publish_commits_pushed, len(new_shas))
+
+        print(f"📤 Fallback push: {len(new_shas)} commit(s) pushed")
+
+        return [{
+            "event": "commits_pushed",
+            "count": len(new_shas),
+            "shas": new_shas,
+            "branch": target_branch,
+            "source": "fallback"
+        }]
+
+    async def screenshot_job(png_files: Optional[List[Path]] = None):
+        """Sync screenshots to S3 and post them to the GitHub issue.
+
+        Scans the screenshot directories unless png_files is given.
+        """
+        nonlocal total_screenshots_uploaded
+
+        # Upload new screenshots to S3
+        new_screenshots = await io_pool.run(
+            "s3",
+            upload_screenshots_to_s3,
+            build_dir=build_dir,
+            issue_number=issue_number,
+            session_id=context.session_id,
+            bucket_name=screenshot_bucket,
+            cloudfront_domain=cloudfront_domain,
+            png_files=png_files
+        )
+        if not new_screenshots:
+            return None
+
+        # Post to GitHub issue (non-blocking - failures logged but ignored)
+        try:
+            await io_pool.run(
+                "github",
+                post_screenshots_to_issue,
+                screenshots=new_screenshots,
+                github_repo=github_repo,
+                issue_number=issue_number,
+                github_token=github_token
+            )
+            total_screenshots_uploaded += len(new_screenshots)
+        except Exception as gh_err:
+            print(f"⚠️ Failed to post screenshots to GitHub (continuing): {gh_err}")
+
+        # Publish CloudWatch metrics for screenshots
+        if metrics_publisher:
+            await io_pool.run("aws", metrics_publisher.publish_screenshots_uploaded, len(new_screenshots))
+
+        return [{
+            "event": "screenshots_uploaded",
+            "count": len(new_screenshots),
+            "issue_number": issue_number
+        }]
+
+    async def screenshot_watch_listener():
+        """Upload screenshots as soon as the agent finishes writing them."""
+        while True:
+            png_files = await screenshot_watcher.wait_for_files()
+            # Gather the rest of a test run's screenshots into the same batch,
+            # so the issue gets one comment per burst rather than per file
+            await asyncio.sleep(SCREENSHOT_BATCH_WINDOW_SECONDS)
+            png_files += await screenshot_watcher.wait_for_files(timeout=0)
+            try:
+                for event in await screenshot_job(png_files) or ():
+                    scheduler.emit(event)
+            except Exception as e:
+                # Log error but never crash the agent
+                print(f"⚠️ Screenshot sync error (continuing): {e}")
+
+    async def backlog_sync_job():
+        """Sync GitHub issues to the backlog file."""
+        # Periodic and webhook-triggered syncs both rewrite the backlog file
+        async with backlog_sync_lock:
+            new_issues = await io_pool.run(
+                "github",
+                sync_github_issues_to_backlog,
+                github_repo=github_repo,
+                github_token=github_token,
+                backlog_path=BACKLOG_FILE_PATH
+            )
+        if not new_issues:
+            return None
+
+        print(f"🔄 Periodic backlog sync: {len(new_issues)} new issue(s) added")
+        return [{
+            "event": "backlog_synced",
+            "new_issues": len(new_issues),
+            "message": f"Synced {len(new_issues)} new issue(s) to backlog"
+        }]
+
+    async def webhook_listener():
+        """Sync the backlog as soon as GitHub reports an issue change."""
+        while True:
+            if not await webhook_receiver.wait():
+                continue
+            await asyncio.sleep(WEBHOOK_BATCH_WINDOW_SECONDS)
+            deliveries = webhook_receiver.drain()
+            if not deliveries:
+                continue
+
+            issue_numbers = sorted({d["issue_number"] for d in deliveries if d["issue_number"]})
+            issue_list = ", ".join(f"#{n}" for n in issue_numbers)
+            print(f"🪝 GitHub webhook: {len(deliveries)} delivery(ies) for {issue_list}, syncing backlog")
+            try:
+                for event in await backlog_sync_job() or ():
+                    scheduler.emit(event)
+            except Exception as e:
+                # Log error but never crash the agent; the periodic sync will catch up
+                print(f"⚠️ Webhook backlog sync error (continuing): {e}")
+
+    async def heartbeat_job():
+        """Publish CloudWatch heartbeat metric for GHA health monitor."""
+        if await io_pool.run("aws", metrics_publisher.publish_session_heartbeat):
+            # Buffered publishers only queue the datapoint; the flush thread sends it
+            action = "Queued heartbeat for" if metrics_publisher.flush_interval > 0 else "Published heartbeat to"
+            print(f"💓 {action} CloudWatch (namespace=ClaudeCodeAgent, metric=SessionHeartbeat, issue={issue_number})")
+        else:
+            print(f"⚠️ Heartbeat publish returned False (metrics disabled or no client)")
+
+    async def health_check_job():
+        """Log reporting status."""
+        current_elapsed = time.time() - session_start_time
+        pending_count = len(legacy_pending_notification) if not git_manager else 0
+        pool_stats = io_pool.stats()
+        health_log = {
+            "type": "HEALTH_CHECK",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "session_id": context.session_id,
+            "issue_number": issue_number,
+            "elapsed_hours": round(current_elapsed / 3600, 2),
+            "total_commits_pushed": total_commits_pushed,
+            "total_commits_notified": total_commits_notified,
+            "total_screenshots_uploaded": total_screenshots_uploaded,
+            "pending_notifications": pending_count,
+            "git_manager_active": git_manager is not None,
+            "screenshot_cdn_configured": bool(cloudfront_domain),
+            "worker_pool": pool_stats,
+        }
+        print(json.dumps(health_log))
+        print(f"\n📊 HEALTH CHECK - Session running {round(current_elapsed / 3600, 1)}h")
+        print(f"   Commits: {total_commits_pushed} pushed, {total_commits_notified} notified to issue")
+        print(f"   Screenshots: {total_screenshots_uploaded} uploaded")
+        print(f"   Pending notifications: {pending_count}")
+        print(f"   GitManager: {'active' if git_manager else 'legacy mode'}")
+        print(f"   Screenshot CDN: {'configured' if cloudfront_domain else 'NOT SET'}")
+        print(f"   Worker pool: {pool_stats['running']} running, {pool_stats['queued']} queued, {pool_stats['waiting']} waiting\n")
+
+    async def agent_events_listener():
+        """Apply agent events as they arrive, waking the handler on completion or pause."""
+        while True:
+            if await control_channel.wait(check_interval):
+                if _apply_agent_events(control_channel.drain(), agent_telemetry):
+                    scheduler.wake()
+
+    scheduler = TaskScheduler()
+    if github_mode and github_token:
+        scheduler.add("token_refresh", token_refresh_interval, refresh_token_job)
+    if github_mode and build_dir and github_token:
+        scheduler.add("commit_queue", commit_queue_check_interval, commit_queue_job)
+    if github_mode and github_token and notification_interval > 0:
+        # Polls at the commit queue cadence; the notification interval itself
+        # is enforced by should_send_notification()
+        scheduler.add("commit_notifications", commit_queue_check_interval, commit_notification_job)
+    if github_mode and build_dir and github_token:
+        # Fallback: Periodically push any unpushed commits to GitHub
+        # Default interval is 30 minutes (much longer than before since hook handles most pushes)
+        scheduler.add("fallback_push", push_interval, fallback_push_job)
+    screenshot_watcher = None
+    if github_mode and build_dir and github_token and cloudfront_domain and screenshot_interval > 0:
+        # Pick screenshots up as they are written; fall back to periodic
+        # directory scans where inotify isn't available
+        if FILE_WATCHER_AVAILABLE:
+            screenshot_watcher = DirectoryWatcher(
+                get_screenshot_dirs(build_dir), suffix=".png", debounce=SCREENSHOT_DEBOUNCE_SECONDS
+            )
+            if screenshot_watcher.start():
+                scheduler.spawn("screenshot_watch", screenshot_watch_listener)
+                print(f"👀 Watching screenshot directories for new PNGs")
+            else:
+                screenshot_watcher = None
+        if screenshot_watcher is None:
+            scheduler.add("screenshot_sync", screenshot_interval, screenshot_job)
+    elif github_mode and build_dir and screenshot_interval > 0:
+        # Log why screenshot upload was skipped (only once, not every session)
+        if not hasattr(upload_screenshots_to_s3, '_skip_logged'):
+            missing_reasons = []
+            if not cloudfront_domain:
+                missing_reasons.append("SCREENSHOT_CDN_DOMAIN not configured")
+            if not github_token:
+                missing_reasons.append("GitHub token not available")
+
+            if missing_reasons:
+                print(f"⏭️  Skipping screenshot upload: {', '.join(missing_reasons)}")
+                print(f"   Fix: Run 'make update-runtime-env' to configure the runtime")
+
+            upload_screenshots_to_s3._skip_logged = True
+    backlog_sync_lock = asyncio.Lock()
+    if github_mode and github_token:
+        # Kept even with webhooks enabled, to reconcile reactions and missed deliveries
+        scheduler.add("backlog_sync", backlog_sync_interval, backlog_sync_job)
+    webhook_receiver = None
+    webhook_port = int(os.environ.get(WEBHOOK_PORT_ENV, "0")) if WEBHOOK_RECEIVER_AVAILABLE else 0
+    if github_mode and github_token and webhook_port > 0:
+        webhook_secret = os.environ.get(WEBHOOK_SECRET_ENV, "")
+        if webhook_secret:
+            webhook_receiver = WebhookReceiver(
+                webhook_secret,
+                webhook_port,
+                host=os.environ.get(WEBHOOK_HOST_ENV, DEFAULT_WEBHOOK_HOST),
+                repo=github_repo,
+            )
+        else:
+            print(f"⚠️ {WEBHOOK_PORT_ENV} is set but {WEBHOOK_SECRET_ENV} is not, GitHub webhooks disabled")
+    if metrics_publisher:
+        scheduler.add("heartbeat", heartbeat_interval, heartbeat_job)
+    scheduler.add("health_check", health_check_interval, health_check_job)
+
     elapsed = 0
     task_completed = False  # Track if async task has been completed
     wip_commit_created = False  # Track if WIP commit was made before timeout
     try:
+      scheduler.start()
+      if control_channel:
+          scheduler.spawn("agent_events", agent_events_listener)
+      if webhook_receiver:
+          if webhook_receiver.start():
+              scheduler.spawn("webhook_intake", webhook_listener)
+              print(f"🪝 Listening for GitHub webhooks on {webhook_receiver.host}:{webhook_receiver.port} ({WEBHOOK_PATH})")
+          else:
+              webhook_receiver = None
+
       while elapsed < max_duration:
         current_elapsed = time.time() - session_start_time
         remaining = max_duration - current_elapsed
@@ -2177,12 +3247,17 @@ Progress will continue from where the previous session left off.""")
             # Push any pending commits
             if github_mode and build_dir and github_token:
                 if git_manager:
-                    success, count, shas = git_manager.push_pending_commits()
+                    success, count, shas = await io_pool.run_or(
+                        (False, 0, []), "git", git_manager.push_pending_commits
+                    )
                     # Track these commits so they appear in get_session_commits()
                     if success and shas:
                         git_manager.track_commits(shas)
                 else:
-                    success, count, shas = push_pending_commits(
+                    success, count, shas = await io_pool.run_or(
+                        (False, 0, []),
+                        "git",
+                        push_pending_commits,
                         build_dir=build_dir,
                         github_repo=github_repo,
                         github_token=github_token,
@@ -2199,7 +3274,10 @@ Progress will continue from where the previous session left off.""")
                 # Post commits to the issue before marking complete
                 all_session_commits = git_manager.get_session_commits() if git_manager else session_pushed_commits
                 if all_session_commits:
-                    post_commits_to_issue(
+                    await io_pool.run_or(
+                        False,
+                        "github",
+                        post_commits_to_issue,
                         shas=all_session_commits,
                         branch_name=target_branch,
                         github_repo=github_repo,
@@ -2209,8 +3287,10 @@ Progress will continue from where the previous session left off.""")
                         is_final_summary=True
                     )
 
-                release_github_issue(github_repo, github_token, issue_number, mark_complete=True)
-                update_backlog_item_status(BACKLOG_FILE_PATH, issue_number, "done", completed=True)
+                await io_pool.run_or(
+                    False, "github", release_github_issue, github_repo, github_token, issue_number, mark_complete=True
+                )
+                await io_pool.run_or(None, "backlog", update_backlog_item_status, BACKLOG_FILE_PATH, issue_number, "done", completed=True)
 
                 yield {
                     "event": "issue_completed",
@@ -2224,7 +3304,7 @@ Progress will continue from where the previous session left off.""")
                 print(f"\n🔄 Checking backlog for more approved issues...")
 
                 next_issue = None
-                backlog_item = get_next_backlog_item(BACKLOG_FILE_PATH)
+                backlog_item = await io_pool.run_or(None, "backlog", get_next_backlog_item, BACKLOG_FILE_PATH)
                 if backlog_item and backlog_item.get("github_issue"):
                     next_issue = {
                         "number": backlog_item["github_issue"],
@@ -2235,7 +3315,7 @@ Progress will continue from where the previous session left off.""")
 
                 if next_issue:
                     # Claim the new issue
-                    if claim_github_issue(github_repo, github_token, next_issue["number"]):
+                    if await io_pool.run_or(False, "github", claim_github_issue, github_repo, github_token, next_issue["number"]):
                         # Update variables for new issue
                         issue_number = next_issue["number"]
                         issue_title = next_issue["title"]
@@ -2271,17 +3351,22 @@ Commits should reference this issue: `Ref: #{issue_number}`
                         feature_request_path.write_text(feature_request)
 
                         # Update backlog status
-                        update_backlog_item_status(BACKLOG_FILE_PATH, issue_number, "in progress")
+                        await io_pool.run_or(None, "backlog", update_backlog_item_status, BACKLOG_FILE_PATH, issue_number, "in progress")
 
                         # Store new issue/session in SSM for health monitor
-                        store_session_state_ssm(issue_number, session_id=context.session_id)
+                        await io_pool.run_or(
+                            False, "aws", store_session_state_ssm, issue_number, session_id=context.session_id
+                        )
 
                         # Post session info to the new issue
                         agent_runtime_arn = os.environ.get(
                             "AGENT_RUNTIME_ARN",
                             "arn:aws:bedrock-agentcore:us-west-2:128673662201:runtime/antodo_agent-0UyfaL5NVq"
                         )
-                        post_session_info_to_issue(
+                        await io_pool.run_or(
+                            False,
+                            "github",
+                            post_session_info_to_issue,
                             github_repo=github_repo,
                             issue_number=issue_number,
                             session_id=context.session_id,
@@ -2325,9 +3410,14 @@ Commits should reference this issue: `Ref: #{issue_number}`
             if github_mode and agent_process.returncode == 0 and build_dir and github_token:
                 # Final push to ensure any remaining commits are pushed
                 if git_manager:
-                    success, count, shas = git_manager.push_pending_commits()
+                    success, count, shas = await io_pool.run_or(
+                        (False, 0, []), "git", git_manager.push_pending_commits
+                    )
                 else:
-                    success, count, shas = push_pending_commits(
+                    success, count, shas = await io_pool.run_or(
+                        (False, 0, []),
+                        "git",
+                        push_pending_commits,
                         build_dir=build_dir,
                         github_repo=github_repo,
                         github_token=github_token,
@@ -2352,7 +3442,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
 
                     # Post ONE summary comment with ALL commits from this session
                     if all_session_commits:
-                        post_commits_to_issue(
+                        await io_pool.run_or(
+                            False,
+                            "github",
+                            post_commits_to_issue,
                             shas=all_session_commits,
                             branch_name=target_branch,
                             github_repo=github_repo,
@@ -2401,7 +3494,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
 
             # Publish session completed metric
             if metrics_publisher:
-                metrics_publisher.publish_session_completed(
+                await io_pool.run_or(
+                    False,
+                    "aws",
+                    metrics_publisher.publish_session_completed,
                     exit_code=agent_process.returncode,
                     duration_seconds=current_elapsed,
                 )
@@ -2417,9 +3513,11 @@ Commits should reference this issue: `Ref: #{issue_number}`
 
             # Release the current issue (remove agent-building, add agent-complete)
             if github_mode and github_token and issue_number:
-                release_github_issue(github_repo, github_token, issue_number, mark_complete=True)
+                await io_pool.run_or(
+                    False, "github", release_github_issue, github_repo, github_token, issue_number, mark_complete=True
+                )
                 # Update backlog status to complete
-                update_backlog_item_status(BACKLOG_FILE_PATH, issue_number, "done", completed=True)
+                await io_pool.run_or(None, "backlog", update_backlog_item_status, BACKLOG_FILE_PATH, issue_number, "done", completed=True)
 
             # Poll for next issue from backlog (single source of truth)
             # Note: human_backlog.json is populated by sync_github_issues_to_backlog() at startup and periodically
@@ -2431,7 +3529,7 @@ Commits should reference this issue: `Ref: #{issue_number}`
                 # Use backlog as the single source of truth for next issue
                 # GitHub issues are synced TO backlog, we read FROM backlog only
                 next_issue = None
-                backlog_item = get_next_backlog_item(BACKLOG_FILE_PATH)
+                backlog_item = await io_pool.run_or(None, "backlog", get_next_backlog_item, BACKLOG_FILE_PATH)
                 if backlog_item and backlog_item.get("github_issue"):
                     next_issue = {
                         "number": backlog_item["github_issue"],
@@ -2442,7 +3540,7 @@ Commits should reference this issue: `Ref: #{issue_number}`
 
                 if next_issue:
                     # Claim the new issue
-                    if claim_github_issue(github_repo, github_token, next_issue["number"]):
+                    if await io_pool.run_or(False, "github", claim_github_issue, github_repo, github_token, next_issue["number"]):
                         # Update variables for new issue
                         issue_number = next_issue["number"]
                         issue_title = next_issue["title"]
@@ -2487,17 +3585,22 @@ Commits should reference this issue: `Ref: #{issue_number}`
                         )
 
                         # Update backlog status to "in progress"
-                        update_backlog_item_status(BACKLOG_FILE_PATH, issue_number, "in progress")
+                        await io_pool.run_or(None, "backlog", update_backlog_item_status, BACKLOG_FILE_PATH, issue_number, "in progress")
 
                         # Store new issue/session in SSM for health monitor
-                        store_session_state_ssm(issue_number, session_id=context.session_id)
+                        await io_pool.run_or(
+                            False, "aws", store_session_state_ssm, issue_number, session_id=context.session_id
+                        )
 
                         # Post session info to the new issue
                         agent_runtime_arn = os.environ.get(
                             "AGENT_RUNTIME_ARN",
                             "arn:aws:bedrock-agentcore:us-west-2:128673662201:runtime/antodo_agent-0UyfaL5NVq"
                         )
-                        post_session_info_to_issue(
+                        await io_pool.run_or(
+                            False,
+                            "github",
+                            post_session_info_to_issue,
                             github_repo=github_repo,
                             issue_number=issue_number,
                             session_id=context.session_id,
@@ -2542,41 +3645,18 @@ Commits should reference this issue: `Ref: #{issue_number}`
             "issue_number": issue_number,
             "elapsed_hours": round(current_elapsed / 3600, 2),
             "remaining_hours": round(remaining / 3600, 2),
+            "worker_pool": io_pool.stats(),
         }
         print(json.dumps(progress_log))
 
-        # Periodic health check - log reporting status every hour
-        current_time = time.time()
-        if current_time - last_health_check_time >= health_check_interval:
-            pending_count = len(legacy_pending_notification) if not git_manager else 0
-            health_log = {
-                "type": "HEALTH_CHECK",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "session_id": context.session_id,
-                "issue_number": issue_number,
-                "elapsed_hours": round(current_elapsed / 3600, 2),
-                "total_commits_pushed": total_commits_pushed,
-                "total_commits_notified": total_commits_notified,
-                "total_screenshots_uploaded": total_screenshots_uploaded,
-                "pending_notifications": pending_count,
-                "git_manager_active": git_manager is not None,
-                "screenshot_cdn_configured": bool(cloudfront_domain),
-            }
-            print(json.dumps(health_log))
-            print(f"\n📊 HEALTH CHECK - Session running {round(current_elapsed / 3600, 1)}h")
-            print(f"   Commits: {total_commits_pushed} pushed, {total_commits_notified} notified to issue")
-            print(f"   Screenshots: {total_screenshots_uploaded} uploaded")
-            print(f"   Pending notifications: {pending_count}")
-            print(f"   GitManager: {'active' if git_manager else 'legacy mode'}")
-            print(f"   Screenshot CDN: {'configured' if cloudfront_domain else 'NOT SET'}\n")
-            last_health_check_time = current_time
-
         # Read and log token stats from agent subprocess
-        token_stats = {}
+        # (pushed over the control channel, falling back to the stats file)
+        token_stats = dict(agent_telemetry.get("token_stats", {}))
         try:
             token_file = Path("/tmp/token_stats.json")
-            if token_file.exists():
+            if not token_stats and token_file.exists():
                 token_stats = json.loads(token_file.read_text())
+            if token_stats:
                 token_log = {
                     "type": "TOKEN_METRIC",
                     "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -2591,7 +3671,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
         # Publish CloudWatch custom metrics
         if metrics_publisher:
             try:
-                metrics_publisher.publish_progress(
+                await io_pool.run_or(
+                    False,
+                    "aws",
+                    metrics_publisher.publish_progress,
                     elapsed_hours=current_elapsed / 3600,
                     remaining_hours=remaining / 3600,
                     cost_usd=token_stats.get("total_cost_usd", 0.0),
@@ -2599,291 +3682,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
                     input_tokens=token_stats.get("input_tokens", 0),
                     output_tokens=token_stats.get("output_tokens", 0),
                 )
+                await io_pool.run_or(False, "aws", metrics_publisher.publish_worker_pool, **io_pool.stats())
             except Exception as e:
                 print(f"⚠️ CloudWatch publish_progress error: {e}")
 
-        # Refresh GitHub token file for post-commit hook
-        if github_mode and github_token:
-            current_time = time.time()
-            if current_time - last_token_refresh_time >= token_refresh_interval:
-                # Get fresh token and write to file
-                try:
-                    fresh_token = get_github_token(github_repo)
-                except Exception as e:
-                    print(f"⚠️ get_github_token error: {e}")
-                    fresh_token = None
-                if fresh_token:
-                    if git_manager:
-                        # Update GitManager's config with fresh token
-                        git_manager.github_config.token = fresh_token
-                        git_manager.refresh_token_file()
-                    else:
-                        write_github_token_to_file(fresh_token)
-                    github_token = fresh_token  # Update local reference
-                    print(f"🔄 Refreshed GitHub token for post-commit hook")
-                last_token_refresh_time = current_time
-
-        # Scan for new git repositories and install hooks
-        # The agent may create nested git repos (e.g., `git init` in subdirectory)
-        # We need to install our post-commit hook in any new repos we find
-        if github_mode and build_dir and github_token:
-            current_time = time.time()
-            if current_time - last_commit_queue_check_time >= commit_queue_check_interval:
-                try:
-                    if git_manager:
-                        new_hooks = git_manager.scan_and_install_hooks()
-                    else:
-                        new_hooks = scan_and_install_hooks(build_dir, github_repo, target_branch)
-                    if new_hooks > 0:
-                        print(f"🔧 Installed post-commit hooks in {new_hooks} new git repo(s)")
-                except Exception as e:
-                    print(f"⚠️ scan_and_install_hooks error: {e}")
-
-        # Process commit queue from post-commit hook
-        # The hook writes SHAs to a file after successful pushes
-        if github_mode and build_dir and github_token:
-            current_time = time.time()
-            if current_time - last_commit_queue_check_time >= commit_queue_check_interval:
-                # Use GitManager if available, otherwise fall back to legacy
-                if git_manager:
-                    queued_shas = git_manager.read_commit_queue()
-                else:
-                    queued_shas = read_and_clear_commit_queue()
-
-                if queued_shas:
-                    # Track commits using GitManager or legacy globals
-                    if git_manager:
-                        new_shas = git_manager.track_commits(queued_shas)
-                        # Queue for batched notification
-                        if new_shas:
-                            git_manager.queue_for_notification(new_shas)
-                    else:
-                        # Legacy: filter out duplicates using globals
-                        new_shas = [sha for sha in queued_shas if sha not in announced_commits]
-                        if new_shas:
-                            announced_commits.update(new_shas)
-                            session_pushed_commits.extend(new_shas)
-                            legacy_pending_notification.extend(new_shas)  # Queue for notification
-
-                    if new_shas:
-                        # Track total commits for metrics
-                        total_commits_pushed += len(new_shas)
-
-                        # Publish CloudWatch metrics for commits
-                        if metrics_publisher:
-                            metrics_publisher.publish_commits_pushed(len(new_shas))
-
-                        print(f"📤 Tracked {len(new_shas)} commit(s) via post-commit hook")
-
-                        yield {
-                            "event": "commits_pushed",
-                            "count": len(new_shas),
-                            "shas": new_shas,
-                            "branch": target_branch,
-                            "source": "post-commit-hook"
-                        }
-
-                last_commit_queue_check_time = current_time
-
-        # Send batched notification to GitHub issue (every N minutes)
-        if github_mode and github_token and notification_interval > 0:
-            current_time = time.time()
-            should_notify = False
-            pending_shas = []
-
-            if git_manager:
-                should_notify = git_manager.should_send_notification(notification_interval)
-                if should_notify:
-                    pending_shas = git_manager.get_pending_notifications()
-            else:
-                # Legacy: check time since last notification and use legacy_pending_notification
-                should_notify = (current_time - last_notification_time) >= notification_interval
-                if should_notify and legacy_pending_notification:
-                    pending_shas = legacy_pending_notification.copy()
-
-            if should_notify and pending_shas:
-                # Post batched notification to GitHub issue
-                try:
-                    success = post_commits_to_issue(
-                        shas=pending_shas,
-                        branch_name=target_branch,
-                        github_repo=github_repo,
-                        issue_number=issue_number,
-                        github_token=github_token,
-                        build_dir=build_dir,
-                        is_final_summary=False
-                    )
-                    if success:
-                        if git_manager:
-                            git_manager.mark_notification_sent()
-                        else:
-                            # Legacy: clear the pending notification list
-                            legacy_pending_notification.clear()
-                        total_commits_notified += len(pending_shas)
-                        last_notification_time = current_time
-                        print(f"📝 Posted {len(pending_shas)} commit(s) to GitHub issue #{issue_number}")
-                except Exception as e:
-                    print(f"⚠️ post_commits_to_issue error: {e}")
-
-        # Fallback: Periodically push any unpushed commits to GitHub
-        # This catches commits that the post-commit hook might have missed
-        # Default interval is 30 minutes (much longer than before since hook handles most pushes)
-        if github_mode and build_dir and github_token and push_interval > 0:
-            current_time = time.time()
-            if current_time - last_push_time >= push_interval:
-                # Use GitManager if available, otherwise fall back to legacy
-                if git_manager:
-                    success, count, shas = git_manager.push_pending_commits()
-                else:
-                    success, count, shas = push_pending_commits(
-                        build_dir=build_dir,
-                        github_repo=github_repo,
-                        github_token=github_token,
-                        branch_name=target_branch
-                    )
-
-                if success and count > 0:
-                    # Track commits using GitManager or legacy globals
-                    if git_manager:
-                        new_shas = git_manager.track_commits(shas)
-                        if new_shas:
-                            git_manager.queue_for_notification(new_shas)
-                    else:
-                        # Legacy: filter out duplicates
-                        new_shas = [sha for sha in shas if sha not in announced_commits]
-                        if new_shas:
-                            announced_commits.update(new_shas)
-                            session_pushed_commits.extend(new_shas)
-                            legacy_pending_notification.extend(new_shas)  # Queue for notification
-
-                    if new_shas:
-                        # Track total commits for metrics
-                        total_commits_pushed += len(new_shas)
-
-                        # Publish CloudWatch metrics for commits
-                        if metrics_publisher:
-                            metrics_publisher.publish_commits_pushed(len(new_shas))
-
-                        print(f"📤 Fallback push: {len(new_shas)} commit(s) pushed")
-
-                        yield {
-                            "event": "commits_pushed",
-                            "count": len(new_shas),
-                            "shas": new_shas,
-                            "branch": target_branch,
-                            "source": "fallback"
-                        }
-                elif not success:
-                    # Publish push failure metric
-                    if metrics_publisher:
-                        metrics_publisher.publish_push_failed()
-                    yield {
-                        "event": "push_failed",
-                        "branch": target_branch,
-                        "message": "Periodic push failed - see logs for details"
-                    }
-                last_push_time = current_time
-
-        # Periodically sync screenshots to S3 and post to GitHub issue (if enabled)
-        # Wrapped in try/except to never crash the agent
-        if github_mode and build_dir and github_token and screenshot_interval > 0 and cloudfront_domain:
-            current_time = time.time()
-            if current_time - last_screenshot_time >= screenshot_interval:
-                try:
-                    # Upload new screenshots to S3
-                    new_screenshots = upload_screenshots_to_s3(
-                        build_dir=build_dir,
-                        issue_number=issue_number,
-                        session_id=context.session_id,
-                        bucket_name=screenshot_bucket,
-                        cloudfront_domain=cloudfront_domain
-                    )
-
-                    # Post to GitHub issue (non-blocking - failures logged but ignored)
-                    if new_screenshots:
-                        try:
-                            post_screenshots_to_issue(
-                                screenshots=new_screenshots,
-                                github_repo=github_repo,
-                                issue_number=issue_number,
-                                github_token=github_token
-                            )
-                            total_screenshots_uploaded += len(new_screenshots)
-                        except Exception as gh_err:
-                            print(f"⚠️ Failed to post screenshots to GitHub (continuing): {gh_err}")
-
-                        # Publish CloudWatch metrics for screenshots
-                        if metrics_publisher:
-                            metrics_publisher.publish_screenshots_uploaded(len(new_screenshots))
-
-                        yield {
-                            "event": "screenshots_uploaded",
-                            "count": len(new_screenshots),
-                            "issue_number": issue_number
-                        }
-
-                except Exception as e:
-                    # Log error but never crash the agent
-                    print(f"⚠️ Screenshot sync error (continuing): {e}")
-
-                last_screenshot_time = current_time
-
-        # Log why screenshot upload was skipped (if applicable)
-        elif github_mode and build_dir and screenshot_interval > 0:
-            # Only log once at startup, not every iteration
-            if not hasattr(upload_screenshots_to_s3, '_skip_logged'):
-                missing_reasons = []
-                if not cloudfront_domain:
-                    missing_reasons.append("SCREENSHOT_CDN_DOMAIN not configured")
-                if not github_token:
-                    missing_reasons.append("GitHub token not available")
-
-                if missing_reasons:
-                    print(f"⏭️  Skipping screenshot upload: {', '.join(missing_reasons)}")
-                    print(f"   Fix: Run 'make update-runtime-env' to configure the runtime")
-
-                upload_screenshots_to_s3._skip_logged = True
-
-        # Periodically sync GitHub issues to backlog file
-        if github_mode and github_token and backlog_sync_interval > 0:
-            current_time = time.time()
-            if current_time - last_backlog_sync_time >= backlog_sync_interval:
-                try:
-                    new_issues = sync_github_issues_to_backlog(
-                        github_repo=github_repo,
-                        github_token=github_token,
-                        backlog_path=BACKLOG_FILE_PATH
-                    )
-                    if new_issues:
-                        print(f"🔄 Periodic backlog sync: {len(new_issues)} new issue(s) added")
-                        yield {
-                            "event": "backlog_synced",
-                            "new_issues": len(new_issues),
-                            "message": f"Synced {len(new_issues)} new issue(s) to backlog"
-                        }
-                except Exception as e:
-                    print(f"⚠️ Periodic backlog sync failed: {e}")
-                last_backlog_sync_time = current_time
-
-        # Publish CloudWatch heartbeat metric for GHA health monitor
-        # This allows GHA to detect dead sessions and trigger restarts
-        if metrics_publisher and heartbeat_interval > 0:
-            current_time = time.time()
-            time_since_last = current_time - last_heartbeat_time
-            if time_since_last >= heartbeat_interval:
-                try:
-                    success = metrics_publisher.publish_session_heartbeat()
-                    if success:
-                        print(f"💓 Published heartbeat to CloudWatch (namespace=ClaudeCodeAgent, metric=SessionHeartbeat, issue={issue_number})")
-                    else:
-                        print(f"⚠️ Heartbeat publish returned False (metrics disabled or no client)")
-                except Exception as e:
-                    print(f"⚠️ Failed to publish heartbeat: {e}")
-                last_heartbeat_time = current_time
-            # Debug: log when we're waiting for next heartbeat
-            elif time_since_last >= heartbeat_interval - 10:  # Within 10s of next heartbeat
-                print(f"⏳ Heartbeat in {heartbeat_interval - time_since_last:.0f}s")
-
         # Check if approaching session limit
         if remaining < 300:  # 5 minutes
             print(f"⚠️ Approaching session limit: {remaining/60:.1f} minutes remaining")
@@ -2897,7 +3699,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
             # Create WIP commit when 2 minutes remaining (once only)
             if remaining < 120 and not wip_commit_created and github_mode and build_dir and github_token:
                 print(f"📝 Creating WIP commit before session timeout...")
-                wip_commit_created = create_wip_commit(
+                wip_commit_created = await io_pool.run_or(
+                    False,
+                    "git",
+                    create_wip_commit,
                     build_dir=build_dir,
                     issue_number=issue_number,
                     restart_count=restart_count,
@@ -2925,12 +3730,12 @@ Commits should reference this issue: `Ref: #{issue_number}`
                 agent_process.terminate()
                 try:
                     # Give it 10 seconds to clean up
-                    agent_process.wait(timeout=10)
+                    await io_pool.run("process", agent_process.wait, timeout=10)
                     print(f"✅ Agent terminated gracefully (exit code: {agent_process.returncode})")
                 except subprocess.TimeoutExpired:
                     print("⚠️ Agent didn't respond to SIGTERM, sending SIGKILL...")
                     agent_process.kill()
-                    agent_process.wait(timeout=5)
+                    await io_pool.run("process", agent_process.wait, timeout=5)
                     print(f"💀 Agent killed (exit code: {agent_process.returncode})")
 
             # Read current state to get restart count
@@ -2952,13 +3757,13 @@ Commits should reference this issue: `Ref: #{issue_number}`
             # This allows the poller to pick up the issue if direct restart fails
             if github_mode and github_token and issue_number and github_repo:
                 try:
-                    import requests
-                    headers = {
-                        "Authorization": f"token {github_token}",
-                        "Accept": "application/vnd.github.v3+json"
-                    }
-                    url = f"https://api.github.com/repos/{github_repo}/issues/{issue_number}/labels/agent-building"
-                    requests.delete(url, headers=headers, timeout=30)
+                    from src.github_client import get_github_client
+                    await io_pool.run(
+                        "github",
+                        get_github_client(github_token).request,
+                        "DELETE",
+                        f"/repos/{github_repo}/issues/{issue_number}/labels/agent-building"
+                    )
                     print(f"🏷️ Removed agent-building label from issue #{issue_number}")
                 except Exception as e:
                     print(f"⚠️ Failed to remove agent-building label: {e}")
@@ -2966,7 +3771,10 @@ Commits should reference this issue: `Ref: #{issue_number}`
             # Trigger restart workflow BEFORE dying
             restart_triggered = False
             if github_mode and github_token and issue_number and github_repo:
-                restart_triggered = trigger_session_restart(
+                restart_triggered = await io_pool.run_or(
+                    False,
+                    "github",
+                    trigger_session_restart,
                     github_repo=github_repo,
                     github_token=github_token,
                     issue_number=issue_number
@@ -2986,10 +3794,30 @@ Commits should reference this issue: `Ref: #{issue_number}`
             }
             break
 
-        # Wait before next update
-        await asyncio.sleep(check_interval)
-        elapsed += check_interval
+        # Wait before next update, yielding events from the periodic jobs as
+        # they finish. A completion or pause pushed by the agent cuts the wait
+        # short so the issue transition at the top of the loop runs right away.
+        wait_started = time.time()
+        while (wait_left := check_interval - (time.time() - wait_started)) > 0:
+            woken = await scheduler.wait(wait_left)
+            for event in scheduler.drain_events():
+                yield event
+            if woken:
+                break
+        elapsed += time.time() - wait_started
     finally:
+        scheduler.stop()
+        io_pool.shutdown()
+        if metrics_publisher:
+            # Flush buffered metrics without holding up the event loop
+            threading.Thread(target=metrics_publisher.close, daemon=True).start()
+        if screenshot_watcher:
+            screenshot_watcher.close()
+        if webhook_receiver:
+            await webhook_receiver.close()
+        if control_channel:
+            control_channel.close()
+
         # Ensure async task is always marked complete, even on exceptions
         if not task_completed:
             try:
@@ -2999,6 +3827,40 @@ Commits should reference this issue: `Ref: #{issue_number}`
                 print(f"⚠️ Failed to complete async task in finally: {e}")
 
 
+def _apply_agent_events(events: List[Dict[str, Any]], agent_telemetry: Dict[str, Any]) -> bool:
+    """Apply events pushed by the agent over the control channel.
+
+    Args:
+        events: Events drained from the channel (oldest first)
+        agent_telemetry: Latest agent telemetry, updated in place
+
+    Returns:
+        True if the handler loop should run immediately (completion or pause).
+    """
+    wake = False
+    for event in events:
+        event_type = event.get("event")
+        payload = {k: v for k, v in event.items() if k not in ("event", "timestamp")}
+
+        if event_type == "token_stats":
+            agent_telemetry["token_stats"] = payload
+        elif event_type == "session_id":
+            agent_telemetry["session_id"] = payload.get("session_id")
+            print(f"📌 Agent session ID: {payload.get('session_id')}")
+        elif event_type == "completion":
+            print("🎉 Agent reported completion")
+            wake = True
+        elif event_type == "state":
+            agent_telemetry["state"] = payload
+            print(
+                f"🔀 Agent state: desired='{payload.get('desired_state')}', "
+                f"current='{payload.get('current_state')}'"
+            )
+            if payload.get("desired_state") == "pause":
+                wake = True
+    return wake
+
+
 def _find_agent_state_file() -> Optional[Path]:
     """Find the agent_state.json file in the workspace.
 
@@ -0,0 +1,66 @@
+"""Micro-benchmark: console log mirroring throughput.
+
+Compares the original mirroring (write and flush the log file inline on every
+print) with the queue-backed _BackgroundFileWriter in src/logging_utils.py.
+Two figures are reported for the writer: how long callers spend enqueueing,
+which is what the agent's print path pays, and the total time until the
+queue is drained and the file closed.
+
+Run from the repo root:
+    python benchmarks/bench_log_writer.py
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.logging_utils import _BackgroundFileWriter
+
+LINES = 50_000
+LINE = "[2026-10-18T03:12:35] 🔧 Tool call: Bash npm run test -- --reporter=list\n"
+
+
+def original_write(path: Path) -> float:
+    """Inline write + flush per line, as before the change."""
+    with open(path, "a", encoding="utf-8") as f:
+        start = time.perf_counter()
+        for _ in range(LINES):
+            f.write(LINE)
+            f.flush()
+        return time.perf_counter() - start
+
+
+def background_write(path: Path) -> tuple[float, float]:
+    """Enqueue every line, then close (drains the queue)."""
+    writer = _BackgroundFileWriter(open(path, "a", encoding="utf-8"))
+    start = time.perf_counter()
+    for _ in range(LINES):
+        writer.write(LINE)
+    enqueued = time.perf_counter() - start
+    writer.close()
+    return enqueued, time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        print(f"{LINES} lines of {len(LINE.encode('utf-8'))} bytes, best of 5")
+
+        original = min(original_write(tmp_path / f"original{i}.log") for i in range(5))
+        runs = [background_write(tmp_path / f"background{i}.log") for i in range(5)]
+        enqueued = min(r[0] for r in runs)
+        drained = min(r[1] for r in runs)
+
+        for name, seconds in (
+            ("original", original),
+            ("enqueue", enqueued),
+            ("drained", drained),
+        ):
+            print(f"  {name:<9} {seconds * 1000:8.1f} ms  ({LINES / seconds:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
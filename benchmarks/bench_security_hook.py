@@ -0,0 +1,95 @@
+"""Micro-benchmark: Bash security hook latency per call.
+
+Compares the hook as it was before the command policy was precompiled (list
+scans and per-pattern re.search calls, loaded from git history) with the
+current hook in src/security.py, over a mix of allowed and blocked commands.
+The hook's console output is discarded for both.
+
+Run from the repo root (needs git history and the package's dependencies):
+    python benchmarks/bench_security_hook.py
+"""
+
+import contextlib
+import importlib.util
+import io
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.security import SecurityValidator
+
+# Last revision with the uncompiled policy
+ORIGINAL_REVISION = "dfa43ec^"
+
+COMMANDS = [
+    "ls -la",
+    "npm run test -- --reporter=list",
+    "git status",
+    "git commit -m 'Add task filters'",
+    "cat src/App.tsx",
+    "node server.js",
+    "pkill -f 'node server.js'",
+    "rm -rf node_modules",
+    "sed -i 's/\"passes\": false/\"passes\": true/g' tests.json",
+    "jq '.[].passes = true' tests.json",
+    "curl http://localhost:3000/api/health",
+    "shutdown -h now",
+]
+
+
+def load_original_validator():
+    """Import the pre-change security module from git as src._security_original."""
+    try:
+        source = subprocess.run(
+            ["git", "show", f"{ORIGINAL_REVISION}:src/security.py"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"⚠️ Could not load the original hook from git: {e}")
+        return None
+
+    path = Path(tempfile.mkdtemp()) / "security_original.py"
+    path.write_text(source)
+    spec = importlib.util.spec_from_file_location("src._security_original", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.SecurityValidator
+
+
+def call_hook(hook, command: str, project_root: str) -> dict:
+    """Run a hook coroutine to completion; it never awaits, so no event loop is needed."""
+    coro = hook({"tool_name": "Bash", "tool_input": {"command": command}}, project_root=project_root)
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("hook suspended")
+
+
+def run_all(validator, project_root: str) -> None:
+    for command in COMMANDS:
+        call_hook(validator.bash_security_hook, command, project_root)
+
+
+def main() -> None:
+    project_root = tempfile.mkdtemp()
+    runs = 200
+    print(f"{len(COMMANDS)} commands per run, {runs} runs each")
+
+    for name, validator in (("original", load_original_validator()), ("current", SecurityValidator)):
+        if validator is None:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds = min(timeit.repeat(lambda: run_all(validator, project_root), number=runs, repeat=5))
+        per_call = seconds / (runs * len(COMMANDS))
+        print(f"  {name:<9} {per_call * 1e6:8.1f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
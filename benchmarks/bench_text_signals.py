@@ -0,0 +1,87 @@
+"""Micro-benchmark: error/completion signal detection on long agent output.
+
+Compares the original detection (two functions, each lowercasing the text and
+running its own substring checks) with the current single lowercase + scan in
+claude_code._scan_text_signals.
+
+Run from the repo root:
+    python benchmarks/bench_text_signals.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from claude_code import (
+    COMPLETION_EXCLUSIONS,
+    COMPLETION_MARKERS,
+    ERROR_PATTERNS,
+    _completion_flag,
+    _error_flags,
+    _scan_text_signals,
+)
+
+# Typical agent narration: tool chatter, code, test output
+_SAMPLE_LINES = [
+    "I'll read the existing component structure before making changes.",
+    "Running `npm run test -- --reporter=list` to check the current state.",
+    "  ✓ renders the task list (142ms)",
+    "  ✓ adds a new task when the form is submitted (88ms)",
+    "export function TaskItem({ task, onToggle }: TaskItemProps) {",
+    "  return <li className={task.done ? 'line-through' : ''}>{task.title}</li>;",
+    "}",
+    "The Playwright screenshot shows the header is misaligned on mobile widths.",
+    "Updating tests.json to mark the keyboard shortcut feature as passing.",
+    "git commit -m \"Add drag-and-drop reordering to the task list\"",
+]
+
+
+def build_agent_text(target_bytes: int = 123_000) -> str:
+    lines = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        line = _SAMPLE_LINES[i % len(_SAMPLE_LINES)]
+        lines.append(line)
+        size += len(line.encode("utf-8")) + 1
+        i += 1
+    return "\n".join(lines)
+
+
+def original_detect(text: str) -> tuple[tuple[bool, bool, bool], bool]:
+    """Detection as it was before the change (one lowercase per function)."""
+    text_lower = text.lower()
+    errors = (
+        ERROR_PATTERNS["prompt_too_long"] in text_lower,
+        ERROR_PATTERNS["json_buffer_size"] in text_lower,
+        ERROR_PATTERNS["image_size_error"] in text_lower,
+    )
+    text_lower = text.lower()
+    has_markers = (
+        COMPLETION_MARKERS["emoji"] in text
+        and COMPLETION_MARKERS["complete"] in text_lower
+        and COMPLETION_MARKERS["finished"] in text_lower
+    )
+    has_exclusions = any(exclusion in text_lower for exclusion in COMPLETION_EXCLUSIONS)
+    return errors, has_markers and not has_exclusions
+
+
+def current_detect(text: str) -> tuple[tuple[bool, bool, bool], bool]:
+    signals = _scan_text_signals(text)
+    return _error_flags(signals), _completion_flag(signals)
+
+
+def main() -> None:
+    text = build_agent_text()
+    runs = 200
+    print(f"Agent text: {len(text.encode('utf-8')) / 1024:.0f} KB, {runs} runs each")
+
+    for name, func in (("original", original_detect), ("current", current_detect)):
+        seconds = min(timeit.repeat(lambda: func(text), number=runs, repeat=5)) / runs
+        print(f"  {name:<9} {seconds * 1000:8.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
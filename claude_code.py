@@ -29,9 +29,13 @@ from src import (
     DEFAULT_BACKEND_PORT,
     DEFAULT_FRONTEND_PORT,
     DEFAULT_MODEL,
+    ControlChannelClient,
+    FileChangeWatcher,
+    JsonlLogWriter,
     LoggingManager,
     SessionManager,
     TokenTracker,
+    TokenUsage,
 )
 from src.security import SecurityValidator
 
@@ -39,12 +43,16 @@ from src.security import SecurityValidator
 PROJECT_ROOT: Optional[str] = None
 SESSION_ID: Optional[str] = None
 
+# Event channel to bedrock_entrypoint.py (no-op when AGENT_CONTROL_SOCKET is unset)
+CONTROL_CHANNEL = ControlChannelClient()
+
 # Constants
 COMPLETION_CONFIRMATIONS_REQUIRED = 1
 AUTO_CONTINUE_DELAY_SECONDS = 2
 CONTENT_PREVIEW_MAX_LENGTH = 500
 THOUGHT_PREVIEW_MAX_LENGTH = 100
-PAUSE_POLL_INTERVAL_SECONDS = 10
+PAUSE_POLL_INTERVAL_SECONDS = 1  # stat poll interval when inotify is unavailable
+PAUSE_RECHECK_INTERVAL_SECONDS = 300  # re-read state even without a change notification
 
 # State management constants
 STATE_FILE_NAME = "agent_state.json"
@@ -66,6 +74,22 @@ COMPLETION_MARKERS = {
 
 COMPLETION_EXCLUSIONS = ["unfinished", "issues"]
 
+# All of the above, lowercased once at import. Each text block is lowercased
+# once and checked with plain substring searches, which run as fast C scans
+# (a regex alternation is retried at every position and is far slower).
+# See benchmarks/bench_text_signals.py.
+_TEXT_SIGNAL_PATTERNS = {
+    name: pattern.lower()
+    for name, pattern in {
+        **ERROR_PATTERNS,
+        **{f"completion_{name}": marker for name, marker in COMPLETION_MARKERS.items()},
+        **{f"exclusion_{i}": word for i, word in enumerate(COMPLETION_EXCLUSIONS)},
+    }.items()
+}
+_COMPLETION_MARKER_GROUPS = frozenset(
+    f"completion_{name}" for name in COMPLETION_MARKERS
+)
+
 
 def load_example_test(current_dir: str, project_name: Optional[str]) -> str:
     """Load example test description from project's EXAMPLE_TEST.txt file.
@@ -124,25 +148,35 @@ def _truncate_text(text: str, max_length: int) -> str:
     return f"{text[:max_length]}..." if len(text) > max_length else text
 
 
+def _scan_text_signals(text: str) -> set[str]:
+    """Return the names of all signal patterns the text contains (case-insensitive)."""
+    text_lower = text.lower()
+    return {name for name, pattern in _TEXT_SIGNAL_PATTERNS.items() if pattern in text_lower}
+
+
 def _detect_error_patterns(text: str) -> tuple[bool, bool, bool]:
     """Detect various error patterns in text."""
-    text_lower = text.lower()
-    return (
-        ERROR_PATTERNS["prompt_too_long"] in text_lower,
-        ERROR_PATTERNS["json_buffer_size"] in text_lower,
-        ERROR_PATTERNS["image_size_error"] in text_lower,
-    )
+    return _error_flags(_scan_text_signals(text))
 
 
 def _detect_completion_signal(text: str) -> bool:
     """Detect completion signal in text."""
-    text_lower = text.lower()
-    has_markers = (
-        COMPLETION_MARKERS["emoji"] in text
-        and COMPLETION_MARKERS["complete"] in text_lower
-        and COMPLETION_MARKERS["finished"] in text_lower
+    return _completion_flag(_scan_text_signals(text))
+
+
+def _error_flags(signals: set[str]) -> tuple[bool, bool, bool]:
+    """Map scanned signals to (prompt_too_long, json_buffer_size, image_size_error)."""
+    return (
+        "prompt_too_long" in signals,
+        "json_buffer_size" in signals,
+        "image_size_error" in signals,
     )
-    has_exclusions = any(exclusion in text_lower for exclusion in COMPLETION_EXCLUSIONS)
+
+
+def _completion_flag(signals: set[str]) -> bool:
+    """Completion requires every marker and no exclusion word."""
+    has_markers = _COMPLETION_MARKER_GROUPS <= signals
+    has_exclusions = any(name.startswith("exclusion_") for name in signals)
     return has_markers and not has_exclusions
 
 
@@ -163,11 +197,12 @@ def _process_text_block(block: TextBlock) -> tuple[bool, bool]:
     """Process a text block and return (prompt_too_long_detected, completion_detected)."""
     print(f"Agent: {block.text}")
 
-    prompt_too_long_detected, _, _ = _detect_error_patterns(block.text)
+    signals = _scan_text_signals(block.text)
+    prompt_too_long_detected, _, _ = _error_flags(signals)
     if prompt_too_long_detected:
         print("\n⚠️ [DETECTED: 'Prompt is too long' - Will terminate session]")
 
-    completion_detected = _detect_completion_signal(block.text)
+    completion_detected = _completion_flag(signals)
     return prompt_too_long_detected, completion_detected
 
 
@@ -327,6 +362,12 @@ def write_agent_state(
         with open(temp_file, "w") as f:
             json.dump(state, f, indent=2)
         temp_file.replace(state_file)
+        CONTROL_CHANNEL.send(
+            "state",
+            desired_state=state["desired_state"],
+            current_state=state["current_state"],
+            note=state.get("note"),
+        )
     except Exception as e:
         print(f"⚠️ Error writing agent state: {e}")
         if temp_file.exists():
@@ -445,6 +486,12 @@ def parse_arguments() -> argparse.Namespace:
         help="Skip git initialization (used when bedrock_entrypoint.py handles git setup)",
     )
 
+    parser.add_argument(
+        "--rebuild-token-totals",
+        action="store_true",
+        help="Ignore the token checkpoint and recount usage from every log file",
+    )
+
     return parser.parse_args()
 
 
@@ -756,6 +803,28 @@ def _create_message_log_data() -> dict[str, Any]:
     }
 
 
+def _message_log_summary(message_log_data: dict[str, Any], record_type: str) -> dict[str, Any]:
+    """Copy message log metadata without the message list."""
+    summary = {k: v for k, v in message_log_data.items() if k != "messages"}
+    summary["type"] = record_type
+    return summary
+
+
+def _save_message_log(
+    logging_manager: LoggingManager,
+    run_dir: Optional[Path],
+    message_log_data: dict[str, Any],
+    response_log: Optional[JsonlLogWriter] = None,
+) -> None:
+    """Persist the message log, closing the streaming log if one is open."""
+    if response_log:
+        response_log.close(
+            _message_log_summary(message_log_data, "agent_response_end")
+        )
+    elif run_dir:
+        logging_manager.save_json_log(run_dir, message_log_data)
+
+
 def _update_session_id_from_message(
     message: Any, message_log_data: dict[str, Any]
 ) -> None:
@@ -767,6 +836,7 @@ def _update_session_id_from_message(
         SESSION_ID = session_id
         message_log_data["session_id"] = SESSION_ID
         print(f"📌 [Captured Session ID: {SESSION_ID}]")
+        CONTROL_CHANNEL.send("session_id", session_id=SESSION_ID)
 
 
 def _process_assistant_message(message: AssistantMessage) -> tuple[bool, bool]:
@@ -790,6 +860,7 @@ def _handle_api_error(
     message_log_data: dict[str, Any],
     logging_manager: LoggingManager,
     run_dir: Optional[Path],
+    response_log: Optional[JsonlLogWriter] = None,
 ) -> tuple[bool, str]:
     """Handle API errors and return (should_terminate, error_type)."""
     error_str = str(error)
@@ -808,8 +879,7 @@ def _handle_api_error(
         message_log_data["image_size_error_detected"] = True
         return True, "image_size_error"
     else:
-        if run_dir:
-            logging_manager.save_json_log(run_dir, message_log_data)
+        _save_message_log(logging_manager, run_dir, message_log_data, response_log)
         raise error
 
 
@@ -826,25 +896,46 @@ async def log_agent_response(
     completion_detected = False
     prompt_too_long_detected = False
     image_size_error_detected = False
+    usage: Optional[TokenUsage] = None
 
     message_log_data = _create_message_log_data()
+    response_log = (
+        logging_manager.open_response_log(
+            run_dir, _message_log_summary(message_log_data, "agent_response")
+        )
+        if run_dir
+        else None
+    )
 
     try:
         async for message in client.receive_response():
             # Serialize message for JSON logging
             try:
-                message_json = logging_manager.serialize_message_for_json(message)
-                message_log_data["messages"].append(message_json)
+                message_json, message_line = logging_manager.encode_message_for_json(
+                    message
+                )
+                # The streaming log holds the transcript; the in-memory list is
+                # only kept for the single JSON dump written without one
+                if response_log:
+                    response_log.write_line(message_line)
+                else:
+                    message_log_data["messages"].append(message_json)
             except Exception as json_error:
                 print(f"⚠️ Failed to serialize message for JSON: {json_error}")
 
+            # Capture usage as it arrives, even if the message couldn't be
+            # logged; like the log reload, only the first ResultMessage counts
+            if usage is None and isinstance(message, ResultMessage):
+                usage = token_tracker.usage_from_result_message(message)
+
             # Check for pause request
             if pause_flag and pause_flag.get("requested", False):
                 print("\n[Agent paused by user]")
                 if SESSION_ID:
                     message_log_data["session_id"] = SESSION_ID
-                if run_dir:
-                    logging_manager.save_json_log(run_dir, message_log_data)
+                _save_message_log(
+                    logging_manager, run_dir, message_log_data, response_log
+                )
                 return "paused"
 
             # Update session ID from message
@@ -864,11 +955,12 @@ async def log_agent_response(
 
     except Exception as e:
         should_terminate, error_type = _handle_api_error(
-            e, message_log_data, logging_manager, run_dir
+            e, message_log_data, logging_manager, run_dir, response_log
         )
         if should_terminate:
-            if run_dir:
-                logging_manager.save_json_log(run_dir, message_log_data)
+            _save_message_log(
+                logging_manager, run_dir, message_log_data, response_log
+            )
             await handle_session_terminating_error(
                 client, logging_manager, run_dir, error_type
             )
@@ -884,19 +976,14 @@ async def log_agent_response(
     )
 
     # Save final JSON log data
+    _save_message_log(logging_manager, run_dir, message_log_data, response_log)
     if run_dir:
-        logging_manager.save_json_log(run_dir, message_log_data)
+        await asyncio.to_thread(logging_manager.rotate_logs, run_dir)
 
     # Update token counts
-    if token_tracker.update_from_messages(message_log_data.get("messages", [])):
-        # Get the last usage for display
-        last_usage = None
-        for message in reversed(message_log_data.get("messages", [])):
-            last_usage = token_tracker.extract_usage_from_message(message)
-            if last_usage:
-                break
-
-        token_tracker.print_current_usage(last_usage)
+    if usage:
+        token_tracker.record_usage(usage)
+        token_tracker.print_current_usage(usage)
         token_tracker.check_limits()
 
         # Export token stats for CloudWatch dashboard metrics
@@ -910,6 +997,7 @@ async def log_agent_response(
                 "api_calls": token_tracker.totals.api_calls,
             }
             Path("/tmp/token_stats.json").write_text(json.dumps(token_export))
+            CONTROL_CHANNEL.send("token_stats", **token_export)
         except Exception:
             pass  # Non-critical - dashboard metrics export
 
@@ -1078,25 +1166,43 @@ async def _run_cleanup_session(
 
 
 async def _handle_pause_mode(generation_dir: Path) -> None:
-    """Handle pause mode - poll for state changes and wait."""
+    """Handle pause mode - wait for state changes.
+
+    Wakes as soon as agent_state.json is written (inotify, or a cheap stat
+    poll where inotify is unavailable) and only then re-reads the state.
+    """
     update_agent_state(generation_dir, "pause", "Agent paused, waiting for commands")
     print("\n" + "=" * 80)
     print("⏸️  AGENT PAUSED")
     print("=" * 80)
-    print(f"Polling agent_state.json every {PAUSE_POLL_INTERVAL_SECONDS} seconds...")
+
+    watcher = FileChangeWatcher(
+        generation_dir / STATE_FILE_NAME, poll_interval=PAUSE_POLL_INTERVAL_SECONDS
+    )
+    if watcher.start():
+        print("Watching agent_state.json for changes...")
+    else:
+        print(f"Polling agent_state.json every {PAUSE_POLL_INTERVAL_SECONDS} seconds...")
     print(
         "Waiting for desired_state to change (continuous, run_once, or run_cleanup)\n"
     )
 
-    while True:
-        await asyncio.sleep(PAUSE_POLL_INTERVAL_SECONDS)
-        state = read_agent_state(generation_dir)
-        desired = state["desired_state"]
+    try:
+        while True:
+            # Read before the first wait too: a resume written before the
+            # watcher started would not trigger a notification
+            state = read_agent_state(generation_dir)
+            desired = state["desired_state"]
+
+            if desired != "pause":
+                print(f"\n✅ State change detected: desired_state = '{desired}'")
+                print("Exiting pause mode...\n")
+                break
 
-        if desired != "pause":
-            print(f"\n✅ State change detected: desired_state = '{desired}'")
-            print("Exiting pause mode...\n")
-            break
+            # Periodic re-read is a safety net in case a notification is missed
+            await watcher.wait_for_change(timeout=PAUSE_RECHECK_INTERVAL_SECONDS)
+    finally:
+        watcher.close()
 
 
 async def _run_single_session(
@@ -1429,6 +1535,9 @@ async def _handle_implementation_loop(
                             f"\n✅ Agent confirmed completion {COMPLETION_CONFIRMATIONS_REQUIRED} times!"
                         )
                         print("Transitioning to pause state...\n")
+                        CONTROL_CHANNEL.send(
+                            "completion", confirmations=completion_confirmations
+                        )
                         write_agent_state(
                             generation_dir,
                             desired="pause",
@@ -1782,10 +1891,15 @@ async def main() -> None:
     # Set up token tracking
     token_tracker = TokenTracker()
     if is_existing_project:
-        token_tracker.load_from_logs(generation_dir / "logs")
+        token_tracker.load_from_logs(
+            generation_dir / "logs", rebuild=args.rebuild_token_totals
+        )
     else:
         print("📊 Starting with zero token counts for new session")
 
+    # Compress closed log segments from earlier runs before starting
+    logging_manager.rotate_logs(generation_dir, force=True)
+
     # Show cleanup frequency if set
     if args.cleanup_frequency and not args.cleanup_session:
         print(
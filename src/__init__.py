@@ -1,13 +1,18 @@
 """Claude Code utilities package."""
 
+from .backlog_store import BacklogStore
 from .cloudwatch_metrics import MetricsPublisher
 from .config import *
+from .control_channel import ControlChannelClient, ControlChannelServer
+from .file_watcher import DirectoryWatcher, FileChangeWatcher
 from .git_manager import GitHubConfig, GitManager
-from .logging_utils import LoggingManager
+from .github_client import GitHubClient, get_github_client
+from .logging_utils import JsonlLogWriter, LoggingManager
 from .prompt_templates import PromptTemplater
 from .security import SecurityValidator
 from .session_manager import SessionManager
 from .token_tracker import SessionTotals, TokenTracker, TokenUsage
+from .webhook_receiver import WebhookReceiver
 
 __version__ = "1.0.0"
 __all__ = [
@@ -16,9 +21,18 @@ __all__ = [
     "SessionTotals",
     "PromptTemplater",
     "LoggingManager",
+    "JsonlLogWriter",
     "SessionManager",
     "SecurityValidator",
     "MetricsPublisher",
     "GitManager",
     "GitHubConfig",
+    "GitHubClient",
+    "get_github_client",
+    "FileChangeWatcher",
+    "DirectoryWatcher",
+    "ControlChannelClient",
+    "ControlChannelServer",
+    "WebhookReceiver",
+    "BacklogStore",
 ]
@@ -0,0 +1,259 @@
+"""SQLite-backed store for the human backlog.
+
+The entrypoint keeps human_backlog.json as the agent-facing view: the agent
+reads it and may edit item statuses and comments. The entrypoint itself works
+against an indexed SQLite copy, so picking the next item is one indexed query
+and every change is a transaction instead of a full read-modify-rewrite of
+the JSON file. After each change the JSON view is re-exported with an atomic
+rename. Edits the agent makes to the JSON are picked up by re-importing it
+whenever it differs from the last version exported or imported.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Directory holding the databases (outside the git workspace)
+BACKLOG_DB_DIR = Path(os.environ.get("BACKLOG_DB_DIR", "/tmp/human_backlog"))
+
+# Priorities in pick order; items with any other priority are never picked
+PRIORITY_ORDER = ("critical", "high", "medium", "low")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    github_issue INTEGER,
+    status TEXT,
+    priority_rank INTEGER,
+    vote_count INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS items_github_issue ON items (github_issue) WHERE github_issue IS NOT NULL;
+CREATE INDEX IF NOT EXISTS items_pick ON items (completed, status, priority_rank, position);
+CREATE INDEX IF NOT EXISTS items_votes ON items (vote_count DESC, position);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def default_db_path(json_path: Path) -> Path:
+    """Database file for a JSON view: one per view, named by a hash of its path.
+
+    Args:
+        json_path: Agent-facing backlog JSON file
+
+    Returns:
+        Path under BACKLOG_DB_DIR
+    """
+    digest = hashlib.sha256(str(Path(json_path).resolve()).encode("utf-8")).hexdigest()[:16]
+    return BACKLOG_DB_DIR / f"{Path(json_path).stem}-{digest}.sqlite3"
+
+
+class BacklogStore:
+    """Indexed, transactional backlog with a JSON export for the agent."""
+
+    def __init__(self, json_path: Path, db_path: Optional[Path] = None):
+        """Open (or create) the store.
+
+        Args:
+            json_path: Agent-facing human_backlog.json view
+            db_path: SQLite database file (defaults to default_db_path(json_path))
+        """
+        self.json_path = Path(json_path)
+        self.db_path = Path(db_path) if db_path is not None else default_db_path(self.json_path)
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Return all items in JSON view order."""
+        with self._lock:
+            self._refresh()
+            rows = self._conn.execute("SELECT data FROM items ORDER BY vote_count DESC, position")
+            return [json.loads(data) for data, in rows]
+
+    def get_next_item(self) -> Optional[Dict[str, Any]]:
+        """Return the item to work on next.
+
+        In-progress items come first (to resume interrupted work), then
+        queued items by priority, highest-voted first.
+
+        Returns:
+            Backlog item, or None if nothing is left to do
+        """
+        with self._lock:
+            self._refresh()
+            row = self._conn.execute(
+                """
+                SELECT data FROM items
+                WHERE completed = 0
+                  AND (status = 'in progress' OR (status = 'backlog' AND priority_rank IS NOT NULL))
+                ORDER BY status != 'in progress', priority_rank, vote_count DESC, position
+                LIMIT 1
+                """
+            ).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def update_status(self, github_issue: int, status: str, completed: bool = False) -> bool:
+        """Set an item's status.
+
+        Args:
+            github_issue: Issue number of the item
+            status: New status ("backlog", "in progress", "blocked", "done")
+            completed: Whether the item is finished (also stamps completedDate)
+
+        Returns:
+            True if the item exists
+        """
+        with self._lock:
+            self._refresh()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT data FROM items WHERE github_issue = ?", (github_issue,)
+                ).fetchone()
+                if row is None:
+                    return False
+                item = json.loads(row[0])
+                item['status'] = status
+                item['completed'] = completed
+                if completed:
+                    item['completedDate'] = datetime.now(timezone.utc).isoformat()
+                self._write_item(item)
+            self._export()
+            return True
+
+    def apply_changes(
+        self,
+        added: Iterable[Dict[str, Any]] = (),
+        updated: Optional[Dict[int, Dict[str, Any]]] = None,
+        removed: Iterable[int] = (),
+    ) -> None:
+        """Add, update and remove items in one transaction, then re-export.
+
+        Callers usually compute changes from items read earlier, while the
+        agent may have edited the backlog since. Updates are therefore merged
+        field by field into each row as it is inside the transaction, and
+        removals only apply to items still queued.
+
+        Args:
+            added: New items
+            updated: Changed fields by issue number
+            removed: Issue numbers of queued items to delete
+        """
+        with self._lock:
+            self._refresh()
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(
+                    "DELETE FROM items WHERE github_issue = ? AND status = 'backlog' AND completed = 0",
+                    [(n,) for n in removed],
+                )
+                for github_issue, changes in (updated or {}).items():
+                    row = self._conn.execute(
+                        "SELECT data FROM items WHERE github_issue = ?", (github_issue,)
+                    ).fetchone()
+                    if row is None:
+                        continue
+                    item = json.loads(row[0])
+                    item.update(changes)
+                    self._write_item(item)
+                (position,) = self._conn.execute("SELECT COALESCE(MAX(position), -1) FROM items").fetchone()
+                for item in added:
+                    position += 1
+                    self._insert_item(item, position)
+            self._export()
+
+    def export(self) -> None:
+        """Write the JSON view, even if nothing changed."""
+        with self._lock:
+            self._refresh()
+            self._export()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _insert_item(self, item: Dict[str, Any], position: int) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO items (github_issue, status, priority_rank, vote_count, completed, position, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*self._columns(item), position, json.dumps(item)),
+        )
+
+    def _write_item(self, item: Dict[str, Any]) -> None:
+        github_issue, status, priority_rank, vote_count, completed = self._columns(item)
+        self._conn.execute(
+            "UPDATE items SET status = ?, priority_rank = ?, vote_count = ?, completed = ?, data = ? "
+            "WHERE github_issue = ?",
+            (status, priority_rank, vote_count, completed, json.dumps(item), github_issue),
+        )
+
+    @staticmethod
+    def _columns(item: Dict[str, Any]) -> tuple:
+        priority = item.get('priority')
+        vote_count = item.get('vote_count')
+        return (
+            item.get('github_issue'),
+            item.get('status'),
+            PRIORITY_ORDER.index(priority) if priority in PRIORITY_ORDER else None,
+            vote_count if isinstance(vote_count, int) else 0,
+            1 if item.get('completed') else 0,
+        )
+
+    def _json_signature(self) -> Optional[str]:
+        try:
+            st = self.json_path.stat()
+            return f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            return None
+
+    def _refresh(self) -> None:
+        """Re-import the JSON view if it changed since it was last synced."""
+        signature = self._json_signature()
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'json_signature'").fetchone()
+        if row is not None and row[0] == signature:
+            return
+
+        items: List[Dict[str, Any]] = []
+        if signature is not None:
+            try:
+                loaded = json.loads(self.json_path.read_text())
+                items = [item for item in loaded if isinstance(item, dict)]
+            except (OSError, ValueError, TypeError) as e:
+                print(f"⚠️ Failed to read {self.json_path.name}, keeping the stored backlog: {e}")
+                return
+
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM items")
+            for position, item in enumerate(items):
+                self._insert_item(item, position)
+            self._set_signature(signature)
+
+    def _export(self) -> None:
+        """Atomically rewrite the JSON view from the database."""
+        rows = self._conn.execute("SELECT data FROM items ORDER BY vote_count DESC, position")
+        items = [json.loads(data) for data, in rows]
+
+        tmp_path = self.json_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(items, indent=2))
+        tmp_path.replace(self.json_path)
+        with self._conn:
+            self._set_signature(self._json_signature())
+
+    def _set_signature(self, signature: Optional[str]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_signature', ?)", (signature,)
+        )
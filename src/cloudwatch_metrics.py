@@ -3,14 +3,42 @@
 Publishes custom metrics to CloudWatch for dashboard visualization.
 Metrics are published to the 'ClaudeCodeAgent' namespace with dimensions
 for Environment and IssueNumber.
+
+Datapoints are buffered in memory, merged per metric, dimensions and minute
+into Values/Counts arrays, and flushed by a background thread, so publishing
+never waits on the CloudWatch API.
+
+Set METRICS_MODE=emf to write the metrics to stdout in CloudWatch Embedded
+Metric Format instead. AgentCore ships stdout to CloudWatch Logs, which
+extracts the metrics, so no PutMetricData calls (or IAM permission) are needed.
 """
 
+import atexit
+import json
 import os
+import sys
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Optional, TextIO
 
 import boto3
 
+# Publishing modes
+METRICS_MODE_API = "api"  # PutMetricData calls
+METRICS_MODE_EMF = "emf"  # Embedded Metric Format log lines on stdout
+
+# put_metric_data limits
+MAX_DATUMS_PER_CALL = 1000
+MAX_VALUES_PER_DATUM = 150
+
+# Embedded Metric Format limits
+EMF_MAX_METRICS_PER_LINE = 100
+EMF_MAX_VALUES_PER_METRIC = 100
+
+# Flush the buffer early once it holds this many distinct metric series
+FLUSH_THRESHOLD_DATUMS = 500
+
 
 class MetricsPublisher:
     """Publishes custom metrics to CloudWatch for agent monitoring dashboards."""
@@ -22,6 +50,9 @@ class MetricsPublisher:
         issue_number: Optional[int] = None,
         session_id: Optional[str] = None,
         enabled: bool = True,
+        flush_interval: Optional[float] = None,
+        mode: Optional[str] = None,
+        emf_stream: Optional[TextIO] = None,
     ):
         """Initialize the metrics publisher.
 
@@ -29,19 +60,50 @@ class MetricsPublisher:
             issue_number: GitHub issue number for dimension filtering
             session_id: AgentCore session ID for dimension filtering
             enabled: Whether to actually publish metrics (can be disabled for local dev)
+            flush_interval: Seconds between background flushes (default from
+                CLOUDWATCH_FLUSH_INTERVAL_SECONDS, 0 publishes synchronously)
+            mode: "api" or "emf" (default from METRICS_MODE, else "api")
+            emf_stream: Where EMF lines are written (default: stdout)
         """
         self.issue_number = issue_number
         self.session_id = session_id
         self.enabled = enabled and os.environ.get(
             "CLOUDWATCH_METRICS_ENABLED", "true"
         ).lower() == "true"
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else float(os.environ.get("CLOUDWATCH_FLUSH_INTERVAL_SECONDS", "10"))
+        )
+        self.mode = (mode or os.environ.get("METRICS_MODE", METRICS_MODE_API)).lower()
+        if self.mode not in (METRICS_MODE_API, METRICS_MODE_EMF):
+            print(f"⚠️ Unknown METRICS_MODE '{self.mode}', using '{METRICS_MODE_API}'")
+            self.mode = METRICS_MODE_API
+        self.emf_stream = emf_stream
         self._total_commits = 0  # Track cumulative commits for the session
 
+        # (name, unit, dimensions, minute) -> {value: count}
+        self._buffer: dict[tuple, dict[float, int]] = {}
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = False
+        self._flush_thread: Optional[threading.Thread] = None
+
+        self.client = None
         if self.enabled:
-            region = os.environ.get("AWS_REGION", "us-west-2")
-            self.client = boto3.client("cloudwatch", region_name=region)
-        else:
-            self.client = None
+            if self.mode == METRICS_MODE_API:
+                region = os.environ.get("AWS_REGION", "us-west-2")
+                self.client = boto3.client("cloudwatch", region_name=region)
+            if self.flush_interval > 0:
+                self._flush_thread = threading.Thread(
+                    target=self._flush_loop, name="cloudwatch-metrics", daemon=True
+                )
+                self._flush_thread.start()
+                atexit.register(self.close)
+
+    @property
+    def _can_publish(self) -> bool:
+        return self.enabled and (self.mode == METRICS_MODE_EMF or self.client is not None)
 
     def _get_dimensions(self):
         """Get base dimensions for all metrics."""
@@ -52,6 +114,23 @@ class MetricsPublisher:
             dims.append({"Name": "IssueNumber", "Value": str(self.issue_number)})
         return dims
 
+    def _record(self, metric_name: str, value: float, unit: str, dims: list) -> None:
+        """Add a datapoint to the buffer."""
+        minute = int(time.time()) // 60 * 60
+        key = (
+            metric_name,
+            unit,
+            tuple((d["Name"], d["Value"]) for d in dims),
+            minute,
+        )
+        with self._lock:
+            counts = self._buffer.setdefault(key, {})
+            counts[value] = counts.get(value, 0) + 1
+            buffered = len(self._buffer)
+
+        if buffered >= FLUSH_THRESHOLD_DATUMS:
+            self._flush_requested.set()
+
     def _put_metric(
         self,
         metric_name: str,
@@ -59,7 +138,7 @@ class MetricsPublisher:
         unit: str = "Count",
         extra_dims: Optional[list] = None,
     ) -> bool:
-        """Publish a single metric to CloudWatch.
+        """Queue a single metric for CloudWatch.
 
         Args:
             metric_name: Name of the metric
@@ -68,72 +147,145 @@ class MetricsPublisher:
             extra_dims: Additional dimensions beyond the base dimensions
 
         Returns:
-            True if successful, False otherwise
+            True if queued (or published, when unbuffered), False otherwise
         """
-        if not self.enabled or not self.client:
-            return False
-
-        try:
-            dims = self._get_dimensions()
-            if extra_dims:
-                dims.extend(extra_dims)
-
-            self.client.put_metric_data(
-                Namespace=self.NAMESPACE,
-                MetricData=[
-                    {
-                        "MetricName": metric_name,
-                        "Value": value,
-                        "Unit": unit,
-                        "Timestamp": datetime.now(timezone.utc),
-                        "Dimensions": dims,
-                    }
-                ],
-            )
-            return True
-        except Exception as e:
-            print(f"⚠️ CloudWatch metric error ({metric_name}): {e}")
-            return False
+        return self._put_metrics_batch(
+            [{"name": metric_name, "value": value, "unit": unit, "dimensions": extra_dims}]
+        )
 
     def _put_metrics_batch(self, metrics: list) -> bool:
-        """Publish multiple metrics in a single API call.
+        """Queue multiple metrics for CloudWatch.
 
         Args:
             metrics: List of dicts with keys: name, value, unit (optional), dimensions (optional)
 
         Returns:
-            True if successful, False otherwise
+            True if queued (or published, when unbuffered), False otherwise
         """
-        if not self.enabled or not self.client or not metrics:
+        if not self._can_publish or not metrics:
             return False
 
-        try:
-            base_dims = self._get_dimensions()
-            metric_data = []
+        base_dims = self._get_dimensions()
+        for m in metrics:
+            dims = base_dims.copy()
+            if m.get("dimensions"):
+                dims.extend(m["dimensions"])
+            self._record(m["name"], m["value"], m.get("unit", "Count"), dims)
+
+        if self._flush_thread is None:
+            return self.flush()
+        return True
 
-            for m in metrics[:1000]:  # CloudWatch limit is 1000 per call
-                dims = base_dims.copy()
-                if m.get("dimensions"):
-                    dims.extend(m["dimensions"])
+    def flush(self) -> bool:
+        """Publish everything buffered so far.
 
+        Returns:
+            True if every put_metric_data call (or EMF write) succeeded
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, {}
+        if not buffer:
+            return True
+        if self.mode == METRICS_MODE_EMF:
+            return self._write_emf(buffer)
+        if not self.client:
+            return True
+
+        metric_data = []
+        for (name, unit, dims, minute), counts in buffer.items():
+            values = list(counts.items())
+            for i in range(0, len(values), MAX_VALUES_PER_DATUM):
+                chunk = values[i : i + MAX_VALUES_PER_DATUM]
                 metric_data.append(
                     {
-                        "MetricName": m["name"],
-                        "Value": m["value"],
-                        "Unit": m.get("unit", "Count"),
-                        "Timestamp": datetime.now(timezone.utc),
-                        "Dimensions": dims,
+                        "MetricName": name,
+                        "Values": [value for value, _ in chunk],
+                        "Counts": [count for _, count in chunk],
+                        "Unit": unit,
+                        "Timestamp": datetime.fromtimestamp(minute, timezone.utc),
+                        "Dimensions": [{"Name": n, "Value": v} for n, v in dims],
                     }
                 )
 
-            self.client.put_metric_data(
-                Namespace=self.NAMESPACE, MetricData=metric_data
-            )
+        success = True
+        for i in range(0, len(metric_data), MAX_DATUMS_PER_CALL):
+            try:
+                self.client.put_metric_data(
+                    Namespace=self.NAMESPACE,
+                    MetricData=metric_data[i : i + MAX_DATUMS_PER_CALL],
+                )
+            except Exception as e:
+                print(f"⚠️ CloudWatch metric flush error: {e}")
+                success = False
+        return success
+
+    def _write_emf(self, buffer: dict) -> bool:
+        """Write buffered datapoints as Embedded Metric Format log lines.
+
+        One line per dimension set and minute. Values repeated N times are
+        expanded into the metric's value array, since EMF has no counts.
+        """
+        groups: dict[tuple, dict[str, tuple[str, list]]] = {}
+        for (name, unit, dims, minute), counts in buffer.items():
+            values = [value for value, count in counts.items() for _ in range(count)]
+            metrics = groups.setdefault((dims, minute), {})
+            if name in metrics:
+                metrics[name][1].extend(values)
+            else:
+                metrics[name] = (unit, values)
+
+        lines = []
+        for (dims, minute), metrics in groups.items():
+            # Split so no line exceeds the per-line metric or per-metric value limits
+            pending = [(name, unit, values) for name, (unit, values) in metrics.items()]
+            while pending:
+                line_metrics, pending = pending[:EMF_MAX_METRICS_PER_LINE], pending[EMF_MAX_METRICS_PER_LINE:]
+                record = {
+                    "_aws": {
+                        "Timestamp": minute * 1000,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": self.NAMESPACE,
+                                "Dimensions": [[n for n, _ in dims]],
+                                "Metrics": [{"Name": name, "Unit": unit} for name, unit, _ in line_metrics],
+                            }
+                        ],
+                    },
+                    **{n: v for n, v in dims},
+                }
+                for name, unit, values in line_metrics:
+                    chunk, rest = values[:EMF_MAX_VALUES_PER_METRIC], values[EMF_MAX_VALUES_PER_METRIC:]
+                    record[name] = chunk[0] if len(chunk) == 1 else chunk
+                    if rest:
+                        pending.append((name, unit, rest))
+                lines.append(json.dumps(record))
+
+        try:
+            stream = self.emf_stream or sys.stdout
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
             return True
         except Exception as e:
-            print(f"⚠️ CloudWatch batch metric error: {e}")
+            print(f"⚠️ CloudWatch EMF write error: {e}")
             return False
 
+    def close(self) -> None:
+        """Stop the background flush thread and publish anything still buffered."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self._flush_thread is not None:
+            self._flush_requested.set()
+            self._flush_thread.join(timeout=10)
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
     # === Session Lifecycle Metrics ===
 
     def publish_session_started(self, mode: str = "full_build") -> bool:
@@ -169,29 +321,19 @@ class MetricsPublisher:
         Publishes with only Environment dimension (no IssueNumber) so GHA
         health check can query without knowing which issue is being worked on.
         """
-        if not self.enabled or not self.client:
+        if not self._can_publish:
             return False
 
-        try:
-            # Use only Environment dimension so GHA can query without issue number
-            self.client.put_metric_data(
-                Namespace=self.NAMESPACE,
-                MetricData=[
-                    {
-                        "MetricName": "SessionHeartbeat",
-                        "Value": 1,
-                        "Unit": "Count",
-                        "Timestamp": datetime.now(timezone.utc),
-                        "Dimensions": [
-                            {"Name": "Environment", "Value": os.environ.get("ENVIRONMENT", "reinvent")}
-                        ],
-                    }
-                ],
-            )
-            return True
-        except Exception as e:
-            print(f"⚠️ CloudWatch heartbeat error: {e}")
-            return False
+        # Use only Environment dimension so GHA can query without issue number
+        self._record(
+            "SessionHeartbeat",
+            1,
+            "Count",
+            [{"Name": "Environment", "Value": os.environ.get("ENVIRONMENT", "reinvent")}],
+        )
+        if self._flush_thread is None:
+            return self.flush()
+        return True
 
     # === Progress Metrics ===
 
@@ -224,6 +366,22 @@ class MetricsPublisher:
             ]
         )
 
+    def publish_worker_pool(self, waiting: int, queued: int, running: int) -> bool:
+        """Publish queue depth of the entrypoint's blocking-call pool.
+
+        Args:
+            waiting: Calls blocked on a per-kind concurrency limit
+            queued: Calls waiting for a worker thread
+            running: Calls currently executing
+        """
+        return self._put_metrics_batch(
+            [
+                {"name": "WorkerPoolWaiting", "value": waiting, "unit": "Count"},
+                {"name": "WorkerPoolQueued", "value": queued, "unit": "Count"},
+                {"name": "WorkerPoolRunning", "value": running, "unit": "Count"},
+            ]
+        )
+
     # === Git/GitHub Metrics ===
 
     def publish_commits_pushed(self, count: int) -> bool:
@@ -1,5 +1,6 @@
 """Configuration constants and settings for Claude Code."""
 
+import os
 from typing import Any
 
 # Model defaults
@@ -27,7 +28,24 @@ OPTIONAL_PROJECT_FILES = ["DEBUGGING_GUIDE.md", "system_prompt.txt"]
 
 # Log file settings
 LOG_FILE_PATTERN = "*.json"
+STREAMING_LOG_FILE_PATTERN = "*.jsonl"
 LOGS_DIR_NAME = "logs"
+TOKEN_CHECKPOINT_FILE_NAME = ".token_checkpoint"  # Running totals, kept in LOGS_DIR_NAME
+
+# Streaming (append-only JSONL) response logs
+# Set STREAMING_LOGS_ENABLED=false to fall back to one JSON dump per response
+STREAMING_LOGS_ENABLED = os.environ.get("STREAMING_LOGS_ENABLED", "true").lower() == "true"
+JSONL_FSYNC_BATCH_SIZE = 50  # fsync after this many records...
+JSONL_FSYNC_INTERVAL_SECONDS = 5.0  # ...or this many seconds, whichever comes first
+# Log rotation and retention
+COMPRESSED_LOG_SUFFIX = ".gz"
+TEXT_LOG_MAX_BYTES = 50 * 1024 * 1024  # Roll claude_log_*.txt into a gzip segment past this
+LOG_COMPRESS_AFTER_SECONDS = 3600  # Gzip closed logs/*.json(l) older than this
+LOG_ROTATION_INTERVAL_SECONDS = 600  # Minimum time between rotation passes
+# Total on-disk budget for logs; oldest compressed segments are pruned past it (0 = unlimited)
+LOG_RETENTION_MAX_BYTES = int(
+    os.environ.get("LOG_RETENTION_MAX_BYTES", str(1024 * 1024 * 1024))
+)
 
 # Security: Allowed bash commands
 ALLOWED_BASH_COMMANDS = [
@@ -0,0 +1,158 @@
+"""Local event channel between bedrock_entrypoint.py and the agent subprocess.
+
+The agent pushes telemetry and state events (token stats, session IDs,
+completion signals, state transitions) over a Unix datagram socket owned by
+the entrypoint, so the handler loop can react as soon as they happen instead
+of on its next poll of the files under /tmp. Every event is a single JSON
+object per datagram. Sending never blocks and never raises: if nobody is
+listening the event is dropped and the existing file-based paths still apply.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+# Environment variable through which the entrypoint hands the socket path to the agent
+CONTROL_SOCKET_ENV = "AGENT_CONTROL_SOCKET"
+DEFAULT_CONTROL_SOCKET_PATH = "/tmp/agent_control.sock"
+
+# Upper bound on a single event; events are small key/value payloads
+_MAX_EVENT_BYTES = 64 * 1024
+
+
+class ControlChannelServer:
+    """Receiving end of the channel, owned by the entrypoint."""
+
+    def __init__(self, path: str = DEFAULT_CONTROL_SOCKET_PATH):
+        self.path = path
+        self._sock: Optional[socket.socket] = None
+        self._readable: Optional[asyncio.Event] = None
+
+    def start(self) -> bool:
+        """Bind the socket and register it with the running event loop.
+
+        Returns:
+            True if the channel is listening
+        """
+        if self._sock is not None:
+            return True
+
+        try:
+            Path(self.path).unlink(missing_ok=True)  # Stale socket from a previous run
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(self.path)
+            sock.setblocking(False)
+        except OSError as e:
+            print(f"⚠️ Failed to open agent control channel at {self.path}: {e}")
+            return False
+
+        self._sock = sock
+        self._readable = asyncio.Event()
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._readable.set)
+        return True
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait until an event is available.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if events may be ready to drain (wakeups can be spurious, so
+            drain() may return nothing), False on timeout or if not started
+        """
+        if self._readable is None:
+            await asyncio.sleep(timeout)
+            return False
+
+        try:
+            await asyncio.wait_for(self._readable.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Return all events received so far (oldest first)."""
+        events: list[dict[str, Any]] = []
+        if self._sock is None:
+            return events
+
+        self._readable.clear()
+        while True:
+            try:
+                data = self._sock.recv(_MAX_EVENT_BYTES)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                print(f"⚠️ Agent control channel read error: {e}")
+                break
+
+            try:
+                event = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict) and "event" in event:
+                events.append(event)
+        return events
+
+    def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._sock is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        except RuntimeError:
+            pass  # Loop already gone
+        self._sock.close()
+        self._sock = None
+        self._readable = None
+        Path(self.path).unlink(missing_ok=True)
+
+
+class ControlChannelClient:
+    """Sending end of the channel, used by the agent subprocess."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.environ.get(CONTROL_SOCKET_ENV)
+        self._sock: Optional[socket.socket] = None
+
+        if self.path:
+            try:
+                self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self._sock.setblocking(False)
+            except OSError:
+                self._sock = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._sock is not None
+
+    def send(self, event: str, **fields: Any) -> bool:
+        """Send one event, dropping it if the entrypoint is not listening.
+
+        Args:
+            event: Event name (e.g. "token_stats", "state")
+            **fields: JSON-serializable event payload
+
+        Returns:
+            True if the event was handed to the socket
+        """
+        if self._sock is None:
+            return False
+
+        payload = {
+            "event": event,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **fields,
+        }
+        try:
+            data = json.dumps(payload, default=str).encode("utf-8")
+            self._sock.sendto(data, self.path)
+            return True
+        except OSError:
+            # No listener, receiver buffer full, or oversized event
+            return False
@@ -0,0 +1,314 @@
+"""File change notifications for Claude Code (inotify with a polling fallback)."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# inotify event masks (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_MASK_ADD = 0x20000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_TREE_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_ANCESTOR_WATCH_MASK = _IN_CREATE | _IN_MOVED_TO | _IN_ONLYDIR
+
+# struct inotify_event header: wd, mask, cookie, len (name follows)
+_EVENT_HEADER = struct.Struct("iIII")
+
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify requires Linux")
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    _libc = None
+    INOTIFY_AVAILABLE = False
+
+
+class FileChangeWatcher:
+    """Waits for writes to a single file.
+
+    With inotify the file's directory is watched, so atomic temp-file-and-rename
+    writes are seen as well as in-place writes, and the event loop is woken as
+    soon as the kernel reports the change. Without inotify the file's stat
+    signature is polled, which is still far cheaper than re-parsing it.
+    """
+
+    def __init__(self, path: Path, poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._changed: Optional[asyncio.Event] = None
+        self._signature = self._stat_signature()
+
+    @property
+    def using_inotify(self) -> bool:
+        return self._fd is not None
+
+    def start(self) -> bool:
+        """Start watching from the running event loop.
+
+        Returns:
+            True if inotify is in use, False if falling back to polling
+        """
+        if not INOTIFY_AVAILABLE or self._fd is not None:
+            return self._fd is not None
+
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return False
+
+        if _libc.inotify_add_watch(fd, os.fsencode(self.path.parent), _WATCH_MASK) < 0:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        self._changed = asyncio.Event()
+        asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        return True
+
+    def close(self) -> None:
+        """Stop watching and release the inotify descriptor."""
+        if self._fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._fd)
+        except RuntimeError:
+            pass  # Loop already gone
+        os.close(self._fd)
+        self._fd = None
+        self._changed = None
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the file is written.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if the file changed, False if the timeout elapsed first
+        """
+        if self._changed is not None:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            self._changed.clear()
+            return True
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            signature = self._stat_signature()
+            if signature != self._signature:
+                self._signature = signature
+                return True
+
+            delay = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+    def _on_readable(self) -> None:
+        """Drain pending inotify events and flag changes to the watched file."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError:
+            return
+
+        target = os.fsencode(self.path.name)
+        for _, _, name in _parse_events(data):
+            if name == target:
+                self._changed.set()
+
+    def _stat_signature(self) -> Optional[tuple[int, int, int]]:
+        try:
+            st = self.path.stat()
+            return st.st_ino, st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+
+class DirectoryWatcher:
+    """Reports files written under a set of directory trees.
+
+    Each root is watched recursively, including subdirectories created later,
+    and roots that don't exist yet are picked up as soon as they are created.
+    Files already present when a directory is first watched are reported too.
+    A file is only reported once it has gone quiet for the debounce period, so
+    files that are still being written aren't picked up half-finished.
+
+    There is no polling fallback: if start() returns False, callers should keep
+    scanning the roots themselves.
+    """
+
+    def __init__(self, roots: Iterable[Path], suffix: str = "", debounce: float = 1.0):
+        self.roots = [Path(root) for root in roots]
+        self.suffix = suffix
+        self.debounce = debounce
+        self._fd: Optional[int] = None
+        self._watches: dict[int, Path] = {}
+        self._pending: dict[Path, float] = {}  # Path -> monotonic time of last write
+        self._changed: Optional[asyncio.Event] = None
+
+    def start(self) -> bool:
+        """Start watching from the running event loop.
+
+        Returns:
+            True if the roots are being watched, False if inotify is unavailable
+        """
+        if not INOTIFY_AVAILABLE or self._fd is not None:
+            return self._fd is not None
+
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return False
+
+        self._fd = fd
+        self._changed = asyncio.Event()
+        for root in self.roots:
+            self._watch_root(root)
+        asyncio.get_running_loop().add_reader(fd, self._on_readable)
+        return True
+
+    def close(self) -> None:
+        """Stop watching and release the inotify descriptor."""
+        if self._fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._fd)
+        except RuntimeError:
+            pass  # Loop already gone
+        os.close(self._fd)
+        self._fd = None
+        self._changed = None
+        self._watches.clear()
+
+    async def wait_for_files(self, timeout: Optional[float] = None) -> list[Path]:
+        """Wait until written files have settled.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Files that have been quiet for the debounce period (empty on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            ready = [path for path, written in self._pending.items() if now - written >= self.debounce]
+            if ready:
+                for path in ready:
+                    del self._pending[path]
+                return ready
+
+            delay = None
+            if self._pending:
+                delay = min(self._pending.values()) + self.debounce - now
+            if deadline is not None:
+                remaining = deadline - now
+                if remaining <= 0:
+                    return []
+                delay = remaining if delay is None else min(delay, remaining)
+
+            if self._changed is None:
+                return []
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _add_watch(self, path: Path, mask: int) -> bool:
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), mask | _IN_MASK_ADD)
+        if wd < 0:
+            return False
+        self._watches[wd] = path
+        return True
+
+    def _watch_root(self, root: Path) -> None:
+        """Watch an existing root, or the nearest existing ancestor until it appears."""
+        if root.is_dir():
+            self._watch_tree(root)
+            return
+
+        for ancestor in root.parents:
+            if ancestor.is_dir():
+                self._add_watch(ancestor, _ANCESTOR_WATCH_MASK)
+                return
+
+    def _watch_tree(self, top: Path) -> None:
+        """Watch a directory tree and queue the matching files already in it."""
+        now = time.monotonic()
+        for dirpath, _, filenames in os.walk(top):
+            directory = Path(dirpath)
+            self._add_watch(directory, _TREE_WATCH_MASK)
+            for filename in filenames:
+                if filename.endswith(self.suffix):
+                    self._pending.setdefault(directory / filename, now)
+
+    def _in_roots(self, path: Path) -> bool:
+        return any(path == root or root in path.parents for root in self.roots)
+
+    def _on_readable(self) -> None:
+        """Drain pending inotify events and queue written files."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError:
+            return
+
+        now = time.monotonic()
+        for wd, mask, name in _parse_events(data):
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost; re-walk the roots so nothing is missed
+                for root in self.roots:
+                    self._watch_root(root)
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)  # Directory removed
+                continue
+
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / os.fsdecode(name)
+
+            if mask & _IN_ISDIR:
+                if self._in_roots(path):
+                    self._watch_tree(path)
+                else:
+                    for root in self.roots:
+                        if path in root.parents:
+                            self._watch_root(root)
+            elif path.name.endswith(self.suffix) and self._in_roots(path):
+                self._pending[path] = now
+
+        if self._pending:
+            self._changed.set()
+
+
+def _parse_events(data: bytes) -> Iterator[tuple[int, int, bytes]]:
+    """Yield (wd, mask, name) for each inotify event in a read buffer."""
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        yield wd, mask, data[offset : offset + name_len].rstrip(b"\0")
+        offset += name_len
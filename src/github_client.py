@@ -0,0 +1,390 @@
+"""Shared GitHub API client for bedrock_entrypoint.py.
+
+All GitHub traffic goes through one client per token, which provides:
+
+- a keep-alive requests.Session with a connection pool, instead of a new
+  TCP/TLS handshake for every call;
+- conditional GETs: responses are cached by ETag and re-requested with
+  If-None-Match, and GitHub doesn't count 304 Not Modified answers against the
+  rate limit, so polling unchanged resources is free;
+- a rate-limit budget fed from the X-RateLimit-* response headers. Once the
+  remaining quota drops below a reserve, low-priority calls (polling, resume
+  scans) are paced by a token bucket that slows further as the quota drains,
+  leaving what's left for high-priority calls (labels, comments, restarts);
+- retries of requests rejected by a primary or secondary rate limit (403 or
+  429), after the wait GitHub asks for via Retry-After or X-RateLimit-Reset;
+- a cached PyGithub handle per repository for the helpers that use PyGithub.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Call priorities
+PRIORITY_HIGH = "high"  # Never paced
+PRIORITY_LOW = "low"  # Paced once the quota drops below the reserve
+
+# Connections kept alive per host
+GITHUB_POOL_SIZE = int(os.environ.get("GITHUB_POOL_SIZE", "4"))
+
+# Fraction of the hourly quota held back for high-priority calls
+GITHUB_LOW_PRIORITY_RESERVE = float(os.environ.get("GITHUB_LOW_PRIORITY_RESERVE", "0.2"))
+
+# Low-priority calls that can be made back to back before pacing kicks in
+LOW_PRIORITY_BURST = 5
+
+# Longest a low-priority call will wait for budget before giving up
+MAX_LOW_PRIORITY_WAIT_SECONDS = 60.0
+
+# Retries of a request rejected by a rate limit (403/429)
+GITHUB_RATE_LIMIT_RETRIES = int(os.environ.get("GITHUB_RATE_LIMIT_RETRIES", "3"))
+
+# Longest wait before a retry; a request that would need longer fails instead
+MAX_RATE_LIMIT_RETRY_WAIT_SECONDS = 60.0
+
+# Wait before retrying a secondary rate limit that gives no Retry-After
+# (GitHub asks for at least a minute; doubles on each further retry)
+SECONDARY_RATE_LIMIT_WAIT_SECONDS = 60.0
+
+# Conditional-request cache entries kept per client
+ETAG_CACHE_SIZE = 256
+
+# Clients kept per process (one per token; tokens rotate on refresh)
+MAX_CLIENTS = 4
+
+
+class RateLimitBudgetExceeded(RuntimeError):
+    """A low-priority call would have to wait too long for rate-limit budget."""
+
+
+class RateLimitBudget:
+    """Token bucket that paces low-priority calls as the GitHub quota drains."""
+
+    def __init__(
+        self,
+        reserve: float = GITHUB_LOW_PRIORITY_RESERVE,
+        burst: int = LOW_PRIORITY_BURST,
+        max_wait: float = MAX_LOW_PRIORITY_WAIT_SECONDS,
+    ):
+        self.reserve = reserve
+        self.burst = burst
+        self.max_wait = max_wait
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # Epoch seconds
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def update(self, limit: Any, remaining: Any, reset_at: Any) -> None:
+        """Record the latest quota reported by GitHub."""
+        try:
+            limit, remaining, reset_at = int(limit), int(remaining), float(reset_at)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self.limit, self.remaining, self.reset_at = limit, remaining, reset_at
+
+    def update_from_headers(self, headers: Any) -> None:
+        """Record the quota from X-RateLimit-* response headers, if present."""
+        if "X-RateLimit-Remaining" in headers:
+            self.update(
+                headers.get("X-RateLimit-Limit"),
+                headers.get("X-RateLimit-Remaining"),
+                headers.get("X-RateLimit-Reset"),
+            )
+
+    def rate(self) -> Optional[float]:
+        """Low-priority calls per second currently allowed, or None if unpaced."""
+        if self.limit is None or self.remaining is None or self.limit <= 0:
+            return None
+        fraction = self.remaining / self.limit
+        if fraction >= self.reserve:
+            return None
+
+        # Spread what's left evenly until the reset, scaled down as the quota
+        # drains so the last of it goes to high-priority calls
+        window = max((self.reset_at or 0) - time.time(), 1.0)
+        return max(self.remaining, 1) / window * (fraction / self.reserve)
+
+    def acquire(self, priority: str = PRIORITY_HIGH) -> float:
+        """Wait until a call of the given priority may be made.
+
+        Blocks the calling thread, so call it off the event loop.
+
+        Args:
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitBudgetExceeded: A low-priority call would wait longer than max_wait
+        """
+        if priority == PRIORITY_HIGH:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rate()
+            if rate is None:
+                self._tokens = float(self.burst)
+                self._refilled_at = now
+                return 0.0
+
+            self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * rate)
+            self._refilled_at = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / rate
+            if delay > self.max_wait:
+                raise RateLimitBudgetExceeded(
+                    f"GitHub quota low ({self.remaining}/{self.limit} left), "
+                    f"deferring low-priority call by {delay:.0f}s"
+                )
+            self._tokens -= 1  # Reserve the token now so concurrent callers queue behind it
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class GitHubClient:
+    """Pooled, rate-limit-aware GitHub API client for a single token."""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = GITHUB_API_URL,
+        pool_size: int = GITHUB_POOL_SIZE,
+        max_retries: int = GITHUB_RATE_LIMIT_RETRIES,
+        max_retry_wait: float = MAX_RATE_LIMIT_RETRY_WAIT_SECONDS,
+    ):
+        """Initialize the client.
+
+        Args:
+            token: GitHub API token
+            api_url: REST API base URL
+            pool_size: Connections kept alive per host
+            max_retries: Retries of a rate-limited request
+            max_retry_wait: Longest wait before a retry, in seconds
+        """
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.budget = RateLimitBudget()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._etags: "OrderedDict[tuple, tuple[str, Any]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+        self._github = None
+        self._repos: Dict[str, Any] = {}
+        self._repo_lock = threading.Lock()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        priority: str = PRIORITY_HIGH,
+        timeout: float = 30,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Make an API request through the pooled session.
+
+        Every attempt, retries included, is charged to the rate-limit budget.
+        A response rejected by a rate limit is retried after the wait GitHub
+        asks for, unless that wait is longer than max_retry_wait.
+
+        Args:
+            method: HTTP method
+            path: API path (e.g. "/repos/owner/repo/issues/1") or absolute URL
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+            timeout: Request timeout in seconds
+            **kwargs: Passed through to requests (params, json, headers, ...)
+
+        Returns:
+            The response; HTTP errors are not raised
+
+        Raises:
+            RateLimitBudgetExceeded: A low-priority call would wait too long for budget
+        """
+        url = path if path.startswith(("http://", "https://")) else f"{self.api_url}{path}"
+        attempt = 0
+        while True:
+            self.budget.acquire(priority)
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+            self.budget.update_from_headers(response.headers)
+
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt >= self.max_retries or delay > self.max_retry_wait:
+                return response
+            print(f"⚠️ GitHub rate limit hit ({response.status_code}), retrying in {delay:.0f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a rate-limited response, or None if it wasn't."""
+        if response.status_code not in (403, 429):
+            return None
+
+        headers = response.headers
+        try:
+            if "Retry-After" in headers:
+                return max(float(headers["Retry-After"]), 0.0)
+            if headers.get("X-RateLimit-Remaining") == "0":
+                # Primary limit: wait for the reset (plus a second of clock skew)
+                return max(float(headers["X-RateLimit-Reset"]) - time.time(), 0.0) + 1
+        except (KeyError, ValueError):
+            pass
+
+        # A 403 without rate-limit headers is only retried if GitHub says it's a rate limit
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            return SECONDARY_RATE_LIMIT_WAIT_SECONDS * 2 ** attempt
+        return None
+
+    def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: str = PRIORITY_LOW,
+        timeout: float = 30,
+    ) -> Any:
+        """GET a resource, revalidating any cached copy with If-None-Match.
+
+        Args:
+            path: API path or absolute URL
+            params: Query parameters
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+            timeout: Request timeout in seconds
+
+        Returns:
+            Decoded JSON body (the cached body if GitHub answers 304)
+
+        Raises:
+            requests.HTTPError: On an error response
+        """
+        key = (path, tuple(sorted((params or {}).items())))
+        with self._etag_lock:
+            cached = self._etags.get(key)
+
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.request("GET", path, priority=priority, timeout=timeout, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            with self._etag_lock:
+                if key in self._etags:
+                    self._etags.move_to_end(key)
+            return cached[1]
+
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etags[key] = (etag, data)
+                self._etags.move_to_end(key)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return data
+
+    def iter_pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        priority: str = PRIORITY_LOW,
+    ) -> Iterator[list]:
+        """Yield each page of a paginated list endpoint until an empty page.
+
+        Args:
+            path: API path of a list endpoint
+            params: Extra query parameters
+            per_page: Page size (GitHub allows up to 100)
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+        """
+        page = 1
+        while True:
+            items = self.get_json(path, params={**(params or {}), "page": page, "per_page": per_page}, priority=priority)
+            if not items:
+                return
+            yield items
+            page += 1
+
+    def get_repo(self, repo_name: str, priority: str = PRIORITY_HIGH):
+        """Return a cached PyGithub Repository handle.
+
+        The handle is created lazily (no API call) and shares one PyGithub
+        connection pool per token. Its calls don't pass through request(), so
+        the budget is charged here, using the quota PyGithub last saw.
+
+        Args:
+            repo_name: Repository in 'owner/repo' format
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+
+        Raises:
+            ImportError: PyGithub is not installed
+        """
+        from github import Github
+
+        with self._repo_lock:
+            if self._github is None:
+                self._github = Github(self.token, per_page=100, pool_size=self.pool_size)
+            repo = self._repos.get(repo_name)
+            if repo is None:
+                repo = self._repos[repo_name] = self._github.get_repo(repo_name, lazy=True)
+            else:
+                # PyGithub fetches /rate_limit (which is free) if it hasn't seen a response yet
+                remaining, limit = self._github.rate_limiting
+                self.budget.update(limit, remaining, self._github.rate_limiting_resettime)
+
+        self.budget.acquire(priority)
+        return repo
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+        with self._repo_lock:
+            if self._github is not None:
+                self._github.close()
+            self._github = None
+            self._repos.clear()
+
+
+_clients: "OrderedDict[str, GitHubClient]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def get_github_client(token: str) -> GitHubClient:
+    """Return the shared client for a token, creating it on first use.
+
+    Args:
+        token: GitHub API token
+
+    Returns:
+        GitHubClient reused by every caller with the same token
+    """
+    with _clients_lock:
+        client = _clients.get(token)
+        if client is None:
+            client = _clients[token] = GitHubClient(token)
+            while len(_clients) > MAX_CLIENTS:
+                _, stale = _clients.popitem(last=False)  # Token was rotated
+                stale.close()
+        _clients.move_to_end(token)
+        return client
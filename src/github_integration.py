@@ -29,6 +29,12 @@ LABEL_DEPLOYED = "deployed"
 LABEL_FAILED = "tests-failed"
 LABEL_REBUILDING = "rebuilding"
 
+# Reactions that count as staff approval
+APPROVAL_REACTIONS = ('rocket', 'hooray')
+
+# Issues fetched per page when listing (GitHub's maximum)
+ISSUES_PER_PAGE = 100
+
 
 @dataclass
 class BuildableIssue:
@@ -66,7 +72,7 @@ class GitHubIssueManager:
             repo_name: Full repo name (e.g., "anthropic/coding-agent-demo")
             github_token: GitHub PAT with repo permissions
         """
-        self.github = Github(github_token)
+        self.github = Github(github_token, per_page=ISSUES_PER_PAGE)
         self.repo = self.github.get_repo(repo_name)
         self.repo_name = repo_name
 
@@ -79,7 +85,9 @@ class GitHubIssueManager:
         """
         buildable = []
 
-        # Fetch open issues (limit to feature-request label if exists)
+        # Fetch open issues (limit to feature-request label if exists).
+        # Reaction counts come with the issue list, so only issues that have
+        # an approval reaction cost an extra call (to see who reacted).
         for issue in self.repo.get_issues(state='open'):
             # Skip if already being built
             if self._has_label(issue, LABEL_BUILDING):
@@ -90,12 +98,13 @@ class GitHubIssueManager:
                 continue
 
             # Check for staff approval (🚀 rocket or 🎉 hooray)
-            approvers = self._get_staff_approvers(issue)
+            summary = self._get_reaction_summary(issue)
+            approvers = self._get_staff_approvers(issue, summary)
             if not approvers:
                 continue  # Only build approved issues
 
             # Count visitor votes (👍)
-            thumbs_up = self._count_thumbs_up(issue)
+            thumbs_up = self._count_thumbs_up(issue, summary)
 
             buildable.append(BuildableIssue(
                 number=issue.number,
@@ -274,8 +283,9 @@ The issue remains open for retry. Staff can remove the `{LABEL_FAILED}` label an
             Feature request prompt text
         """
         # Count votes
-        votes = self._count_thumbs_up(issue)
-        approvers = self._get_staff_approvers(issue)
+        summary = self._get_reaction_summary(issue)
+        votes = self._count_thumbs_up(issue, summary)
+        approvers = self._get_staff_approvers(issue, summary)
 
         template = f"""# Feature Enhancement Request
 
@@ -369,37 +379,75 @@ Validate the feature by testing that:
 - Error handling works properly
 - Accessibility requirements met"""
 
-    def _get_staff_approvers(self, issue: Issue) -> List[str]:
+    def _get_reaction_summary(self, issue: Issue) -> Optional[Dict[str, int]]:
+        """
+        Get reaction counts from the summary embedded in the issue payload.
+
+        Args:
+            issue: GitHub Issue object
+
+        Returns:
+            Counts by reaction content (e.g. {"+1": 3, "rocket": 1}), or None
+            if the payload has no summary
+        """
+        try:
+            reactions = issue.reactions
+        except (AttributeError, GithubException):
+            return None
+        if not isinstance(reactions, dict):
+            return None
+        return {content: count for content, count in reactions.items()
+                if isinstance(count, int) and content != 'total_count'}
+
+    def _get_staff_approvers(
+        self,
+        issue: Issue,
+        summary: Optional[Dict[str, int]] = None
+    ) -> List[str]:
         """
         Get list of staff members who approved (🚀 or 🎉).
 
         Args:
             issue: GitHub Issue object
+            summary: Reaction counts from _get_reaction_summary; issues with
+                no approval reactions are skipped without an API call
 
         Returns:
             List of approver usernames
         """
+        if summary is not None and not any(summary.get(c) for c in APPROVAL_REACTIONS):
+            return []
+
         approvers = []
         try:
             reactions = issue.get_reactions()
             for reaction in reactions:
-                if (reaction.content in ['rocket', 'hooray'] and
+                if (reaction.content in APPROVAL_REACTIONS and
                     reaction.user.login in AUTHORIZED_APPROVERS):
                     approvers.append(reaction.user.login)
         except GithubException:
             pass
         return list(set(approvers))  # Deduplicate
 
-    def _count_thumbs_up(self, issue: Issue) -> int:
+    def _count_thumbs_up(
+        self,
+        issue: Issue,
+        summary: Optional[Dict[str, int]] = None
+    ) -> int:
         """
         Count 👍 reactions (from anyone).
 
         Args:
             issue: GitHub Issue object
+            summary: Reaction counts from _get_reaction_summary, used instead
+                of listing the reactions when available
 
         Returns:
             Count of thumbs up reactions
         """
+        if summary is not None:
+            return summary.get('+1', 0)
+
         try:
             reactions = issue.get_reactions()
             return sum(1 for r in reactions if r.content == '+1')
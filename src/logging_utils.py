@@ -1,45 +1,399 @@
 """Logging utilities for Claude Code."""
 
+import atexit
 import builtins
+import gzip
 import json
-from dataclasses import asdict
+import os
+import queue
+import threading
+import time
+from dataclasses import fields, is_dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, TextIO
+from typing import Any, Callable, Optional, TextIO
 
-from .config import LOGS_DIR_NAME
+from .config import (
+    COMPRESSED_LOG_SUFFIX,
+    JSONL_FSYNC_BATCH_SIZE,
+    JSONL_FSYNC_INTERVAL_SECONDS,
+    LOG_COMPRESS_AFTER_SECONDS,
+    LOG_RETENTION_MAX_BYTES,
+    LOG_ROTATION_INTERVAL_SECONDS,
+    LOGS_DIR_NAME,
+    STREAMING_LOGS_ENABLED,
+    TEXT_LOG_MAX_BYTES,
+    TOKEN_CHECKPOINT_FILE_NAME,
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback that expands dataclasses shallowly and stringifies the rest.
+
+    Lets the encoder walk SDK message objects directly instead of deep-copying
+    them with dataclasses.asdict first.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    return str(obj)
+
+
+def _encode_json(data: Any) -> str:
+    """Encode data as a single compact JSON line."""
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def _gzip_file(source: Path, dest: Path) -> None:
+    """Compress source into dest and remove source.
+
+    The archive is written to a temp file and renamed into place first, so a
+    crash never leaves a truncated .gz behind.
+    """
+    temp_path = dest.with_name(dest.name + ".tmp")
+    with open(source, "rb") as src, gzip.open(temp_path, "wb") as dst:
+        while chunk := src.read(1024 * 1024):
+            dst.write(chunk)
+    os.replace(temp_path, dest)
+    source.unlink()
+
+
+class JsonlLogWriter:
+    """Append-only JSONL log for a single agent response.
+
+    The first line is a header record, followed by one line per message as it
+    arrives, and a closing summary record. Every line is flushed to the OS
+    immediately and fsynced in batches, so a crash loses at most the tail of
+    the transcript instead of the whole response.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_batch_size: int = JSONL_FSYNC_BATCH_SIZE,
+        fsync_interval: float = JSONL_FSYNC_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self._file: Optional[TextIO] = open(path, "a", encoding="utf-8")
+        self._fsync_batch_size = fsync_batch_size
+        self._fsync_interval = fsync_interval
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append a single record as one JSON line.
+
+        Args:
+            record: JSON-serializable record to append
+        """
+        if self._file is None:
+            return
+        self.write_line(_encode_json(record))
+
+    def write_line(self, line: str) -> None:
+        """Append an already-encoded JSON record.
+
+        Args:
+            line: Single-line JSON encoding of a record (no trailing newline)
+        """
+        if self._file is None:
+            return
+
+        self._file.write(line)
+        self._file.write("\n")
+        self._file.flush()
+
+        self._unsynced_records += 1
+        if (
+            self._unsynced_records >= self._fsync_batch_size
+            or time.monotonic() - self._last_sync >= self._fsync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force buffered records to disk."""
+        if self._file is None or self._unsynced_records == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
+
+    def close(self, summary: Optional[dict[str, Any]] = None) -> None:
+        """Write the closing summary record (if any), sync and close the file.
+
+        Safe to call more than once; only the first call writes the summary.
+        """
+        if self._file is None:
+            return
+        if summary is not None:
+            self.write(summary)
+        self.sync()
+        self._file.close()
+        self._file = None
+
+
+class _BackgroundFileWriter:
+    """Writes text to a file from a daemon thread.
+
+    Callers only enqueue; the thread drains everything queued so far, writes
+    it in one batch and flushes once per batch. close() (also registered with
+    atexit) drains the queue before closing the file.
+
+    When path and max_bytes are given, the file is rolled over once it grows
+    past max_bytes: the full segment is gzipped alongside it and writing
+    continues in a fresh file at the same path. on_reopen is called with the
+    new file object so owners holding the old one can switch over.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        file: TextIO,
+        path: Optional[Path] = None,
+        max_bytes: int = 0,
+        on_reopen: Optional[Callable[[TextIO], None]] = None,
+    ):
+        self._file = file
+        self._path = path
+        self._max_bytes = max_bytes
+        self._on_reopen = on_reopen
+        self._bytes_written = file.tell()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, text: str) -> None:
+        if not self._closed:
+            self._queue.put(text)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = False
+            while True:
+                if item is self._STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    text = "".join(batch)
+                    self._file.write(text)
+                    self._file.flush()
+                    self._bytes_written += len(text.encode("utf-8"))
+                    if self._max_bytes and self._bytes_written >= self._max_bytes:
+                        self._roll_over()
+                except Exception:
+                    pass  # Never let log I/O take down the agent
+            if stop:
+                return
+
+    def _roll_over(self) -> None:
+        """Compress the current segment and reopen an empty file at the same path."""
+        if not self._path:
+            return
+
+        self._file.close()
+        seq = 1
+        while True:
+            segment = self._path.with_name(
+                f"{self._path.stem}.{seq:03d}{self._path.suffix}{COMPRESSED_LOG_SUFFIX}"
+            )
+            if not segment.exists():
+                break
+            seq += 1
+        try:
+            _gzip_file(self._path, segment)
+        finally:
+            self._file = open(self._path, "a", encoding="utf-8")
+            self._bytes_written = self._file.tell()
+            if self._on_reopen:
+                self._on_reopen(self._file)
+
+    def close(self) -> None:
+        """Drain pending writes, stop the thread and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=10)
+        self._file.close()
 
 
 class LoggingManager:
     """Manages logging functionality for Claude Code sessions."""
 
-    def __init__(self, log_file: Optional[TextIO] = None):
+    def __init__(
+        self,
+        log_file: Optional[TextIO] = None,
+        streaming: bool = STREAMING_LOGS_ENABLED,
+    ):
         self.log_file = log_file
         self.session_id: Optional[str] = None
+        self.streaming = streaming
+        self._log_writer: Optional[_BackgroundFileWriter] = None
+        self._log_file_path: Optional[Path] = None
+        self._last_rotation = 0.0
 
     def setup_timestamped_print(self, log_file_path: Path) -> None:
-        """Set up timestamped printing to both console and log file."""
+        """Set up timestamped printing to both console and log file.
+
+        Console output stays synchronous; log file writes go through a
+        background thread so print never blocks the event loop on disk I/O.
+        """
         self.log_file = open(log_file_path, "a", encoding="utf-8")
+        self._log_writer = _BackgroundFileWriter(
+            self.log_file, log_file_path, TEXT_LOG_MAX_BYTES, self._on_log_reopened
+        )
+        self._log_file_path = log_file_path
         original_print = builtins.print
 
+        # Timestamp string is only re-rendered when the second changes
+        cached_second = -1
+        cached_prefix = ""
+
         def timestamped_print(*args, **kwargs):
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            timestamped_args = (f"[{timestamp}]", *args)
+            nonlocal cached_second, cached_prefix
+            now = int(time.time())
+            if now != cached_second:
+                cached_second = now
+                cached_prefix = datetime.fromtimestamp(now).strftime(
+                    "[%Y-%m-%d %H:%M:%S]"
+                )
+
+            timestamped_args = (cached_prefix, *args)
             original_print(*timestamped_args, **kwargs)  # Print to terminal
-            if self.log_file:
-                original_print(
-                    *timestamped_args, **kwargs, file=self.log_file
-                )  # Print to file
-                self.log_file.flush()  # Ensure it's written immediately
+            if self._log_writer:
+                sep = kwargs.get("sep")
+                sep = " " if sep is None else sep
+                end = kwargs.get("end")
+                self._log_writer.write(
+                    sep.join(map(str, timestamped_args))
+                    + ("\n" if end is None else end)
+                )
 
         builtins.print = timestamped_print
 
+    def _on_log_reopened(self, file: TextIO) -> None:
+        """Point log_file at the fresh file after the writer rolls over."""
+        self.log_file = file
+
     def close(self) -> None:
-        """Close the log file."""
-        if self.log_file:
+        """Flush pending log output and close the log file."""
+        if self._log_writer:
+            self._log_writer.close()
+            self._log_writer = None
+            self.log_file = None
+        elif self.log_file:
             self.log_file.close()
             self.log_file = None
 
+    def rotate_logs(self, run_dir: Path, force: bool = False) -> None:
+        """Compress closed log segments and enforce the retention budget.
+
+        Gzips claude_log_*.txt files left by previous runs and response logs
+        in logs/ older than LOG_COMPRESS_AFTER_SECONDS, then prunes the oldest
+        compressed segments while the total exceeds LOG_RETENTION_MAX_BYTES.
+        Runs at most once per LOG_ROTATION_INTERVAL_SECONDS unless forced.
+
+        Args:
+            run_dir: Generation directory containing the logs
+            force: Run even if the last pass was recent
+        """
+        now = time.time()
+        if not force and now - self._last_rotation < LOG_ROTATION_INTERVAL_SECONDS:
+            return
+        self._last_rotation = now
+
+        logs_dir = run_dir / LOGS_DIR_NAME
+        candidates = [
+            p for p in run_dir.glob("claude_log_*.txt") if p != self._log_file_path
+        ]
+        if logs_dir.exists():
+            candidates.extend(
+                p
+                for pattern in ("*.json", "*.jsonl")
+                for p in logs_dir.glob(pattern)
+                if now - p.stat().st_mtime >= LOG_COMPRESS_AFTER_SECONDS
+            )
+
+        compressed = 0
+        for path in candidates:
+            try:
+                _gzip_file(path, path.with_name(path.name + COMPRESSED_LOG_SUFFIX))
+                compressed += 1
+            except Exception as e:
+                print(f"⚠️ Failed to compress log {path.name}: {e}")
+        if compressed:
+            print(f"🗜️ Compressed {compressed} closed log files")
+
+        if LOG_RETENTION_MAX_BYTES > 0:
+            self._enforce_retention(run_dir, logs_dir)
+
+    def _enforce_retention(self, run_dir: Path, logs_dir: Path) -> None:
+        """Delete the oldest compressed segments until logs fit the budget.
+
+        Response logs the token checkpoint has not yet covered are never
+        deleted, so token totals survive pruning.
+        """
+        files = list(run_dir.glob("claude_log_*"))
+        if logs_dir.exists():
+            files.extend(p for p in logs_dir.iterdir() if p.is_file())
+
+        total_bytes = sum(p.stat().st_size for p in files)
+        if total_bytes <= LOG_RETENTION_MAX_BYTES:
+            return
+
+        checkpoint_file = ""
+        try:
+            with open(logs_dir / TOKEN_CHECKPOINT_FILE_NAME, encoding="utf-8") as f:
+                checkpoint_file = json.load(f).get("last_file", "")
+        except Exception:
+            pass
+
+        removable = sorted(
+            (
+                p
+                for p in files
+                if p.name.endswith(COMPRESSED_LOG_SUFFIX)
+                and (
+                    p.parent != logs_dir
+                    or p.name.removesuffix(COMPRESSED_LOG_SUFFIX) < checkpoint_file
+                )
+            ),
+            key=lambda p: p.stat().st_mtime,
+        )
+
+        removed = 0
+        for path in removable:
+            if total_bytes <= LOG_RETENTION_MAX_BYTES:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                total_bytes -= size
+                removed += 1
+            except Exception as e:
+                print(f"⚠️ Failed to remove old log {path.name}: {e}")
+        if removed:
+            print(f"🧹 Removed {removed} old log segments to stay within retention budget")
+
     def save_json_log(self, run_dir: Path, data: dict[str, Any]) -> None:
         """Save a JSON log entry with timestamp.
 
@@ -59,10 +413,38 @@ class LoggingManager:
 
         try:
             with open(log_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+                json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
         except Exception as e:
             print(f"⚠️ Failed to save JSON log: {e}")
 
+    def open_response_log(
+        self, run_dir: Path, header: dict[str, Any]
+    ) -> Optional[JsonlLogWriter]:
+        """Open a streaming JSONL log for one agent response.
+
+        Args:
+            run_dir: Directory to save logs in
+            header: Response metadata written as the first record
+
+        Returns:
+            Open writer, or None if streaming is disabled or the file can't be created
+        """
+        if not self.streaming:
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+
+        logs_dir = run_dir / LOGS_DIR_NAME
+        logs_dir.mkdir(exist_ok=True)
+
+        try:
+            writer = JsonlLogWriter(logs_dir / f"{timestamp}.jsonl")
+            writer.write(header)
+            return writer
+        except Exception as e:
+            print(f"⚠️ Failed to open streaming log, falling back to JSON dump: {e}")
+            return None
+
     def log_user_query(self, run_dir: Path, query: str, context: str = "") -> None:
         """Log a user query/request to JSON.
 
@@ -85,13 +467,36 @@ class LoggingManager:
         self.save_json_log(run_dir, query_data)
 
     def serialize_message_for_json(self, message: Any) -> dict[str, Any]:
-        """Convert SDK message objects to JSON-serializable format with size tracking.
+        """Convert an SDK message to a log record with size tracking.
+
+        Only the top level is converted; nested content blocks stay as SDK
+        objects, which save_json_log expands when writing. Use
+        encode_message_for_json for a ready-made JSON line.
+
+        Args:
+            message: SDK message object
+
+        Returns:
+            Shallow record dictionary; nested values may still be SDK objects
+        """
+        return self.encode_message_for_json(message)[0]
+
+    def encode_message_for_json(self, message: Any) -> tuple[dict[str, Any], str]:
+        """Convert an SDK message to a log record and its JSON encoding in one pass.
+
+        Nested dataclasses are expanded by the encoder rather than copied up
+        front, and the record size is taken from the encoding itself, so each
+        message is encoded exactly once. The returned line can be handed
+        straight to JsonlLogWriter.write_line.
+
+        The record itself is shallow: nested blocks remain SDK objects and
+        are only expanded in the encoding.
 
         Args:
             message: SDK message object
 
         Returns:
-            JSON-serializable dictionary representation
+            Tuple of (record dictionary, single-line JSON encoding of the record)
         """
         from claude_agent_sdk.types import (
             AssistantMessage,
@@ -104,60 +509,64 @@ class LoggingManager:
             UserMessage,
         )
 
+        type_name = type(message).__name__
+
         if isinstance(
             message, (AssistantMessage, ResultMessage, SystemMessage, UserMessage)
         ):
-            # Use dataclass asdict for structured objects
-            data = asdict(message)
-            data["message_type"] = type(message).__name__
-
-            # Add size estimation for debugging
-            self._add_size_debug_info(data, type(message).__name__)
-            return data
+            # Top-level fields only; nested blocks are expanded while encoding
+            data = _json_default(message)
+            data["message_type"] = type_name
+            return data, self._encode_with_size_debug_info(data, type_name)
 
         elif isinstance(
             message, (TextBlock, ToolUseBlock, ToolResultBlock, ThinkingBlock)
         ):
             # Content blocks
-            data = asdict(message)
-            data["block_type"] = type(message).__name__
-
-            # Add size estimation for debugging
-            self._add_size_debug_info(
-                data, type(message).__name__, size_threshold=50000
+            data = _json_default(message)
+            data["block_type"] = type_name
+            return data, self._encode_with_size_debug_info(
+                data, type_name, size_threshold=50000
             )
-            return data
 
         else:
             # Fallback for unknown types
             try:
-                return {
-                    "message_type": type(message).__name__,
+                data = {
+                    "message_type": type_name,
                     "raw_data": str(message),
                     "attributes": {
                         k: v for k, v in vars(message).items() if not k.startswith("_")
                     },
                 }
             except Exception:
-                return {
-                    "message_type": type(message).__name__,
+                data = {
+                    "message_type": type_name,
                     "raw_data": str(message),
                 }
+            return data, _encode_json(data)
 
-    def _add_size_debug_info(
+    def _encode_with_size_debug_info(
         self, data: dict[str, Any], type_name: str, size_threshold: int = 100000
-    ) -> None:
-        """Add size debugging information to message data.
+    ) -> str:
+        """Encode message data and add size debugging information.
+
+        The size is measured from the encoding and spliced into it, instead of
+        encoding the record a second time.
 
         Args:
             data: Message data dictionary
             type_name: Type name for logging
             size_threshold: Threshold above which to log size warnings
+
+        Returns:
+            JSON encoding of data including the _debug_size_bytes field
         """
-        try:
-            data_size = len(json.dumps(data, default=str))
-            data["_debug_size_bytes"] = data_size
-            if data_size > size_threshold:
-                print(f"⚠️ Large message detected: {type_name} ({data_size:,} bytes)")
-        except Exception:
-            pass
+        encoded = _encode_json(data)
+        # ensure_ascii=False leaves non-ASCII text in place, so count UTF-8
+        # bytes rather than characters when there is any
+        data_size = len(encoded) if encoded.isascii() else len(encoded.encode("utf-8"))
+        data["_debug_size_bytes"] = data_size
+        if data_size > size_threshold:
+            print(f"⚠️ Large message detected: {type_name} ({data_size:,} bytes)")
+        return f'{encoded[:-1]}, "_debug_size_bytes": {data_size}}}'
@@ -2,11 +2,12 @@
 
 import glob
 import os
+import re
+import shlex
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional
 
-import re
-
 from .config import (
     ALLOWED_BASH_COMMANDS,
     ALLOWED_NODE_PATTERNS,
@@ -17,6 +18,159 @@ from .config import (
 )
 
 
+# ============================================================================
+# Compiled Command Policy
+# ============================================================================
+# The allow/block lists in config are compiled once at import so the Bash hook,
+# which runs on every tool call, only does set lookups and one regex search per
+# category.
+
+# Commands that commonly take file paths as arguments
+_PATH_SENSITIVE_COMMANDS = frozenset(
+    {
+        "cat",
+        "less",
+        "more",
+        "head",
+        "tail",
+        "file",
+        "stat",
+        "cp",
+        "mv",
+        "rm",
+        "mkdir",
+        "rmdir",
+        "touch",
+        "chmod",
+        "chown",
+        "ls",
+        "find",
+        "locate",
+        "grep",
+        "egrep",
+        "fgrep",
+        "vi",
+        "vim",
+        "nano",
+        "emacs",
+        "gedit",
+        "git",
+        "python",
+        "python3",
+        "node",
+        "npm",
+        "pip",
+        "tar",
+        "unzip",
+        "zip",
+        "gzip",
+        "gunzip",
+        "curl",
+        "wget",
+        "scp",
+        "rsync",
+    }
+)
+
+# Substrings that mark a path-like token as something other than a file path
+_NON_PATH_MARKERS = (
+    "http://",
+    "https://",
+    "ftp://",
+    "|",
+    ">",
+    "<",
+    "&&",
+    "||",
+    "/dev/null",  # Allow /dev/null for redirection
+)
+
+
+def _compile_alternation(patterns: list[str]) -> re.Pattern:
+    """Combine regex patterns into a single case-insensitive alternation."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class SecurityPolicy:
+    """Immutable, precompiled form of the command policy lists in config."""
+
+    allowed_commands: frozenset[str]
+    allowed_commands_display: str
+    allowed_rm_commands: frozenset[str]
+    allowed_node_regex: re.Pattern
+    allowed_pkill_commands: frozenset[str]
+    allowed_pkill_display: str
+    blocked_sed_regex: re.Pattern
+    blocked_tests_json_regex: re.Pattern
+
+    @classmethod
+    def from_config(cls) -> "SecurityPolicy":
+        """Compile the policy from the lists in config."""
+        return cls(
+            allowed_commands=frozenset(ALLOWED_BASH_COMMANDS),
+            allowed_commands_display=", ".join(dict.fromkeys(ALLOWED_BASH_COMMANDS)),
+            allowed_rm_commands=frozenset(ALLOWED_RM_COMMANDS),
+            allowed_node_regex=re.compile(
+                "|".join(re.escape(p) for p in ALLOWED_NODE_PATTERNS)
+            ),
+            allowed_pkill_commands=frozenset(ALLOWED_PKILL_PATTERNS),
+            allowed_pkill_display=", ".join(ALLOWED_PKILL_PATTERNS),
+            blocked_sed_regex=_compile_alternation(BLOCKED_SED_PATTERNS),
+            blocked_tests_json_regex=_compile_alternation(BLOCKED_TESTS_JSON_PATTERNS),
+        )
+
+
+_POLICY = SecurityPolicy.from_config()
+
+
+# ============================================================================
+# Project Root Resolution
+# ============================================================================
+# Read/Edit/Write/Glob/Grep and every path-like Bash token are checked against
+# the project root. The candidate path is resolved on every check, because a
+# background process can retarget a symlink at any time and a stale "inside
+# the root" answer would let a file tool escape. The resolved root is reused
+# for as long as one stat of the root (which follows symlinks) reports the
+# same directory: a stat costs a fraction of a full resolve, and a retargeted
+# or recreated root shows up as a new inode or mtime.
+
+_MAX_CACHED_ROOTS = 8
+
+# project_root -> ((st_dev, st_ino, st_mtime_ns), resolved root)
+_resolved_roots: dict[str, tuple[tuple[int, int, int], Path]] = {}
+
+
+def _resolve_project_root(project_root: str) -> Path:
+    """Resolve the project root, reusing the last result while its stat is unchanged."""
+    try:
+        st = os.stat(project_root)
+    except OSError:
+        return Path(project_root).resolve()  # Not created yet; nothing to key on
+    key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+    cached = _resolved_roots.get(project_root)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    resolved = Path(project_root).resolve()
+    if len(_resolved_roots) >= _MAX_CACHED_ROOTS:
+        _resolved_roots.clear()
+    _resolved_roots[project_root] = (key, resolved)
+    return resolved
+
+
+def _is_within_project_root(file_path: str, project_root: str, cwd: str) -> bool:
+    """Check whether file_path (relative to cwd) resolves inside project_root.
+
+    Raises OSError/RuntimeError from resolution.
+    """
+    try:
+        Path(cwd, file_path).resolve().relative_to(_resolve_project_root(project_root))
+        return True
+    except ValueError:
+        return False
+
+
 # ============================================================================
 # Screenshot Verification State
 # ============================================================================
@@ -128,20 +282,15 @@ class SecurityValidator:
             return False, "No project root directory set"
 
         try:
-            # Resolve absolute paths to handle relative paths and symlinks
-            project_root_resolved = Path(project_root).resolve()
-            file_path_resolved = Path(file_path).resolve()
-
-            # Check if the file path is within the project root
-            try:
-                file_path_resolved.relative_to(project_root_resolved)
+            # Resolve paths to handle relative paths and symlinks
+            if _is_within_project_root(file_path, project_root, os.getcwd()):
                 return True, ""
-            except ValueError:
-                # Path is outside project root
-                return (
-                    False,
-                    f"Path '{file_path}' is outside the allowed directory '{project_root}'",
-                )
+
+            # Path is outside project root
+            return (
+                False,
+                f"Path '{file_path}' is outside the allowed directory '{project_root}'",
+            )
 
         except (OSError, RuntimeError) as e:
             return False, f"Error validating path: {e}"
@@ -159,8 +308,6 @@ class SecurityValidator:
         Returns:
             Hook response dict if path is invalid, None if valid
         """
-        import shlex
-
         try:
             # Parse command into tokens
             tokens = shlex.split(command)
@@ -171,55 +318,10 @@ class SecurityValidator:
         if not tokens:
             return None
 
-        # Commands that commonly take file paths as arguments
-        path_sensitive_commands = {
-            "cat",
-            "less",
-            "more",
-            "head",
-            "tail",
-            "file",
-            "stat",
-            "cp",
-            "mv",
-            "rm",
-            "mkdir",
-            "rmdir",
-            "touch",
-            "chmod",
-            "chown",
-            "ls",
-            "find",
-            "locate",
-            "grep",
-            "egrep",
-            "fgrep",
-            "vi",
-            "vim",
-            "nano",
-            "emacs",
-            "gedit",
-            "git",
-            "python",
-            "python3",
-            "node",
-            "npm",
-            "pip",
-            "tar",
-            "unzip",
-            "zip",
-            "gzip",
-            "gunzip",
-            "curl",
-            "wget",
-            "scp",
-            "rsync",
-        }
-
         first_word = tokens[0].lower()
 
         # Check if this is a command that might operate on files outside our directory
-        if first_word not in path_sensitive_commands:
+        if first_word not in _PATH_SENSITIVE_COMMANDS:
             return None
 
         # Extract potential file paths from the command
@@ -248,20 +350,7 @@ class SecurityValidator:
         # Validate each potential path
         for path in potential_paths:
             # Skip URLs and special cases
-            if any(
-                pattern in path
-                for pattern in [
-                    "http://",
-                    "https://",
-                    "ftp://",
-                    "|",
-                    ">",
-                    "<",
-                    "&&",
-                    "||",
-                    "/dev/null",  # Allow /dev/null for redirection
-                ]
-            ):
+            if any(marker in path for marker in _NON_PATH_MARKERS):
                 continue
 
             # For relative paths, resolve them relative to current directory (which should be project root)
@@ -358,7 +447,7 @@ class SecurityValidator:
                 }
 
         # Check if command is in allowed list
-        if first_word in ALLOWED_BASH_COMMANDS:
+        if first_word in _POLICY.allowed_commands:
             print(f"✅ Allowed: {first_word}")
             return {}
         else:
@@ -367,7 +456,7 @@ class SecurityValidator:
                 "hookSpecificOutput": {
                     "hookEventName": "PreToolUse",
                     "permissionDecision": "deny",
-                    "permissionDecisionReason": f"Command '{first_word}' not allowed. Permitted: {', '.join(ALLOWED_BASH_COMMANDS)}",
+                    "permissionDecisionReason": f"Command '{first_word}' not allowed. Permitted: {_POLICY.allowed_commands_display}",
                 }
             }
 
@@ -460,7 +549,7 @@ class SecurityValidator:
         Returns:
             Hook response dict
         """
-        if command.strip() in ALLOWED_RM_COMMANDS:
+        if command.strip() in _POLICY.allowed_rm_commands:
             print(f"✅ Allowed: {command} (cleaning node_modules)")
             return {}
         else:
@@ -484,7 +573,7 @@ class SecurityValidator:
         Returns:
             Hook response dict
         """
-        if any(pattern in command for pattern in ALLOWED_NODE_PATTERNS):
+        if _POLICY.allowed_node_regex.search(command):
             print(f"✅ Allowed: {command}")
             return {}
         else:
@@ -508,19 +597,19 @@ class SecurityValidator:
         Returns:
             Hook response dict
         """
-        if command.strip() in ALLOWED_PKILL_PATTERNS:
+        if command.strip() in _POLICY.allowed_pkill_commands:
             print(f"✅ Allowed: {command}")
             return {}
         else:
             print(f"🚨 BLOCKED: {command}")
             print(
-                f"   pkill can only be used with specific patterns: {', '.join(ALLOWED_PKILL_PATTERNS)}"
+                f"   pkill can only be used with specific patterns: {_POLICY.allowed_pkill_display}"
             )
             return {
                 "hookSpecificOutput": {
                     "hookEventName": "PreToolUse",
                     "permissionDecision": "deny",
-                    "permissionDecisionReason": f"pkill can only be used with specific patterns: {', '.join(ALLOWED_PKILL_PATTERNS)}",
+                    "permissionDecisionReason": f"pkill can only be used with specific patterns: {_POLICY.allowed_pkill_display}",
                 }
             }
 
@@ -538,23 +627,22 @@ class SecurityValidator:
         Returns:
             Hook response dict (empty if allowed, deny response if blocked)
         """
-        for pattern in BLOCKED_SED_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                print(f"🚨 BLOCKED: {command}")
-                print("   sed cannot be used to bulk-modify test results in tests.json")
-                print("   Each test must be verified individually before marking as passed")
-                return {
-                    "hookSpecificOutput": {
-                        "hookEventName": "PreToolUse",
-                        "permissionDecision": "deny",
-                        "permissionDecisionReason": (
-                            "sed cannot be used to bulk-modify test results in tests.json. "
-                            "Each test must be verified individually (take screenshot, confirm functionality) "
-                            "before updating its 'passes' field to true. Use the Edit tool to update "
-                            "individual test entries after verification."
-                        ),
-                    }
+        if _POLICY.blocked_sed_regex.search(command):
+            print(f"🚨 BLOCKED: {command}")
+            print("   sed cannot be used to bulk-modify test results in tests.json")
+            print("   Each test must be verified individually before marking as passed")
+            return {
+                "hookSpecificOutput": {
+                    "hookEventName": "PreToolUse",
+                    "permissionDecision": "deny",
+                    "permissionDecisionReason": (
+                        "sed cannot be used to bulk-modify test results in tests.json. "
+                        "Each test must be verified individually (take screenshot, confirm functionality) "
+                        "before updating its 'passes' field to true. Use the Edit tool to update "
+                        "individual test entries after verification."
+                    ),
                 }
+            }
         # sed command is allowed (doesn't match blocked patterns)
         return {}
 
@@ -617,15 +705,14 @@ class SecurityValidator:
         Returns:
             Hook response dict (empty if allowed, deny response if blocked)
         """
-        for pattern in BLOCKED_TESTS_JSON_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                print(f"🚨 BLOCKED: {command}")
-                print("   Cannot use bash commands to modify tests.json")
-                return _deny_response(
-                    "Cannot use bash commands to modify tests.json. "
-                    "You must use the Edit tool to update test results after taking "
-                    "and viewing a screenshot that proves the test passes."
-                )
+        if _POLICY.blocked_tests_json_regex.search(command):
+            print(f"🚨 BLOCKED: {command}")
+            print("   Cannot use bash commands to modify tests.json")
+            return _deny_response(
+                "Cannot use bash commands to modify tests.json. "
+                "You must use the Edit tool to update test results after taking "
+                "and viewing a screenshot that proves the test passes."
+            )
         return {}
 
     @staticmethod
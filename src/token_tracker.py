@@ -1,14 +1,20 @@
 """Token usage tracking and limit enforcement for Claude Code."""
 
+import gzip
 import json
-from dataclasses import dataclass
+import os
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 from typing import Any, Optional
 
 from .config import (
+    COMPRESSED_LOG_SUFFIX,
+    LOG_FILE_PATTERN,
     MAX_API_CALLS,
     MAX_COST_USD,
     MAX_OUTPUT_TOKENS,
+    STREAMING_LOG_FILE_PATTERN,
+    TOKEN_CHECKPOINT_FILE_NAME,
     WARNING_THRESHOLD_HIGH,
     WARNING_THRESHOLD_MEDIUM,
 )
@@ -54,6 +60,19 @@ class SessionTotals:
         )
 
 
+def _log_name(log_file: Path) -> str:
+    """Log file name with any compression suffix removed."""
+    return log_file.name.removesuffix(COMPRESSED_LOG_SUFFIX)
+
+
+def _open_log(log_file: Path, mode: str):
+    """Open a log file, transparently decompressing gzipped segments."""
+    encoding = None if "b" in mode else "utf-8"
+    if log_file.name.endswith(COMPRESSED_LOG_SUFFIX):
+        return gzip.open(log_file, mode, encoding=encoding)
+    return open(log_file, mode, encoding=encoding)
+
+
 class TokenTracker:
     """Tracks token usage and enforces limits."""
 
@@ -93,70 +112,244 @@ class TokenTracker:
 
         return usage
 
+    def usage_from_result_message(self, message: Any) -> Optional[TokenUsage]:
+        """Extract token usage straight from an SDK ResultMessage.
+
+        Reads the message's attributes rather than its log record, so usage
+        is still counted when the message can't be serialized for the log.
+        """
+        record: dict[str, Any] = {"message_type": "ResultMessage"}
+        for name in (
+            "input_tokens",
+            "output_tokens",
+            "cache_creation_input_tokens",
+            "cache_read_input_tokens",
+            "usage",
+            "total_cost_usd",
+        ):
+            value = getattr(message, name, None)
+            if value is not None:
+                record[name] = value
+        return self.extract_usage_from_message(record)
+
     def update_from_messages(self, messages: list[dict[str, Any]]) -> bool:
         """Update totals from API response messages. Returns True if usage was found."""
         for message in messages:
             usage = self.extract_usage_from_message(message)
             if usage:
-                self.totals.input_tokens += usage.input_tokens
-                self.totals.output_tokens += usage.output_tokens
-                self.totals.cache_creation_input_tokens += (
-                    usage.cache_creation_input_tokens
-                )
-                self.totals.cache_read_input_tokens += usage.cache_read_input_tokens
-
-                # Add cost from this API call
-                if usage.total_cost_usd > 0:
-                    self.totals.total_cost_usd += usage.total_cost_usd
-
-                self.totals.api_calls += 1
+                self._add_usage(usage)
                 return True
         return False
 
-    def load_from_logs(self, logs_dir: Path) -> None:
-        """Load existing token counts from log files."""
+    def record_usage(self, usage: TokenUsage) -> None:
+        """Add a single API call's usage to the running totals.
+
+        Args:
+            usage: Usage extracted from the call's ResultMessage
+        """
+        self._add_usage(usage)
+
+    def _add_usage(self, usage: TokenUsage) -> None:
+        """Add a single API call's usage to the running totals."""
+        self.totals.input_tokens += usage.input_tokens
+        self.totals.output_tokens += usage.output_tokens
+        self.totals.cache_creation_input_tokens += usage.cache_creation_input_tokens
+        self.totals.cache_read_input_tokens += usage.cache_read_input_tokens
+
+        # Add cost from this API call
+        if usage.total_cost_usd > 0:
+            self.totals.total_cost_usd += usage.total_cost_usd
+
+        self.totals.api_calls += 1
+
+    def load_from_logs(self, logs_dir: Path, rebuild: bool = False) -> None:
+        """Load existing token counts from log files.
+
+        Resumes from the running-totals checkpoint kept in the logs directory,
+        so only log files written since the last load are parsed.
+
+        Args:
+            logs_dir: Directory containing the session's log files
+            rebuild: Ignore the checkpoint and rescan every log file
+        """
         if not logs_dir.exists():
             print("📊 No logs directory found - starting with zero token counts")
             return
 
-        log_files = sorted(logs_dir.glob("*.json"))
+        # Logs are keyed by their uncompressed name so a segment that was
+        # gzipped since the last load is recognised as the same log. If a
+        # crash left both copies behind, the uncompressed one wins.
+        logs_by_name: dict[str, Path] = {}
+        for pattern in (LOG_FILE_PATTERN, STREAMING_LOG_FILE_PATTERN):
+            for log_file in logs_dir.glob(pattern + COMPRESSED_LOG_SUFFIX):
+                logs_by_name[_log_name(log_file)] = log_file
+            for log_file in logs_dir.glob(pattern):
+                logs_by_name[log_file.name] = log_file
+        log_files = [logs_by_name[name] for name in sorted(logs_by_name)]
         if not log_files:
             print("📊 No log files found - starting with zero token counts")
             return
 
-        print(f"📊 Loading token counts from {len(log_files)} log files...")
+        checkpoint = None
+        if rebuild:
+            print("🔁 Rebuilding token counts from all log files (checkpoint ignored)")
+        else:
+            checkpoint = self._load_checkpoint(logs_dir)
+
+        # Cursor: (last processed file name, byte offset read, usage counted)
+        cursor: tuple[str, int, bool] = ("", 0, False)
+        if checkpoint:
+            self.totals, cursor = checkpoint
+            log_files = [f for f in log_files if _log_name(f) >= cursor[0]]
+            print(
+                f"📊 Resuming from token checkpoint ({cursor[0]}), "
+                f"scanning {len(log_files)} log files..."
+            )
+        else:
+            print(f"📊 Loading token counts from {len(log_files)} log files...")
+
+        # Totals and cursor from just before the first unreadable file. The
+        # checkpoint stops there so the next load retries that file rather
+        # than skipping it for good.
+        retry_point: Optional[tuple[SessionTotals, tuple[str, int, bool]]] = None
 
         for log_file in log_files:
+            log_name = _log_name(log_file)
+            is_jsonl = log_name.endswith(".jsonl")
+            start_offset = 0
+            if log_name == cursor[0]:
+                # Already processed; only a JSONL log still missing its usage
+                # record can have grown since
+                if cursor[2] or not is_jsonl:
+                    continue
+                start_offset = cursor[1]
+
             try:
-                with open(log_file, encoding="utf-8") as f:
-                    data = json.load(f)
-
-                if data.get("type") == "agent_response":
-                    messages = data.get("messages", [])
-                    for message in messages:
-                        usage = self.extract_usage_from_message(message)
-                        if usage:
-                            self.totals.input_tokens += usage.input_tokens
-                            self.totals.output_tokens += usage.output_tokens
-                            self.totals.cache_creation_input_tokens += (
-                                usage.cache_creation_input_tokens
-                            )
-                            self.totals.cache_read_input_tokens += (
-                                usage.cache_read_input_tokens
-                            )
-                            self.totals.api_calls += 1
-
-                            # Add cost from this API call
-                            if usage.total_cost_usd > 0:
-                                self.totals.total_cost_usd += usage.total_cost_usd
-                            break
+                if is_jsonl:
+                    usage, offset = self._read_usage_from_jsonl(
+                        log_file, start_offset
+                    )
+                else:
+                    usage = self._read_usage_from_json(log_file)
+                    offset = log_file.stat().st_size
+                if usage:
+                    self._add_usage(usage)
+                cursor = (log_name, offset, usage is not None)
 
             except Exception as e:
                 print(f"⚠️ Failed to read log file {log_file}: {e}")
+                if retry_point is None:
+                    retry_point = (replace(self.totals), cursor)
                 continue
+
+        checkpoint_totals = self.totals
+        if retry_point:
+            checkpoint_totals, cursor = retry_point
+        self._save_checkpoint(logs_dir, checkpoint_totals, *cursor)
         self._print_loaded_totals()
         self._warn_if_approaching_limits()
 
+    def _load_checkpoint(
+        self, logs_dir: Path
+    ) -> Optional[tuple[SessionTotals, tuple[str, int, bool]]]:
+        """Read the running-totals checkpoint, or None if missing/invalid."""
+        checkpoint_path = logs_dir / TOKEN_CHECKPOINT_FILE_NAME
+        if not checkpoint_path.exists():
+            return None
+
+        try:
+            with open(checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            cursor = (
+                str(checkpoint["last_file"]),
+                int(checkpoint["last_offset"]),
+                bool(checkpoint["last_counted"]),
+            )
+            return SessionTotals(**checkpoint["totals"]), cursor
+        except Exception as e:
+            print(f"⚠️ Ignoring invalid token checkpoint, rescanning all logs: {e}")
+            return None
+
+    def _save_checkpoint(
+        self,
+        logs_dir: Path,
+        totals: SessionTotals,
+        last_file: str,
+        last_offset: int,
+        last_counted: bool,
+    ) -> None:
+        """Atomically persist the running totals and the scan cursor."""
+        checkpoint_path = logs_dir / TOKEN_CHECKPOINT_FILE_NAME
+        temp_path = checkpoint_path.with_suffix(".tmp")
+        checkpoint = {
+            "totals": asdict(totals),
+            "last_file": last_file,
+            "last_offset": last_offset,
+            "last_counted": last_counted,
+        }
+
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f, indent=2)
+            os.replace(temp_path, checkpoint_path)
+        except Exception as e:
+            print(f"⚠️ Failed to save token checkpoint: {e}")
+
+    def _read_usage_from_json(self, log_file: Path) -> Optional[TokenUsage]:
+        """Return the first usage record from a whole-response JSON log."""
+        with _open_log(log_file, "rt") as f:
+            data = json.load(f)
+
+        if data.get("type") != "agent_response":
+            return None
+
+        for message in data.get("messages", []):
+            usage = self.extract_usage_from_message(message)
+            if usage:
+                return usage
+        return None
+
+    def _read_usage_from_jsonl(
+        self, log_file: Path, start_offset: int = 0
+    ) -> tuple[Optional[TokenUsage], int]:
+        """Return the first usage record from a streaming JSONL log.
+
+        Reads line by line so large transcripts are never held in memory.
+        Undecodable lines (e.g. a record truncated by a crash) are skipped.
+
+        Args:
+            log_file: JSONL log to read
+            start_offset: Byte offset to resume from (past the header)
+
+        Returns:
+            Tuple of (usage or None, byte offset of the last complete line read)
+        """
+        offset = start_offset
+        with _open_log(log_file, "rb") as f:
+            f.seek(start_offset)
+            header_seen = start_offset > 0
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Partial trailing record; re-read it next time
+                    break
+                offset += len(line)
+
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if not header_seen:
+                    if record.get("type") != "agent_response":
+                        return None, offset
+                    header_seen = True
+                    continue
+
+                usage = self.extract_usage_from_message(record)
+                if usage:
+                    return usage, offset
+        return None, offset
+
     def _print_loaded_totals(self) -> None:
         """Print loaded token counts."""
         print("📊 Loaded token counts from previous session:")
@@ -0,0 +1,240 @@
+"""GitHub webhook receiver for bedrock_entrypoint.py.
+
+A small HTTP server, run on a background thread, that accepts GitHub
+`issues` and `issue_comment` webhook deliveries, checks their
+X-Hub-Signature-256 HMAC against the shared secret, and hands them to the
+event loop so the backlog can be synced as soon as an issue changes instead
+of on the next poll. GitHub doesn't send webhooks for reactions, so 🚀
+approvals and 👍 votes still arrive through the periodic sync, which remains
+the reconciliation path.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+# Environment variables configuring the receiver (it stays off without both)
+WEBHOOK_PORT_ENV = "GITHUB_WEBHOOK_PORT"
+WEBHOOK_SECRET_ENV = "GITHUB_WEBHOOK_SECRET"
+# Address to bind; loopback unless a deployment exposes the receiver on purpose
+WEBHOOK_HOST_ENV = "GITHUB_WEBHOOK_HOST"
+DEFAULT_WEBHOOK_HOST = "127.0.0.1"
+
+WEBHOOK_PATH = "/github/webhook"
+
+# Deliveries that can affect the backlog
+ACCEPTED_EVENTS = ("issues", "issue_comment")
+
+# Issue webhook payloads are a few KB; anything far larger isn't one
+_MAX_PAYLOAD_BYTES = 1024 * 1024
+
+# Delivery IDs remembered so redeliveries aren't processed twice
+_MAX_TRACKED_DELIVERIES = 1024
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check a delivery's X-Hub-Signature-256 header.
+
+    Args:
+        secret: Webhook secret configured on GitHub
+        body: Raw request body
+        signature: Header value ("sha256=<hex digest>")
+
+    Returns:
+        True if the signature matches
+    """
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    server: "_WebhookServer"
+
+    def do_POST(self) -> None:
+        if self.path.split("?", 1)[0] != WEBHOOK_PATH:
+            self._reply(404, "not found")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._reply(411, "length required")
+            return
+        if length < 0:
+            self._reply(400, "invalid content length")
+            return
+        if length > _MAX_PAYLOAD_BYTES:
+            self._reply(413, "payload too large")
+            return
+
+        body = self.rfile.read(length)
+        receiver = self.server.receiver
+        if not verify_signature(receiver.secret, body, self.headers.get("X-Hub-Signature-256")):
+            self._reply(401, "bad signature")
+            return
+
+        github_event = self.headers.get("X-GitHub-Event", "")
+        if github_event not in ACCEPTED_EVENTS:
+            self._reply(200, "ignored")  # ping and events that can't affect the backlog
+            return
+
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            self._reply(400, "invalid json")
+            return
+
+        accepted = receiver._accept(github_event, self.headers.get("X-GitHub-Delivery", ""), payload)
+        self._reply(202 if accepted else 200, "accepted" if accepted else "ignored")
+
+    def _reply(self, status: int, message: str) -> None:
+        data = message.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Deliveries are logged by the entrypoint when they are applied
+
+
+class _WebhookServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, receiver: "WebhookReceiver"):
+        self.receiver = receiver
+        super().__init__(address, _WebhookHandler)
+
+
+class WebhookReceiver:
+    """Receives GitHub issue webhooks and queues them for the event loop."""
+
+    def __init__(self, secret: str, port: int, host: str = DEFAULT_WEBHOOK_HOST, repo: Optional[str] = None):
+        """Initialize the receiver.
+
+        Args:
+            secret: Webhook secret configured on GitHub
+            port: Port to listen on (0 picks a free port)
+            host: Address to bind
+            repo: Only accept deliveries for this 'owner/repo'
+        """
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.repo = repo
+        self._server: Optional[_WebhookServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._events: list[dict[str, Any]] = []
+        self._deliveries: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Start listening from the running event loop.
+
+        Returns:
+            True if the receiver is listening
+        """
+        if self._server is not None:
+            return True
+
+        try:
+            server = _WebhookServer((self.host, self.port), self)
+        except OSError as e:
+            print(f"⚠️ Failed to start GitHub webhook receiver on port {self.port}: {e}")
+            return False
+
+        self._server = server
+        self.port = server.server_address[1]
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._thread = threading.Thread(target=server.serve_forever, name="github-webhooks", daemon=True)
+        self._thread.start()
+        return True
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a delivery is queued.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if deliveries may be ready to drain, False on timeout or if not started
+        """
+        if self._ready is None:
+            await asyncio.sleep(timeout or 0)
+            return False
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Return all deliveries queued so far (oldest first)."""
+        if self._ready is not None:
+            self._ready.clear()
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+    async def close(self) -> None:
+        """Stop listening.
+
+        shutdown() blocks until the server thread finishes its current poll,
+        so it runs on a worker thread instead of the event loop.
+        """
+        server, self._server = self._server, None
+        if server is None:
+            return
+        self._thread = None
+        self._loop = None
+        self._ready = None
+        await asyncio.to_thread(server.shutdown)
+        server.server_close()
+
+    def _accept(self, github_event: str, delivery: str, payload: Any) -> bool:
+        """Queue a verified delivery (called on the server thread).
+
+        Returns:
+            True if the delivery was queued, False if it was a duplicate or
+            not about an issue in the watched repository
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get("issue"), dict):
+            return False
+        if self.repo and (payload.get("repository") or {}).get("full_name") != self.repo:
+            return False
+
+        event = {
+            "event": "github_webhook",
+            "github_event": github_event,
+            "action": payload.get("action"),
+            "issue_number": payload["issue"].get("number"),
+            "delivery": delivery,
+        }
+        with self._lock:
+            if delivery:
+                if delivery in self._deliveries:
+                    return False  # Redelivery
+                self._deliveries[delivery] = None
+                while len(self._deliveries) > _MAX_TRACKED_DELIVERIES:
+                    self._deliveries.popitem(last=False)
+            self._events.append(event)
+
+        loop, ready = self._loop, self._ready
+        if loop is not None and ready is not None:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # Loop already closed
+        return True
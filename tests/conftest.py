@@ -0,0 +1,63 @@
+"""Shared pytest setup: repo root on sys.path and a local GitHub API stand-in."""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+class FakeGitHub:
+    """Serves scripted (status, headers, body) responses per path and records requests.
+
+    A route is called with the request headers and query parameters.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlsplit(self.path)
+                fake.requests.append((url.path, dict(self.headers)))
+                query = {name: values[0] for name, values in parse_qs(url.query).items()}
+                status, headers, body = fake.routes[url.path](self.headers, query)
+                payload = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def sequence(self, path, *responses):
+        """Answer successive requests to path with responses (the last one repeats)."""
+        remaining = list(responses)
+        self.routes[path] = lambda headers, query: remaining.pop(0) if len(remaining) > 1 else remaining[0]
+
+    def calls(self, path):
+        return [headers for p, headers in self.requests if p == path]
+
+
+@pytest.fixture
+def github():
+    fake = FakeGitHub()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
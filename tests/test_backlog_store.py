@@ -0,0 +1,73 @@
+"""BacklogStore: per-view databases and merges against the current rows."""
+
+import json
+
+import pytest
+
+pytest.importorskip("boto3")  # src/__init__ pulls in the AWS helpers
+
+from src import backlog_store
+from src.backlog_store import BacklogStore, default_db_path
+
+
+def queued(number, **fields):
+    return {"github_issue": number, "status": "backlog", "priority": "medium", "vote_count": 1,
+            "completed": False, "description": f"Issue {number}", **fields}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(backlog_store, "BACKLOG_DB_DIR", tmp_path / "db")
+    store = BacklogStore(tmp_path / "human_backlog.json")
+    yield store
+    store.close()
+
+
+def test_each_json_view_gets_its_own_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(backlog_store, "BACKLOG_DB_DIR", tmp_path / "db")
+    first = default_db_path(tmp_path / "a" / "human_backlog.json")
+    second = default_db_path(tmp_path / "b" / "human_backlog.json")
+
+    assert first != second
+    assert first.parent == second.parent == tmp_path / "db"
+    assert default_db_path(tmp_path / "a" / "human_backlog.json") == first
+
+
+def test_update_merges_into_the_current_row(store):
+    store.apply_changes(added=[queued(1)])
+    snapshot = store.items()  # What a sync reads before its network calls
+
+    store.update_status(1, "in progress")  # The agent picks the item up meanwhile
+
+    assert snapshot[0]["status"] == "backlog"
+    store.apply_changes(updated={1: {"vote_count": 4}})
+
+    (item,) = json.loads(store.json_path.read_text())
+    assert item["status"] == "in progress"
+    assert item["vote_count"] == 4
+
+
+def test_agent_edits_to_the_json_view_survive_updates(store):
+    store.apply_changes(added=[queued(1), queued(2)])
+
+    items = json.loads(store.json_path.read_text())
+    for item in items:
+        if item["github_issue"] == 1:
+            item["status"] = "blocked"
+    store.json_path.write_text(json.dumps(items))
+
+    store.apply_changes(updated={1: {"description": "Renamed"}, 3: {"description": "Gone"}})
+
+    by_issue = {item["github_issue"]: item for item in json.loads(store.json_path.read_text())}
+    assert by_issue[1]["status"] == "blocked"
+    assert by_issue[1]["description"] == "Renamed"
+    assert set(by_issue) == {1, 2}
+
+
+def test_removal_skips_items_picked_up_since(store):
+    store.apply_changes(added=[queued(1), queued(2)])
+    store.update_status(2, "in progress")
+
+    store.apply_changes(removed=[1, 2])
+
+    assert [item["github_issue"] for item in store.items()] == [2]
@@ -0,0 +1,127 @@
+"""Backlog sync against a local GitHub API stand-in."""
+
+import json
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("boto3")
+pytest.importorskip("bedrock_agentcore")
+
+import bedrock_entrypoint
+from src import github_client
+from src.backlog_store import BacklogStore
+
+REPO = "owner/repo"
+TOKEN = "token"
+
+
+def make_issue(number, title, reactions=None, **fields):
+    issue = {
+        "number": number,
+        "title": title,
+        "body": f"Details for {title}",
+        "state": "open",
+        "labels": [],
+        "updated_at": "2026-10-01T12:00:00Z",
+        **fields,
+    }
+    if reactions is not None:
+        issue["reactions"] = {"total_count": sum(reactions.values()), **reactions}
+    return issue
+
+
+def reaction(content, login):
+    return {"content": content, "user": {"login": login}}
+
+
+@pytest.fixture
+def backlog(tmp_path, github, monkeypatch):
+    """Path of a backlog JSON file synced from the stand-in as REPO."""
+    path = tmp_path / "human_backlog.json"
+    monkeypatch.setattr(bedrock_entrypoint, "AUTHORIZED_APPROVERS", {"staff"})
+    monkeypatch.setattr(bedrock_entrypoint, "backlog_sync_cursor", {"repo": None, "since": None, "full_sync_at": 0.0})
+    monkeypatch.setattr(bedrock_entrypoint, "backlog_stores", {path: BacklogStore(path, tmp_path / "backlog.sqlite3")})
+    client = github_client.GitHubClient(TOKEN, api_url=github.url)
+    monkeypatch.setitem(github_client._clients, TOKEN, client)
+    yield path
+    client.close()
+
+
+def serve(github, issues, reactions=None):
+    """Serve one page of issues, and reaction lists by issue number."""
+    github.routes[f"/repos/{REPO}/issues"] = lambda headers, query: (200, {}, issues if query["page"] == "1" else [])
+    for number, listed in (reactions or {}).items():
+        github.routes[f"/repos/{REPO}/issues/{number}/reactions"] = (
+            lambda headers, query, listed=listed: (200, {}, listed if query["page"] == "1" else [])
+        )
+
+
+def sync(backlog):
+    return bedrock_entrypoint.sync_github_issues_to_backlog(REPO, TOKEN, backlog)
+
+
+def test_approved_issue_is_added_with_votes(github, backlog):
+    serve(
+        github,
+        [make_issue(1, "Dark mode", {"+1": 4, "rocket": 1}), make_issue(2, "Unapproved", {"+1": 9})],
+        {1: [reaction("rocket", "staff")]},
+    )
+
+    added = sync(backlog)
+
+    assert [item["github_issue"] for item in added] == [1]
+    assert added[0]["vote_count"] == 5
+    assert added[0]["priority"] == "high"
+    assert not github.calls(f"/repos/{REPO}/issues/2/reactions")  # No 🚀, no reaction listing
+
+
+def test_missing_reaction_summary_falls_back_to_reaction_list(github, backlog):
+    serve(
+        github,
+        [make_issue(1, "Dark mode", {"+1": 1, "rocket": 1})],
+        {1: [reaction("rocket", "staff"), reaction("+1", "visitor")]},
+    )
+    sync(backlog)
+
+    # The same issue without a summary keeps its approval and votes
+    serve(
+        github,
+        [make_issue(1, "Dark mode")],
+        {1: [reaction("rocket", "staff"), reaction("+1", "visitor"), reaction("+1", "other")]},
+    )
+    sync(backlog)
+
+    items = json.loads(backlog.read_text())
+    assert [item["github_issue"] for item in items] == [1]
+    assert items[0]["vote_count"] == 3
+
+
+def test_withdrawn_approval_removes_queued_item(github, backlog):
+    serve(github, [make_issue(1, "Dark mode", {"rocket": 1})], {1: [reaction("rocket", "staff")]})
+    sync(backlog)
+
+    serve(github, [make_issue(1, "Dark mode", {"+1": 2})])
+    sync(backlog)
+
+    assert json.loads(backlog.read_text()) == []
+
+
+def test_status_change_during_sync_is_kept(github, backlog):
+    serve(github, [make_issue(1, "Dark mode", {"rocket": 1})], {1: [reaction("rocket", "staff")]})
+    sync(backlog)
+    store = bedrock_entrypoint.get_backlog_store(backlog)
+
+    # The agent claims the item while the sync is waiting on GitHub
+    def issues(headers, query):
+        if query["page"] == "1":
+            store.update_status(1, "in progress")
+            return 200, {}, [make_issue(1, "Dark mode (v2)", {"+1": 4, "rocket": 1})]
+        return 200, {}, []
+
+    github.routes[f"/repos/{REPO}/issues"] = issues
+    sync(backlog)
+
+    (item,) = json.loads(backlog.read_text())
+    assert item["status"] == "in progress"
+    assert item["description"] == "Dark mode (v2)"
@@ -0,0 +1,141 @@
+"""MetricsPublisher buffering, shutdown and Embedded Metric Format output."""
+
+import io
+import json
+
+import pytest
+
+pytest.importorskip("boto3")
+
+from src import cloudwatch_metrics
+from src.cloudwatch_metrics import MetricsPublisher
+
+
+def test_close_unregisters_the_atexit_hook(monkeypatch):
+    registered = []
+    monkeypatch.setattr(cloudwatch_metrics.atexit, "register", registered.append)
+    monkeypatch.setattr(cloudwatch_metrics.atexit, "unregister", registered.remove)
+
+    publishers = [MetricsPublisher(mode="emf", emf_stream=io.StringIO(), flush_interval=60) for _ in range(3)]
+    assert len(registered) == 3
+
+    for publisher in publishers:
+        publisher.close()
+        publisher.close()  # Idempotent
+    assert registered == []
+
+
+NOW = 1_699_999_990.0  # Fixed clock, so every datapoint falls in one minute
+MINUTE = 1_699_999_980
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "test")
+    monkeypatch.setenv("CLOUDWATCH_METRICS_ENABLED", "true")
+    monkeypatch.setattr(cloudwatch_metrics.time, "time", lambda: NOW)
+
+
+def emf_publisher(flush_interval=0):
+    stream = io.StringIO()
+    publisher = MetricsPublisher(issue_number=42, mode="emf", emf_stream=stream, flush_interval=flush_interval)
+    return publisher, stream
+
+
+def emf_records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_emf_record_layout(clock):
+    publisher, stream = emf_publisher()
+
+    assert publisher.publish_session_started(mode="enhancement")
+
+    (record,) = emf_records(stream)
+    assert record["_aws"] == {
+        "Timestamp": MINUTE * 1000,
+        "CloudWatchMetrics": [{
+            "Namespace": "ClaudeCodeAgent",
+            "Dimensions": [["Environment", "IssueNumber", "Mode"]],
+            "Metrics": [{"Name": "SessionStarted", "Unit": "Count"}],
+        }],
+    }
+    assert record["Environment"] == "test"
+    assert record["IssueNumber"] == "42"
+    assert record["Mode"] == "enhancement"
+    assert record["SessionStarted"] == 1
+
+
+def test_emf_groups_metrics_by_dimension_set(clock):
+    publisher, stream = emf_publisher()
+
+    publisher.publish_session_completed(exit_code=0, duration_seconds=3600.5)
+    publisher.publish_session_heartbeat()
+
+    completed, heartbeat = emf_records(stream)
+    directive = completed["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Dimensions"] == [["Environment", "IssueNumber"]]
+    assert directive["Metrics"] == [
+        {"Name": "SessionCompleted", "Unit": "Count"},
+        {"Name": "SessionDuration", "Unit": "Seconds"},
+        {"Name": "SessionExitCode", "Unit": "None"},
+    ]
+    assert (completed["SessionCompleted"], completed["SessionDuration"], completed["SessionExitCode"]) == (1, 3600.5, 0)
+
+    # The heartbeat carries only the Environment dimension
+    assert heartbeat["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Environment"]]
+    assert "IssueNumber" not in heartbeat
+    assert heartbeat["SessionHeartbeat"] == 1
+
+
+def test_emf_expands_buffered_counts(clock):
+    publisher, stream = emf_publisher(flush_interval=3600)
+    try:
+        for count in (2, 2, 3):
+            publisher.publish_commits_pushed(count)
+        assert stream.getvalue() == ""  # Buffered until flushed
+
+        assert publisher.flush()
+        (record,) = emf_records(stream)
+        assert sorted(record["CommitsPushed"]) == [2, 2, 3]
+        assert record["PushSuccess"] == [1, 1, 1]
+    finally:
+        publisher.close()
+
+
+def test_emf_splits_values_over_the_per_metric_limit(clock):
+    publisher, stream = emf_publisher(flush_interval=3600)
+    try:
+        for value in range(250):
+            publisher._put_metric("ElapsedHours", value, "None")
+        publisher.flush()
+
+        records = emf_records(stream)
+        assert [len(record["ElapsedHours"]) for record in records] == [100, 100, 50]
+        assert sorted(v for record in records for v in record["ElapsedHours"]) == list(range(250))
+    finally:
+        publisher.close()
+
+
+def test_api_mode_aggregates_values_and_counts(clock, monkeypatch):
+    monkeypatch.setenv("AWS_REGION", "us-west-2")
+    publisher = MetricsPublisher(issue_number=42, mode="api", flush_interval=3600)
+    calls = []
+    publisher.client = type("FakeCloudWatch", (), {"put_metric_data": lambda self, **kw: calls.append(kw)})()
+    try:
+        for count in (2, 2, 3):
+            publisher.publish_commits_pushed(count)
+        assert publisher.flush()
+    finally:
+        publisher.close()
+
+    (call,) = calls
+    assert call["Namespace"] == "ClaudeCodeAgent"
+    data = {datum["MetricName"]: datum for datum in call["MetricData"]}
+    assert dict(zip(data["CommitsPushed"]["Values"], data["CommitsPushed"]["Counts"])) == {2: 2, 3: 1}
+    assert (data["PushSuccess"]["Values"], data["PushSuccess"]["Counts"]) == ([1], [3])
+    assert data["CommitsPushed"]["Timestamp"].timestamp() == MINUTE
+    assert data["CommitsPushed"]["Dimensions"] == [
+        {"Name": "Environment", "Value": "test"},
+        {"Name": "IssueNumber", "Value": "42"},
+    ]
@@ -0,0 +1,63 @@
+"""Legacy commit notifications must not drop SHAs queued while a post is in flight."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("bedrock_agentcore")
+
+import bedrock_entrypoint
+from bedrock_entrypoint import send_legacy_commit_notification
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    pending = []
+    monkeypatch.setattr(bedrock_entrypoint, "legacy_pending_notification", pending)
+    return pending
+
+
+def test_commits_queued_during_the_post_are_kept(queue):
+    queue.extend(["a1", "b2"])
+    posted = []
+
+    async def post(shas):
+        await asyncio.sleep(0)
+        queue.append("c3")  # A commit job runs while the post is awaited
+        posted.append(list(shas))
+        return True
+
+    assert asyncio.run(send_legacy_commit_notification(post)) == ["a1", "b2"]
+    assert posted == [["a1", "b2"]]
+    assert queue == ["c3"]
+
+
+def test_failed_post_puts_the_batch_back_in_front(queue):
+    queue.extend(["a1", "b2"])
+
+    async def post(shas):
+        queue.append("c3")
+        return False
+
+    assert asyncio.run(send_legacy_commit_notification(post)) == []
+    assert queue == ["a1", "b2", "c3"]
+
+
+def test_post_that_raises_puts_the_batch_back(queue):
+    queue.append("a1")
+
+    async def post(shas):
+        queue.append("b2")
+        raise asyncio.TimeoutError
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(send_legacy_commit_notification(post))
+    assert queue == ["a1", "b2"]
+
+
+def test_nothing_queued_posts_nothing(queue):
+    async def post(shas):
+        raise AssertionError("should not post")
+
+    assert asyncio.run(send_legacy_commit_notification(post)) == []
@@ -0,0 +1,31 @@
+"""Agent control channel across handler invocations."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("boto3")  # src/__init__ pulls in the AWS helpers
+
+from src import ControlChannelClient, ControlChannelServer
+
+
+def test_client_reaches_a_server_reopened_on_a_new_loop(tmp_path):
+    path = str(tmp_path / "control.sock")
+    client = ControlChannelClient(path)
+
+    async def invocation(step):
+        server = ControlChannelServer(path)
+        assert server.start()
+        try:
+            assert client.send("state", step=step)
+            assert await server.wait(1)
+            return server.drain()
+        finally:
+            server.close()
+
+    for step in (1, 2):  # Each handler invocation runs on its own event loop
+        (event,) = asyncio.run(invocation(step))
+        assert (event["event"], event["step"]) == ("state", step)
+
+    assert not (tmp_path / "control.sock").exists()
+    assert not client.send("state", step=3)  # Nobody listening between invocations
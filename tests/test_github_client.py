@@ -0,0 +1,95 @@
+"""GitHubClient against a local HTTP stand-in for the GitHub API."""
+
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from src.github_client import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    GitHubClient,
+    RateLimitBudget,
+    RateLimitBudgetExceeded,
+)
+
+
+@pytest.fixture
+def client(github):
+    client = GitHubClient("token", api_url=github.url)
+    yield client
+    client.close()
+
+
+def test_not_modified_returns_cached_body(github, client):
+    def issues(headers, query):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, None
+        return 200, {"ETag": '"v1"'}, [{"number": 1}]
+
+    github.routes["/repos/o/r/issues"] = issues
+
+    assert client.get_json("/repos/o/r/issues") == [{"number": 1}]
+    assert client.get_json("/repos/o/r/issues") == [{"number": 1}]
+
+    calls = github.calls("/repos/o/r/issues")
+    assert "If-None-Match" not in calls[0]
+    assert calls[1]["If-None-Match"] == '"v1"'
+
+
+def test_low_priority_calls_are_blocked_when_quota_is_low(github, client):
+    reset = str(int(time.time()) + 3600)
+    low_quota = {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": reset}
+    github.sequence("/rate", (200, low_quota, {}))
+    client.budget = RateLimitBudget(burst=1, max_wait=1.0)
+    client.budget.update(5000, 10, reset)
+
+    assert client.request("GET", "/rate", priority=PRIORITY_LOW).status_code == 200
+    with pytest.raises(RateLimitBudgetExceeded):
+        client.request("GET", "/rate", priority=PRIORITY_LOW)
+    assert len(github.calls("/rate")) == 1  # The blocked call never reached the server
+
+    # High-priority calls still go through
+    assert client.request("GET", "/rate", priority=PRIORITY_HIGH).status_code == 200
+    assert len(github.calls("/rate")) == 2
+
+
+@pytest.mark.parametrize(
+    "status, headers, body",
+    [
+        (429, {"Retry-After": "0"}, {"message": "Too many requests"}),
+        (403, {"Retry-After": "0"}, {"message": "You have exceeded a secondary rate limit"}),
+        (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, {"message": "API rate limit exceeded"}),
+    ],
+)
+def test_rate_limited_requests_are_retried(github, client, status, headers, body):
+    github.sequence("/repos/o/r/issues", (status, headers, body), (200, {}, [{"number": 1}]))
+
+    assert client.get_json("/repos/o/r/issues") == [{"number": 1}]
+    assert len(github.calls("/repos/o/r/issues")) == 2
+
+
+def test_forbidden_is_not_retried(github, client):
+    github.sequence("/repos/o/r/issues", (403, {}, {"message": "Resource not accessible by integration"}))
+
+    assert client.request("GET", "/repos/o/r/issues").status_code == 403
+    assert len(github.calls("/repos/o/r/issues")) == 1
+
+
+def test_retries_stop_when_the_wait_is_too_long(github, client):
+    reset = str(int(time.time()) + 3600)
+    github.sequence("/repos/o/r/issues", (403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}, {}))
+
+    assert client.request("GET", "/repos/o/r/issues").status_code == 403
+    assert len(github.calls("/repos/o/r/issues")) == 1
+
+
+def test_iter_pages_stops_at_empty_page(github, client):
+    pages = {"1": [{"number": 1}, {"number": 2}], "2": [{"number": 3}], "3": []}
+    github.routes["/repos/o/r/issues"] = lambda headers, query: (200, {}, pages[query["page"]])
+
+    issues = [item["number"] for page in client.iter_pages("/repos/o/r/issues") for item in page]
+
+    assert issues == [1, 2, 3]
+    assert len(github.calls("/repos/o/r/issues")) == 3
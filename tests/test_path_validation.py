@@ -0,0 +1,56 @@
+"""Path validation must follow symlinks retargeted between checks."""
+
+import pytest
+
+pytest.importorskip("boto3")  # src/__init__ pulls in the AWS helpers
+
+from src.security import SecurityValidator
+
+
+def test_retargeted_symlink_is_rejected(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    inside = project / "inside.txt"
+    inside.write_text("ok")
+    outside = tmp_path / "outside.txt"
+    outside.write_text("secret")
+    link = project / "link"
+    link.symlink_to(inside)
+
+    valid, _ = SecurityValidator._validate_path_within_run_directory(str(link), str(project))
+    assert valid
+
+    # Retarget without going through the Bash hooks, as a background process would
+    link.unlink()
+    link.symlink_to(outside)
+
+    valid, reason = SecurityValidator._validate_path_within_run_directory(str(link), str(project))
+    assert not valid
+    assert "outside the allowed directory" in reason
+
+
+def test_relative_path_resolves_against_cwd(tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    (project / "src").mkdir(parents=True)
+    monkeypatch.chdir(project)
+
+    assert SecurityValidator._validate_path_within_run_directory("src/app.py", str(project))[0]
+    assert not SecurityValidator._validate_path_within_run_directory("../elsewhere", str(project))[0]
+
+
+def test_retargeted_project_root_is_re_resolved(tmp_path):
+    first = tmp_path / "run-1"
+    second = tmp_path / "run-2"
+    first.mkdir()
+    second.mkdir()
+    (second / "app.py").write_text("")
+    root = tmp_path / "current"
+    root.symlink_to(first)
+
+    assert not SecurityValidator._validate_path_within_run_directory(str(second / "app.py"), str(root))[0]
+
+    root.unlink()
+    root.symlink_to(second)
+
+    assert SecurityValidator._validate_path_within_run_directory(str(second / "app.py"), str(root))[0]
+    assert not SecurityValidator._validate_path_within_run_directory(str(first), str(root))[0]
@@ -0,0 +1,43 @@
+"""Pause mode must notice a resume written while the watcher was starting."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("claude_agent_sdk")
+
+import claude_code
+
+
+class RacingWatcher:
+    """Watcher whose start() lands after a resume was already written."""
+
+    def __init__(self, path, poll_interval):
+        self.generation_dir = path.parent
+        self.waits = 0
+
+    def start(self):
+        claude_code.write_agent_state(self.generation_dir, desired="continuous")
+        return True
+
+    async def wait_for_change(self, timeout):
+        self.waits += 1
+        await asyncio.sleep(timeout)  # No notification ever arrives for the earlier write
+        return False
+
+    def close(self):
+        pass
+
+
+def test_resume_before_first_wait_is_seen(tmp_path, monkeypatch):
+    watchers = []
+
+    def make_watcher(path, poll_interval):
+        watchers.append(RacingWatcher(path, poll_interval))
+        return watchers[-1]
+
+    monkeypatch.setattr(claude_code, "FileChangeWatcher", make_watcher)
+
+    asyncio.run(asyncio.wait_for(claude_code._handle_pause_mode(tmp_path), timeout=5))
+
+    assert watchers[0].waits == 0
@@ -0,0 +1,144 @@
+"""Screenshot uploads to S3 through the shared transfer manager (moto-backed)."""
+
+import os
+from concurrent.futures import Future
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+pytest.importorskip("bedrock_agentcore")
+
+from boto3.s3.transfer import TransferConfig
+
+import bedrock_entrypoint
+
+BUCKET = "screenshots-test"
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    """Mocked S3 bucket plus fresh upload state for each test."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(bedrock_entrypoint, "SCREENSHOT_HASH_CACHE_FILE", tmp_path / "hashes.json")
+    monkeypatch.setattr(bedrock_entrypoint, "SCREENSHOT_NEAR_DUPLICATE_DISTANCE", 0)
+    monkeypatch.setattr(bedrock_entrypoint, "PIL_AVAILABLE", False)  # Upload files as-is
+    monkeypatch.setattr(bedrock_entrypoint, "uploaded_screenshots", set())
+    monkeypatch.setattr(bedrock_entrypoint, "_s3_client", None)
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def write_screenshot(build_dir, name, size):
+    path = build_dir / "screenshots" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def upload(build_dir):
+    return bedrock_entrypoint.upload_screenshots_to_s3(build_dir, 7, "session-1", BUCKET, "cdn.example.com")
+
+
+def test_large_screenshot_is_uploaded_in_parts(s3, tmp_path, monkeypatch):
+    # Lower the multipart threshold to S3's 5 MB minimum part size
+    monkeypatch.setattr(
+        bedrock_entrypoint,
+        "TransferConfig",
+        lambda **kwargs: TransferConfig(multipart_threshold=5 * MB, multipart_chunksize=5 * MB, **kwargs),
+    )
+    path = write_screenshot(tmp_path, "full-page.png", 12 * MB)
+
+    uploaded = upload(tmp_path)
+
+    assert len(uploaded) == 1
+    head = s3.head_object(Bucket=BUCKET, Key=uploaded[0]["s3_key"])
+    assert head["ContentLength"] == path.stat().st_size
+    assert head["ETag"].strip('"').endswith("-3")  # Multipart ETags carry the part count
+    assert head["ContentType"] == "image/png"
+    assert uploaded[0]["url"] == f"https://cdn.example.com/{uploaded[0]['s3_key']}"
+
+
+def test_unchanged_screenshots_are_not_rehashed(s3, tmp_path, monkeypatch):
+    write_screenshot(tmp_path, "home.png", 1024)
+    write_screenshot(tmp_path, "settings.png", 2048)
+    assert len(upload(tmp_path)) == 2
+
+    hashed = []
+    real_hash = bedrock_entrypoint.get_file_hash
+    monkeypatch.setattr(bedrock_entrypoint, "get_file_hash", lambda path: hashed.append(path) or real_hash(path))
+
+    # Nothing changed: hashes come from the cache and nothing is re-uploaded
+    assert upload(tmp_path) == []
+    assert hashed == []
+
+    # Only the new file is hashed and uploaded
+    added = write_screenshot(tmp_path, "profile.png", 512)
+    uploaded = upload(tmp_path)
+    assert [s["filename"] for s in uploaded] == ["profile.png"]
+    assert hashed == [added]
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 3
+
+
+class FailingTransferManager:
+    """Wraps a transfer manager so uploads of the named files fail."""
+
+    def __init__(self, manager, failing_names):
+        self.manager = manager
+        self.failing_names = failing_names
+
+    def __enter__(self):
+        self.manager.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.manager.__exit__(*exc)
+
+    def upload(self, fileobj, bucket, key, extra_args=None):
+        if any(key.endswith(f"_{name}") for name in self.failing_names):
+            future = Future()
+            future.set_exception(OSError("connection reset"))
+            return future
+        return self.manager.upload(fileobj, bucket, key, extra_args=extra_args)
+
+
+def test_failed_upload_does_not_suppress_its_near_duplicates(s3, tmp_path, monkeypatch):
+    monkeypatch.setattr(bedrock_entrypoint, "SCREENSHOT_NEAR_DUPLICATE_DISTANCE", 4)
+    monkeypatch.setattr(bedrock_entrypoint, "screenshot_perceptual_index", {})
+    # Both files look identical to the perceptual hash
+    monkeypatch.setattr(bedrock_entrypoint, "get_perceptual_hash", lambda path: (1280, 720, 0xF0F0))
+    first = write_screenshot(tmp_path, "home.png", 1024)
+    retake = write_screenshot(tmp_path, "home-retake.png", 1024)
+
+    real_create = bedrock_entrypoint.create_transfer_manager
+    monkeypatch.setattr(
+        bedrock_entrypoint,
+        "create_transfer_manager",
+        lambda client, config: FailingTransferManager(real_create(client, config), ["home.png"]),
+    )
+
+    def upload_batch():
+        return bedrock_entrypoint.upload_screenshots_to_s3(
+            tmp_path, 7, "session-1", BUCKET, "cdn.example.com", png_files=[first, retake]
+        )
+
+    assert upload_batch() == []
+    assert bedrock_entrypoint.uploaded_screenshots == set()
+    assert bedrock_entrypoint.screenshot_perceptual_index[7] == []
+
+    # Once the original is posted, the retake is suppressed against it
+    monkeypatch.setattr(bedrock_entrypoint, "create_transfer_manager", real_create)
+    uploaded = upload_batch()
+
+    assert [s["filename"] for s in uploaded] == ["home.png"]
+    assert bedrock_entrypoint.uploaded_screenshots == {
+        bedrock_entrypoint.get_file_hash(first),
+        bedrock_entrypoint.get_file_hash(retake),
+    }
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 1
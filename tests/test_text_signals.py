@@ -0,0 +1,25 @@
+"""Error and completion signal detection in agent text."""
+
+import pytest
+
+pytest.importorskip("claude_agent_sdk")
+
+from claude_code import _detect_completion_signal, _detect_error_patterns
+
+
+def test_error_patterns_are_case_insensitive():
+    assert _detect_error_patterns("Error: Prompt is too long") == (True, False, False)
+    assert _detect_error_patterns("json message exceeded maximum buffer size") == (False, True, False)
+    assert _detect_error_patterns("Image dimensions exceed max allowed size: 9000px") == (False, False, True)
+    assert _detect_error_patterns("all good") == (False, False, False)
+
+
+def test_completion_requires_every_marker():
+    assert _detect_completion_signal("🎉 IMPLEMENTATION COMPLETE - ALL TASKS FINISHED")
+    assert not _detect_completion_signal("IMPLEMENTATION COMPLETE - ALL TASKS FINISHED")
+    assert not _detect_completion_signal("🎉 Implementation complete")
+
+
+def test_completion_exclusions_veto():
+    assert not _detect_completion_signal("🎉 Implementation complete, all tasks finished, 2 issues remain")
+    assert not _detect_completion_signal("🎉 implementation complete? all tasks finished... not, some UNFINISHED")
@@ -0,0 +1,37 @@
+"""Resuming token totals from the log checkpoint."""
+
+import json
+
+import pytest
+
+pytest.importorskip("boto3")  # src/__init__ pulls in the AWS helpers
+
+from src import TokenTracker
+
+
+def write_log(logs_dir, name, input_tokens):
+    record = {"message_type": "ResultMessage", "input_tokens": input_tokens, "output_tokens": 1}
+    (logs_dir / name).write_text(json.dumps({"type": "agent_response", "messages": [record]}))
+
+
+def load(logs_dir):
+    tracker = TokenTracker()
+    tracker.load_from_logs(logs_dir)
+    return tracker.totals
+
+
+def test_unreadable_log_is_retried_on_the_next_load(tmp_path):
+    write_log(tmp_path, "20260101_000001.json", 1)
+    (tmp_path / "20260101_000002.json").write_text('{"type": "agent_resp')  # Still being written
+    write_log(tmp_path, "20260101_000003.json", 100)
+
+    first = load(tmp_path)
+    assert (first.input_tokens, first.api_calls) == (101, 2)
+
+    write_log(tmp_path, "20260101_000002.json", 10)
+    second = load(tmp_path)
+    assert (second.input_tokens, second.api_calls) == (111, 3)
+
+    # Once everything has been read the checkpoint moves past the last log
+    assert json.loads((tmp_path / ".token_checkpoint").read_text())["last_file"] == "20260101_000003.json"
+    assert load(tmp_path).input_tokens == 111
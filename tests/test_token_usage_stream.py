@@ -0,0 +1,125 @@
+"""Token usage capture in log_agent_response, fed synthetic message streams."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("claude_agent_sdk")
+
+import claude_code
+from claude_agent_sdk.types import AssistantMessage, ResultMessage, TextBlock
+from src import LoggingManager, TokenTracker
+
+
+class FakeClient:
+    """Stands in for ClaudeSDKClient, replaying a fixed message stream."""
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def receive_response(self):
+        for message in self.messages:
+            yield message
+
+
+def _assistant(text: str) -> AssistantMessage:
+    return AssistantMessage(content=[TextBlock(text=text)], model="test-model")
+
+
+def _result(input_tokens: int, output_tokens: int, cost: float = 0.0) -> ResultMessage:
+    return ResultMessage(
+        subtype="success",
+        duration_ms=10,
+        duration_api_ms=8,
+        is_error=False,
+        num_turns=1,
+        session_id="session-1",
+        total_cost_usd=cost,
+        usage={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 3,
+            "cache_read_input_tokens": 4,
+        },
+    )
+
+
+@pytest.fixture(autouse=True)
+def _isolate_stats(monkeypatch, tmp_path):
+    # log_agent_response exports totals to /tmp/token_stats.json; keep tests off it
+    real_path = claude_code.Path
+    monkeypatch.setattr(
+        claude_code,
+        "Path",
+        lambda p, *rest: tmp_path / "token_stats.json"
+        if str(p) == "/tmp/token_stats.json"
+        else real_path(p, *rest),
+    )
+
+
+def _run(messages, logging_manager=None) -> TokenTracker:
+    tracker = TokenTracker()
+    status = asyncio.run(
+        claude_code.log_agent_response(
+            FakeClient(messages), tracker, logging_manager or LoggingManager()
+        )
+    )
+    assert status == "continue"
+    return tracker
+
+
+def test_usage_recorded_from_result_message():
+    tracker = _run([_assistant("working on it"), _result(100, 20, cost=0.5)])
+
+    assert tracker.totals.input_tokens == 100
+    assert tracker.totals.output_tokens == 20
+    assert tracker.totals.cache_creation_input_tokens == 3
+    assert tracker.totals.cache_read_input_tokens == 4
+    assert tracker.totals.total_cost_usd == pytest.approx(0.5)
+    assert tracker.totals.api_calls == 1
+
+
+def test_only_first_result_message_counts():
+    tracker = _run([_result(100, 20), _assistant("more"), _result(999, 999)])
+
+    assert tracker.totals.input_tokens == 100
+    assert tracker.totals.output_tokens == 20
+    assert tracker.totals.api_calls == 1
+
+
+def test_stream_without_result_message_records_nothing():
+    tracker = _run([_assistant("one"), _assistant("two")])
+
+    assert tracker.totals.api_calls == 0
+    assert tracker.totals.input_tokens == 0
+
+
+def test_usage_survives_serialization_failure():
+    class FailingLoggingManager(LoggingManager):
+        def encode_message_for_json(self, message):
+            raise TypeError("not serializable")
+
+    tracker = _run([_assistant("hi"), _result(7, 5)], FailingLoggingManager())
+
+    assert tracker.totals.input_tokens == 7
+    assert tracker.totals.output_tokens == 5
+    assert tracker.totals.api_calls == 1
+
+
+def test_usage_from_result_message_matches_log_record():
+    tracker = TokenTracker()
+    message = _result(11, 12, cost=0.25)
+    record = LoggingManager().serialize_message_for_json(message)
+
+    assert tracker.usage_from_result_message(message) == tracker.extract_usage_from_message(record)
+
+
+def test_debug_size_counts_utf8_bytes():
+    record, line = LoggingManager().encode_message_for_json(_assistant("héllo ✓"))
+
+    size = record["_debug_size_bytes"]
+    encoded = line.replace(f', "_debug_size_bytes": {size}', "")
+
+    assert json.loads(line)["_debug_size_bytes"] == size
+    assert size == len(encoded.encode("utf-8")) > len(encoded)
@@ -0,0 +1,147 @@
+"""GitHub webhook receiver: signature checks, request validation and routing."""
+
+import asyncio
+import hashlib
+import hmac
+import http.client
+import json
+
+import pytest
+
+pytest.importorskip("boto3")  # src/__init__ pulls in the AWS helpers
+
+from src.webhook_receiver import DEFAULT_WEBHOOK_HOST, WEBHOOK_PATH, WebhookReceiver, verify_signature
+
+SECRET = "webhook-secret"
+REPO = "owner/repo"
+
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def issue_payload(number=7, action="edited", repo=REPO):
+    return {"action": action, "issue": {"number": number}, "repository": {"full_name": repo}}
+
+
+def post(port, body, headers, path=WEBHOOK_PATH):
+    """POST raw bytes with exactly the given headers; returns the status code."""
+    conn = http.client.HTTPConnection(DEFAULT_WEBHOOK_HOST, port, timeout=5)
+    try:
+        conn.putrequest("POST", path)
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        if body:
+            conn.send(body)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+def deliver(port, payload, event="issues", delivery="d-1", signature=None):
+    body = json.dumps(payload).encode("utf-8")
+    headers = {
+        "Content-Length": str(len(body)),
+        "X-GitHub-Event": event,
+        "X-GitHub-Delivery": delivery,
+        "X-Hub-Signature-256": sign(body) if signature is None else signature,
+    }
+    return post(port, body, headers)
+
+
+def run_with_receiver(scenario):
+    """Run scenario(receiver, send) on a started receiver; send runs post/deliver off the loop."""
+
+    async def main():
+        receiver = WebhookReceiver(SECRET, 0, repo=REPO)
+        assert receiver.start()
+        try:
+            async def send(func, *args, **kwargs):
+                return await asyncio.to_thread(func, receiver.port, *args, **kwargs)
+
+            await scenario(receiver, send)
+        finally:
+            await receiver.close()
+
+    asyncio.run(main())
+
+
+def test_verify_signature():
+    body = b'{"action": "opened"}'
+    assert verify_signature(SECRET, body, sign(body))
+    assert not verify_signature(SECRET, body, sign(body, "other-secret"))
+    assert not verify_signature(SECRET, body + b" ", sign(body))
+    assert not verify_signature(SECRET, body, None)
+    assert not verify_signature(SECRET, body, sign(body).replace("sha256=", "sha1="))
+
+
+def test_binds_to_loopback_by_default():
+    assert WebhookReceiver(SECRET, 0).host == "127.0.0.1"
+
+
+def test_signed_issue_delivery_is_queued():
+    async def scenario(receiver, send):
+        assert await send(deliver, issue_payload(number=12, action="labeled")) == 202
+        assert await receiver.wait(timeout=5)
+        assert receiver.drain() == [{
+            "event": "github_webhook",
+            "github_event": "issues",
+            "action": "labeled",
+            "issue_number": 12,
+            "delivery": "d-1",
+        }]
+
+    run_with_receiver(scenario)
+
+
+def test_bad_signature_is_rejected():
+    async def scenario(receiver, send):
+        assert await send(deliver, issue_payload(), signature=sign(b"something else")) == 401
+        assert await send(deliver, issue_payload(), signature="") == 401
+        assert receiver.drain() == []
+
+    run_with_receiver(scenario)
+
+
+def test_routing():
+    async def scenario(receiver, send):
+        # Comments are routed like issue events
+        assert await send(deliver, issue_payload(number=3, action="created"), event="issue_comment") == 202
+        # ping and other events are acknowledged but not queued
+        assert await send(deliver, {"zen": "Keep it simple."}, event="ping", delivery="d-2") == 200
+        assert await send(deliver, issue_payload(), event="push", delivery="d-3") == 200
+        # Other repositories and redeliveries are ignored
+        assert await send(deliver, issue_payload(repo="someone/else"), delivery="d-4") == 200
+        assert await send(deliver, issue_payload(number=3, action="created"), event="issue_comment") == 200
+
+        events = receiver.drain()
+        assert [(e["github_event"], e["issue_number"]) for e in events] == [("issue_comment", 3)]
+
+    run_with_receiver(scenario)
+
+
+def test_malformed_requests_are_rejected():
+    async def scenario(receiver, send):
+        assert await send(post, b"", {"Content-Length": "-1"}) == 400
+        assert await send(post, b"", {}) == 411
+        assert await send(post, b"", {"Content-Length": str(2 * 1024 * 1024)}) == 413
+        assert await send(post, b"{}", {"Content-Length": "2"}, path="/elsewhere") == 404
+
+        body = b"not json"
+        headers = {"Content-Length": str(len(body)), "X-GitHub-Event": "issues", "X-Hub-Signature-256": sign(body)}
+        assert await send(post, body, headers) == 400
+        assert receiver.drain() == []
+
+    run_with_receiver(scenario)
+
+
+def test_close_is_idempotent():
+    async def main():
+        receiver = WebhookReceiver(SECRET, 0)
+        assert receiver.start()
+        await receiver.close()
+        await receiver.close()
+        assert not await receiver.wait(timeout=0)
+
+    asyncio.run(main())